@@ -0,0 +1,88 @@
+import random
+import re
+import time
+from engine.pdf_answer_extractor import PDFAnswerExtractor
+
+
+def legacy_parse_answers(extractor, text):
+    """Per-pattern re.findall parser, kept as the reference implementation."""
+    answers = {}
+    for pattern in extractor.config.answer_patterns:
+        for match in re.findall(pattern, text):
+            try:
+                q_num = int(match[0])
+                answer_str = match[1]
+                if answer_str in extractor.config.circle_to_int:
+                    answer = extractor.config.circle_to_int[answer_str]
+                else:
+                    answer = int(answer_str)
+                if q_num not in answers and 1 <= answer <= 10:
+                    answers[q_num] = answer
+            except (ValueError, IndexError):
+                continue
+    return answers
+
+
+def legacy_contains_answer_section(extractor, text):
+    text_lower = text.lower()
+    for keyword in extractor.config.answer_keywords:
+        if keyword.lower() in text_lower:
+            return True
+    return False
+
+
+def make_ocr_dump(num_pages=200, seed=0):
+    """Synthetic OCR text: question prose with answer tables in mixed formats."""
+    rng = random.Random(seed)
+    circles = "①②③④⑤"
+    words = ["다음", "글을", "읽고", "물음에", "답하시오", "보기", "중", "옳은", "것은", "Figure", "table"]
+    formats = ["{q}.{c}", "{q}번{c}", "{q}){d}", "({q}){c}", "{q} {c}", "{q}{c}", "{q}: {d}"]
+    pages = []
+    for page in range(num_pages):
+        tokens = [rng.choice(words) for _ in range(300)]
+        tokens += [str(rng.randint(1, 2024)) for _ in range(40)]
+        if page % 10 == 9:
+            tokens.append("정답")
+            for q in range(1, 41):
+                fmt = rng.choice(formats)
+                tokens.append(fmt.format(q=q, c=rng.choice(circles), d=rng.randint(1, 5)))
+        rng.shuffle(tokens[:340])
+        pages.append(" ".join(tokens))
+    return pages
+
+
+def time_best(func, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def benchmark_answer_parser(num_pages=200, repeats=5):
+    extractor = PDFAnswerExtractor()
+    pages = make_ocr_dump(num_pages)
+    dump = " ".join(pages)
+
+    assert legacy_parse_answers(extractor, dump) == extractor._parse_answers(dump)
+    for page in pages:
+        assert legacy_parse_answers(extractor, page) == extractor._parse_answers(page)
+        assert legacy_contains_answer_section(extractor, page) == extractor._contains_answer_section(page)
+
+    print(f"OCR dump: {num_pages} pages, {len(dump) / 1024:.0f} KB")
+    legacy_ms = time_best(lambda: legacy_parse_answers(extractor, dump), repeats)
+    new_ms = time_best(lambda: extractor._parse_answers(dump), repeats)
+    print(f"  _parse_answers (full dump)     legacy {legacy_ms:8.2f} ms   compiled {new_ms:8.2f} ms")
+
+    legacy_ms = time_best(lambda: [legacy_parse_answers(extractor, p) for p in pages], repeats)
+    new_ms = time_best(lambda: [extractor._parse_answers(p) for p in pages], repeats)
+    print(f"  _parse_answers (per page)      legacy {legacy_ms:8.2f} ms   compiled {new_ms:8.2f} ms")
+
+    legacy_ms = time_best(lambda: [legacy_contains_answer_section(extractor, p) for p in pages], repeats)
+    new_ms = time_best(lambda: [extractor._contains_answer_section(p) for p in pages], repeats)
+    print(f"  _contains_answer_section       legacy {legacy_ms:8.2f} ms   compiled {new_ms:8.2f} ms")
+
+
+if __name__ == "__main__":
+    benchmark_answer_parser()
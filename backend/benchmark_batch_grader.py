@@ -0,0 +1,51 @@
+import time
+import numpy as np
+from engine.batch_grader import BatchGrader, pack_answers
+
+def benchmark_batch_grader(num_students=10000, num_questions=100, num_choices=5, repeats=5):
+    rng = np.random.default_rng(0)
+    answer_key = rng.integers(1, num_choices + 1, size=num_questions).tolist()
+
+    # Mostly single marks, with some blanks and double marks
+    choices = rng.integers(1, num_choices + 1, size=(num_students, num_questions))
+    blank = rng.random((num_students, num_questions)) < 0.05
+    double = rng.random((num_students, num_questions)) < 0.02
+    student_data = []
+    for s in range(num_students):
+        answers = {}
+        for q in range(num_questions):
+            if blank[s, q]:
+                continue
+            selected = [int(choices[s, q])]
+            if double[s, q]:
+                selected.append(selected[0] % num_choices + 1)
+            answers[q + 1] = selected
+        student_data.append({"name": f"Student {s + 1}", "answers": answers})
+
+    grader = BatchGrader()
+
+    start = time.perf_counter()
+    selections, counts = pack_answers(
+        [d["answers"] for d in student_data], num_questions, num_choices
+    )
+    pack_ms = (time.perf_counter() - start) * 1000
+
+    matrix_ms = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        correct = grader.grade_matrix(answer_key, selections, counts)
+        grader._statistics_from_matrix(correct)
+        matrix_ms.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    result = grader.grade_batch(answer_key, student_data)
+    batch_ms = (time.perf_counter() - start) * 1000
+
+    print(f"{num_students} students x {num_questions} questions")
+    print(f"  pack_answers:                 {pack_ms:8.1f} ms")
+    print(f"  grade_matrix + statistics:    {min(matrix_ms):8.1f} ms (best of {repeats})")
+    print(f"  grade_batch (end to end):     {batch_ms:8.1f} ms")
+    print(f"  average score: {result.statistics['average_score']}%")
+
+if __name__ == "__main__":
+    benchmark_batch_grader()
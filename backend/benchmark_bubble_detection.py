@@ -0,0 +1,63 @@
+import time
+import cv2
+import numpy as np
+from engine.bubble_detector import BubbleDetector
+
+def legacy_detect_bubbles(detector, image):
+    """Reference implementation: per-contour filtering and quadratic dedup."""
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    _, thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+    kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, detector.config.morph_kernel_size)
+    thresh = cv2.morphologyEx(thresh, cv2.MORPH_OPEN, kernel, iterations=1)
+    contours, _ = cv2.findContours(thresh, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
+
+    cfg = detector.config
+    candidates = []
+    for c in contours:
+        (x, y, w, h) = cv2.boundingRect(c)
+        ar = w / float(h)
+        if (cfg.min_bubble_size <= w <= cfg.max_bubble_size and
+            cfg.min_bubble_size <= h <= cfg.max_bubble_size and
+            cfg.min_aspect_ratio <= ar <= cfg.max_aspect_ratio):
+            if cv2.contourArea(c) > cfg.min_contour_area:
+                candidates.append((x, y, w, h, c))
+
+    candidates = sorted(candidates, key=lambda b: b[0])
+    deduped = []
+    for bubble in candidates:
+        is_duplicate = False
+        for existing in deduped:
+            dist = np.sqrt((bubble[0] - existing[0]) ** 2 + (bubble[1] - existing[1]) ** 2)
+            if dist < cfg.dedup_distance:
+                is_duplicate = True
+                break
+        if not is_duplicate:
+            deduped.append(bubble)
+    return deduped
+
+def make_dense_page(card_path, tiles=(6, 3)):
+    """Tile the SS-03 sample into a dense full page with thousands of contours."""
+    card = cv2.imread(card_path)
+    rows, cols = tiles
+    return np.vstack([np.hstack([card] * cols)] * rows)
+
+def time_call(func, *args, repeats=3):
+    best, result = float("inf"), None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+def benchmark_bubble_detection(card_path):
+    detector = BubbleDetector()
+    for name, image in [("SS-03 card", cv2.imread(card_path)), ("dense page", make_dense_page(card_path))]:
+        legacy_ms, legacy = time_call(legacy_detect_bubbles, detector, image, repeats=1)
+        new_ms, new = time_call(detector.detect_bubbles, image)
+        identical = [b[:4] for b in legacy] == [b[:4] for b in new]
+        print(f"{name} {image.shape[1]}x{image.shape[0]}: {len(new)} bubbles, "
+              f"legacy {legacy_ms:.1f} ms, spatial hash {new_ms:.1f} ms "
+              f"({legacy_ms / new_ms:.1f}x), identical={identical}")
+
+if __name__ == "__main__":
+    benchmark_bubble_detection("../test_data/ss03_omr_marked.jpg")
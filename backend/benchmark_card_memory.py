@@ -0,0 +1,88 @@
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+from engine.omr_grid_detector import OMRGridDetector
+
+
+def make_grid_scan(rows=6, cols=5, card_w=1150, card_h=1250, gap=150):
+    """Synthetic 600 DPI scan: a grid of white cards with bubble rows on a gray bed."""
+    height = rows * card_h + (rows + 1) * gap
+    width = cols * card_w + (cols + 1) * gap
+    scan = np.full((height, width, 3), 90, dtype=np.uint8)
+    for r in range(rows):
+        for c in range(cols):
+            x, y = gap + c * (card_w + gap), gap + r * (card_h + gap)
+            cv2.rectangle(scan, (x, y), (x + card_w, y + card_h), (255, 255, 255), -1)
+            cv2.rectangle(scan, (x, y), (x + card_w, y + card_h), (0, 0, 0), 12)
+            for q in range(20):
+                for choice in range(5):
+                    center = (x + 400 + choice * 120, y + 100 + q * 55)
+                    cv2.circle(scan, center, 18, (0, 0, 0), 3)
+    return scan
+
+
+def legacy_warp_cards(detector, scan):
+    """Previous flow: copy every card out of the scan, then warp each copy."""
+    cards = []
+    for region in detector.locate_cards(scan):
+        cards.append(region.view.copy())
+    warped = []
+    for card in cards:
+        result = detector.doc_processor.process_document_image(card)
+        warped.append(card if result is None else result)
+    return warped
+
+
+def region_warp_cards(detector, scan):
+    """Current flow: card regions reference the scan; crop and warp are one transform."""
+    return [detector.warp_card(region) for region in detector.locate_cards(scan)]
+
+
+def measure(mode):
+    scan = make_grid_scan()
+    detector = OMRGridDetector()
+    warp = legacy_warp_cards if mode == "legacy" else region_warp_cards
+
+    base_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+    start = time.perf_counter()
+    warped = warp(detector, scan)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    shapes = sorted(w.shape for w in warped)
+    print(f"{mode} {len(warped)} {peak / 2**20:.1f} {(peak_rss - base_rss) / 1024:.1f} "
+          f"{elapsed * 1000:.0f} {hash(tuple(shapes))}")
+
+
+def benchmark_card_memory():
+    scan = make_grid_scan()
+    print(f"Scan: {scan.shape[1]}x{scan.shape[0]} px, {scan.nbytes / 2**20:.0f} MB")
+    del scan
+
+    outputs = {}
+    for mode in ("legacy", "regions"):
+        # Separate processes so each mode's peak RSS is measured from a clean start
+        out = subprocess.run(
+            [sys.executable, __file__, mode], capture_output=True, text=True, check=True
+        ).stdout.strip().splitlines()[-1].split()
+        outputs[mode] = out
+        _, cards, traced, rss, ms, _ = out
+        print(f"  {mode:8s} {cards} cards   traced peak {traced:>7s} MB   "
+              f"RSS growth {rss:>7s} MB   {ms:>5s} ms")
+
+    assert outputs["legacy"][5] == outputs["regions"][5], "warped card sizes differ"
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        measure(sys.argv[1])
+    else:
+        benchmark_card_memory()
@@ -0,0 +1,57 @@
+import time
+import cv2
+import numpy as np
+from engine.gutter_finder import GutterFinder
+from benchmark_yedam_sampling import make_yedam_card
+
+def legacy_split_points(image):
+    """Reference implementation: full-resolution thresholds, np.sum and a 50-tap np.convolve."""
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    _, thresh = cv2.threshold(gray, 200, 255, cv2.THRESH_BINARY_INV)
+    _, thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    v_proj = np.sum(thresh, axis=1)
+    v_proj_smoothed = np.convolve(v_proj, np.ones(50)/50, mode='same')
+    h_total = image.shape[0]
+    gutter1_min = np.argmin(v_proj_smoothed[int(h_total*0.3):int(h_total*0.45)]) + int(h_total*0.3)
+    gutter2_min = np.argmin(v_proj_smoothed[int(h_total*0.6):int(h_total*0.75)]) + int(h_total*0.6)
+    return [0, gutter1_min, gutter2_min, h_total]
+
+def make_page(num_cards=3, gap=80, scale=2.5):
+    """Stack framed synthetic Ye-dam cards with blank gutters and upscale to scan resolution."""
+    card = make_yedam_card()
+    cv2.rectangle(card, (10, 10), (card.shape[1] - 11, card.shape[0] - 11), (0, 0, 0), 3)
+    blank = np.full((gap, card.shape[1], 3), 255, dtype=np.uint8)
+    parts = [card]
+    for _ in range(num_cards - 1):
+        parts += [blank, card]
+    page = np.vstack(parts)
+    gutters = [round(scale * (i * (card.shape[0] + gap) - gap / 2)) for i in range(1, num_cards)]
+    return cv2.resize(page, None, fx=scale, fy=scale), gutters
+
+def time_call(func, *args, repeats=5, **kwargs):
+    best, result = float("inf"), None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+def benchmark_gutter_finder():
+    finder = GutterFinder()
+    page, gutters = make_page()
+    legacy_ms, legacy = time_call(legacy_split_points, page)
+    new_ms, new = time_call(finder.split_points, page, num_cards=3)
+    auto_ms, auto = time_call(finder.split_points, page)
+    print(f"Page {page.shape[1]}x{page.shape[0]}, gutter centers {gutters}")
+    print(f"  legacy (3 cards)   {legacy_ms:6.1f} ms  {[int(p) for p in legacy]}")
+    print(f"  finder (3 cards)   {new_ms:6.1f} ms  {new}  ({legacy_ms / new_ms:.0f}x)")
+    print(f"  finder (auto)      {auto_ms:6.1f} ms  {auto}")
+
+    for num_cards in (1, 2, 4, 5):
+        page, gutters = make_page(num_cards)
+        auto_ms, auto = time_call(finder.split_points, page)
+        label = f"{num_cards} card page (auto)"
+        print(f"  {label:18s} {auto_ms:6.1f} ms  gutters {auto[1:-1]}, centers {gutters}")
+
+if __name__ == "__main__":
+    benchmark_gutter_finder()
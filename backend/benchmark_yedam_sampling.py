@@ -0,0 +1,136 @@
+import random
+import time
+import cv2
+import numpy as np
+from engine.yedam_grader import YeDamGrader
+
+def legacy_extract_registration_and_params(centers):
+    """Reference implementation: list clustering and a nested loop per column peak."""
+    if not centers: return "", None
+    xs = sorted([c[0] for c in centers])
+    col_peaks = []
+    curr = [xs[0]]
+    for i in range(1, len(xs)):
+        if xs[i] - xs[i-1] > 20:
+            col_peaks.append(np.mean(curr))
+            curr = [xs[i]]
+        else: curr.append(xs[i])
+    col_peaks.append(np.mean(curr))
+    if len(col_peaks) < 2: return "", None
+
+    ys = sorted([c[1] for c in centers])
+    row_peaks = []
+    curr = [ys[0]]
+    for i in range(1, len(ys)):
+        if ys[i] - ys[i-1] > 15:
+            row_peaks.append(np.mean(curr))
+            curr = [ys[i]]
+        else: curr.append(ys[i])
+    row_peaks.append(np.mean(curr))
+    if len(row_peaks) < 2: return "", None
+
+    x_step = (max(col_peaks) - min(col_peaks)) / (len(col_peaks) - 1)
+    y_step = (max(row_peaks) - min(row_peaks)) / (len(row_peaks) - 1)
+    params = {
+        "x_start": min(col_peaks), "x_step": x_step,
+        "y_start": min(row_peaks), "y_step": y_step
+    }
+
+    reg_id = ""
+    for cp in col_peaks[:5]:
+        best_digit = None
+        min_d = 999
+        for bx, by in centers:
+            if abs(bx - cp) < 15:
+                digit = round((by - params["y_start"]) / params["y_step"])
+                if 0 <= digit <= 9:
+                    dist = abs((by - params["y_start"]) - digit * params["y_step"])
+                    if dist < min_d:
+                        min_d = dist
+                        best_digit = digit
+        if best_digit is not None: reg_id += str(best_digit)
+    return reg_id, params
+
+def legacy_process_card_v2(image, bubbles):
+    """Reference implementation: 4 x 10 x 5 loop of ROI slices and np.mean calls."""
+    h, w = image.shape[:2]
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    centers = [(x + w_b/2, y + h_b/2) for (x, y, w_b, h_b) in bubbles]
+    reg_centers = [c for c in centers if c[0] < w * 0.25]
+    reg_id, params = legacy_extract_registration_and_params(reg_centers)
+    if not params:
+        return {"registration": "", "answers": {}}
+
+    answers = {}
+    y0, dy = params["y_start"], params["y_step"]
+    x0, dx = params["x_start"], params["x_step"]
+    block_offsets = [7.5, 11.0, 14.5, 18.2]
+    roi_size = 12
+    for g_idx, b_off in enumerate(block_offsets):
+        for r_idx in range(10):
+            q_num = g_idx * 10 + r_idx + 1
+            for c_idx in range(5):
+                tx = int(x0 + (b_off + c_idx * 0.5) * dx)
+                ty = int(y0 + r_idx * dy)
+                y1, y2 = max(0, ty - roi_size), min(h, ty + roi_size)
+                x1, x2 = max(0, tx - roi_size), min(w, tx + roi_size)
+                roi = gray[y1:y2, x1:x2]
+                if roi.size == 0: continue
+                if np.mean(roi) < 180:
+                    if q_num not in answers: answers[int(q_num)] = []
+                    answers[int(q_num)].append(int(c_idx + 1))
+    return {"registration": reg_id, "answers": answers}
+
+def make_yedam_card(student_id="20417", x0=60, y0=80, dx=60, dy=45, seed=7):
+    """Synthetic Ye-dam card: 5x10 registration grid and 4 question blocks in grid units."""
+    rng = random.Random(seed)
+    card = np.full((560, 1400, 3), 255, dtype=np.uint8)
+    for col, digit in enumerate(student_id):
+        for value in range(10):
+            center = (x0 + col * dx, y0 + value * dy)
+            if value == int(digit):
+                cv2.circle(card, center, 11, (20, 20, 20), -1)
+            else:
+                cv2.circle(card, center, 11, (90, 90, 200), 2)
+    for b_off in [7.5, 11.0, 14.5, 18.2]:
+        for row in range(10):
+            choice = rng.randrange(5)
+            for c in range(5):
+                center = (int(x0 + (b_off + c * 0.5) * dx), y0 + row * dy)
+                if c == choice:
+                    cv2.circle(card, center, 11, (20, 20, 20), -1)
+                else:
+                    cv2.circle(card, center, 11, (90, 90, 200), 2)
+    return card
+
+def time_call(func, *args, repeats=50):
+    best, result = float("inf"), None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+def benchmark_yedam_sampling():
+    grader = YeDamGrader()
+    card = make_yedam_card()
+    bubbles = grader._detect_bubbles_adaptive(card)
+    h, w = card.shape[:2]
+    centers = [(x + bw / 2, y + bh / 2) for (x, y, bw, bh) in bubbles]
+    reg_centers = [c for c in centers if c[0] < w * 0.25]
+
+    legacy_ms, legacy_reg = time_call(legacy_extract_registration_and_params, reg_centers)
+    new_ms, new_reg = time_call(grader._extract_registration_and_params, np.array(reg_centers), h, w)
+    print(f"Registration ({len(reg_centers)} bubbles): legacy {legacy_ms:.2f} ms, "
+          f"vectorized {new_ms:.2f} ms ({legacy_ms / new_ms:.1f}x), "
+          f"identical={legacy_reg == new_reg}")
+
+    legacy_ms, legacy = time_call(legacy_process_card_v2, card, bubbles)
+    new_ms, new = time_call(grader._process_card_v2, card, bubbles)
+    identical = legacy["registration"] == new["registration"] and legacy["answers"] == new["answers"]
+    print(f"Card {w}x{h} ({len(bubbles)} bubbles): legacy {legacy_ms:.2f} ms, "
+          f"vectorized {new_ms:.2f} ms ({legacy_ms / new_ms:.1f}x), identical={identical}, "
+          f"darkness matrix {new['darkness'].shape}")
+
+if __name__ == "__main__":
+    benchmark_yedam_sampling()
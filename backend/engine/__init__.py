@@ -4,31 +4,78 @@ Engine module for Smart-Grader OMR processing.
 This module provides the core processing engines for:
 - Document alignment and perspective correction
 - Bubble detection and marking analysis
-- OCR text extraction
+- OCR text extraction (in-process or on a worker process pool)
+- Name field location for targeted name OCR
+- Declarative layout templates compiled to bubble position arrays
 - PDF answer extraction
 - Grid-based multi-OMR detection
+- Gutter-based segmentation of pages of stacked cards
+- Page-by-page reading of multi-page TIFF, PDF and ZIP scans
 - Batch grading
+- Shared-memory image transport between processes
+- Bounded executors for off-event-loop grading
+- Persistent background grading jobs
+- Content-addressed result caching
+- Answer key registry for reuse across batches
 """
 
 from .document_processor import DocumentProcessor, DocumentProcessorConfig
-from .bubble_detector import BubbleDetector, BubbleDetectorConfig
+from .bubble_detector import BubbleDetector, BubbleDetectorConfig, PreparedImage
+from .shared_image import SharedImage, SharedImageHandle
 from .ocr_engine import OCREngine
+from .ocr_pool import OCRWorkerPool, OCRPoolConfig
+from .name_locator import NameFieldLocator, NameFieldConfig
+from .layout_templates import LayoutTemplate, LayoutSample, load_template
 from .pdf_answer_extractor import PDFAnswerExtractor, AnswerExtractorConfig
-from .omr_grid_detector import OMRGridDetector, GridDetectorConfig, OMRCardResult
+from .gutter_finder import GutterFinder, GutterFinderConfig
+from .scan_reader import ScanReader, ScanReaderConfig, ScanPage
+from .omr_grid_detector import OMRGridDetector, GridDetectorConfig, OMRCardResult, CardRegion
 from .batch_grader import BatchGrader, BatchGradingResult, StudentResult
+from .executor import GradingExecutor, ExecutorConfig, ExecutorSaturatedError
+from .job_queue import Job, JobStatus, JobStore, JobRunner, JobQueueFullError
+from .result_cache import ResultCache, config_fingerprint
+from .answer_key_registry import AnswerKey, AnswerKeyRegistry
 
 __all__ = [
     "DocumentProcessor",
     "DocumentProcessorConfig",
     "BubbleDetector",
     "BubbleDetectorConfig",
+    "PreparedImage",
+    "SharedImage",
+    "SharedImageHandle",
     "OCREngine",
+    "OCRWorkerPool",
+    "OCRPoolConfig",
+    "NameFieldLocator",
+    "NameFieldConfig",
+    "LayoutTemplate",
+    "LayoutSample",
+    "load_template",
     "PDFAnswerExtractor",
     "AnswerExtractorConfig",
+    "GutterFinder",
+    "GutterFinderConfig",
+    "ScanReader",
+    "ScanReaderConfig",
+    "ScanPage",
     "OMRGridDetector",
     "GridDetectorConfig",
     "OMRCardResult",
+    "CardRegion",
     "BatchGrader",
     "BatchGradingResult",
     "StudentResult",
+    "GradingExecutor",
+    "ExecutorConfig",
+    "ExecutorSaturatedError",
+    "Job",
+    "JobStatus",
+    "JobStore",
+    "JobRunner",
+    "JobQueueFullError",
+    "ResultCache",
+    "config_fingerprint",
+    "AnswerKey",
+    "AnswerKeyRegistry",
 ]
@@ -0,0 +1,195 @@
+"""
+Answer Key Registry Module
+
+Persistent store for answer keys extracted from exam PDFs. Each key is
+registered once under a key ID and the SHA-256 of its PDF, so batch grading
+can reference an existing key instead of re-rendering and re-OCRing the PDF.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def pdf_hash(pdf_bytes: bytes) -> str:
+    """Return the SHA-256 hex digest identifying a PDF."""
+    return hashlib.sha256(pdf_bytes).hexdigest()
+
+
+@dataclass
+class AnswerKey:
+    """An answer key extracted from an exam PDF."""
+
+    key_id: str
+    pdf_hash: str
+    config_fingerprint: str  # Extractor settings the key was produced with
+    answers: List[int]
+    answer_map: Dict[int, int]
+    confidence: float
+    raw_text: str
+    created_at: float
+
+    @property
+    def total_questions(self) -> int:
+        """Number of questions in the key."""
+        return len(self.answers)
+
+    def to_answer_result(self) -> Dict[str, Any]:
+        """Return the key in the PDFAnswerExtractor result format."""
+        return {
+            "answers": list(self.answers),
+            "total_questions": self.total_questions,
+            "raw_text": self.raw_text,
+            "confidence": self.confidence,
+            "answer_map": dict(self.answer_map),
+            "answer_key_id": self.key_id
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the key for API responses."""
+        return {
+            "answer_key_id": self.key_id,
+            "pdf_hash": self.pdf_hash,
+            "answers": self.answers,
+            "total_questions": self.total_questions,
+            "confidence": self.confidence,
+            "raw_text_preview": self.raw_text[:500],
+            "created_at": self.created_at
+        }
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS answer_keys (
+    key_id TEXT PRIMARY KEY,
+    pdf_hash TEXT NOT NULL,
+    config_fingerprint TEXT NOT NULL,
+    answers TEXT NOT NULL,
+    answer_map TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    raw_text TEXT NOT NULL DEFAULT '',
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_answer_keys_pdf ON answer_keys (pdf_hash, config_fingerprint);
+"""
+
+
+class AnswerKeyRegistry:
+    """SQLite-backed registry of extracted answer keys."""
+
+    def __init__(self, db_path: str):
+        """
+        Initialize the registry, creating the database if needed.
+
+        Args:
+            db_path: Path to the SQLite database file.
+        """
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # A connection per operation keeps the registry safe to share across threads
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _row_to_key(row: sqlite3.Row) -> AnswerKey:
+        return AnswerKey(
+            key_id=row["key_id"],
+            pdf_hash=row["pdf_hash"],
+            config_fingerprint=row["config_fingerprint"],
+            answers=json.loads(row["answers"]),
+            # JSON object keys are strings; question numbers are ints
+            answer_map={int(q): a for q, a in json.loads(row["answer_map"]).items()},
+            confidence=row["confidence"],
+            raw_text=row["raw_text"],
+            created_at=row["created_at"],
+        )
+
+    def register(
+        self,
+        answer_result: Dict[str, Any],
+        pdf_hash: str,
+        config_fingerprint: str = ""
+    ) -> AnswerKey:
+        """
+        Store an extracted answer key.
+
+        Args:
+            answer_result: Result of PDFAnswerExtractor extraction.
+            pdf_hash: SHA-256 of the source PDF.
+            config_fingerprint: Fingerprint of the extractor configuration.
+
+        Returns:
+            The registered answer key.
+        """
+        answers = list(answer_result.get("answers", []))
+        answer_map = answer_result.get("answer_map") or {
+            q: a for q, a in enumerate(answers, start=1) if a
+        }
+        key = AnswerKey(
+            key_id=str(uuid.uuid4()),
+            pdf_hash=pdf_hash,
+            config_fingerprint=config_fingerprint,
+            answers=answers,
+            answer_map={int(q): a for q, a in answer_map.items()},
+            confidence=float(answer_result.get("confidence", 0.0)),
+            raw_text=answer_result.get("raw_text", ""),
+            created_at=time.time(),
+        )
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO answer_keys (key_id, pdf_hash, config_fingerprint, answers, "
+                "answer_map, confidence, raw_text, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key.key_id, key.pdf_hash, key.config_fingerprint,
+                    json.dumps(key.answers), json.dumps(key.answer_map),
+                    key.confidence, key.raw_text, key.created_at
+                )
+            )
+        logger.info(f"Registered answer key {key.key_id} ({key.total_questions} questions)")
+        return key
+
+    def get(self, key_id: str) -> Optional[AnswerKey]:
+        """Fetch an answer key by ID, or None if it does not exist."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM answer_keys WHERE key_id = ?", (key_id,)
+            ).fetchone()
+        return self._row_to_key(row) if row else None
+
+    def find_by_hash(self, pdf_hash: str, config_fingerprint: str = "") -> Optional[AnswerKey]:
+        """
+        Find the most recent key extracted from a PDF with the given settings.
+
+        Args:
+            pdf_hash: SHA-256 of the source PDF.
+            config_fingerprint: Fingerprint of the extractor configuration.
+
+        Returns:
+            The matching answer key, or None.
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM answer_keys WHERE pdf_hash = ? AND config_fingerprint = ? "
+                "ORDER BY created_at DESC LIMIT 1",
+                (pdf_hash, config_fingerprint)
+            ).fetchone()
+        return self._row_to_key(row) if row else None
@@ -3,14 +3,25 @@ Batch Grader Module
 
 Compares student answers with answer keys and calculates scores.
 Supports batch processing of multiple students.
+
+Grading is vectorized: student selections are packed into a
+(students x questions x choices) boolean matrix and scored with NumPy
+reductions. Per-question detail dicts are only built when accessed.
 """
 
 import logging
+from itertools import chain
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
 
 logger = logging.getLogger(__name__)
 
+# Minimum number of answer choices per question (5-choice OMR cards)
+DEFAULT_NUM_CHOICES = 5
+
 
 @dataclass
 class StudentResult:
@@ -24,7 +35,27 @@ class StudentResult:
     points: int  # Raw points (1 per correct)
     answers: Dict[int, List[int]]  # Student's answers
     correct_answers: Dict[int, int]  # Correct answer key
-    details: List[Dict[str, Any]]  # Per-question details
+    correct_mask: NDArray[np.bool_] = field(repr=False)  # Per-question correctness
+    _details: Optional[List[Dict[str, Any]]] = field(default=None, repr=False)
+
+    @property
+    def details(self) -> List[Dict[str, Any]]:
+        """Per-question details, built on first access."""
+        if self._details is None:
+            self._details = []
+            for q_num in range(1, self.total_questions + 1):
+                student_selected = self.answers.get(q_num, [])
+                is_correct = bool(self.correct_mask[q_num - 1])
+                self._details.append({
+                    "question": q_num,
+                    "correct_answer": self.correct_answers.get(q_num, 0),
+                    "student_answer": student_selected,
+                    "is_correct": is_correct,
+                    "status": "correct" if is_correct else (
+                        "wrong" if student_selected else "unanswered"
+                    )
+                })
+        return self._details
 
     @property
     def score_display(self) -> str:
@@ -57,6 +88,54 @@ class BatchGradingResult:
         )
 
 
+def pack_answers(
+    student_answers: Sequence[Dict[int, List[int]]],
+    total_questions: int,
+    num_choices: int = DEFAULT_NUM_CHOICES
+) -> Tuple[NDArray[np.bool_], NDArray[np.int32]]:
+    """
+    Pack per-student answer dicts into a selection matrix.
+
+    Args:
+        student_answers: Per-student mapping of question -> selected choices (1-indexed).
+        total_questions: Number of questions (Q).
+        num_choices: Number of choices per question (C).
+
+    Returns:
+        Tuple of (selections, selection_counts):
+            - selections: (S, Q, C) boolean matrix of marked choices
+            - selection_counts: (S, Q) number of selections as reported,
+              including out-of-range or duplicate choices
+    """
+    num_students = len(student_answers)
+    selections = np.zeros((num_students, total_questions, num_choices), dtype=bool)
+    counts = np.zeros((num_students, total_questions), dtype=np.int32)
+
+    # Flatten every (student, question, choice) entry with C-level iterators
+    per_student = np.fromiter(map(len, student_answers), dtype=np.int64, count=num_students)
+    q_nums = np.fromiter(
+        chain.from_iterable(student_answers), dtype=np.int64, count=int(per_student.sum())
+    )
+    selected_lists = list(chain.from_iterable(a.values() for a in student_answers))
+    lengths = np.fromiter(map(len, selected_lists), dtype=np.int64, count=len(selected_lists))
+    choices = np.fromiter(
+        chain.from_iterable(selected_lists), dtype=np.int64, count=int(lengths.sum())
+    )
+
+    entry_student = np.repeat(np.arange(num_students), per_student)
+    valid_q = (q_nums >= 1) & (q_nums <= total_questions)
+    counts[entry_student[valid_q], q_nums[valid_q] - 1] = lengths[valid_q]
+
+    choice_entry = np.repeat(np.arange(len(selected_lists)), lengths)
+    valid = valid_q[choice_entry] & (choices >= 1) & (choices <= num_choices)
+    selections[
+        entry_student[choice_entry][valid],
+        q_nums[choice_entry][valid] - 1,
+        choices[valid] - 1
+    ] = True
+    return selections, counts
+
+
 class BatchGrader:
     """Grades multiple students against an answer key."""
 
@@ -88,91 +167,129 @@ class BatchGrader:
         if not answer_key:
             return BatchGradingResult.empty("No answer key provided")
 
-        total_questions = len(answer_key)
-        student_results: List[StudentResult] = []
-
-        for idx, student_data in enumerate(student_answers):
-            student_name = student_data.get("name", f"Student {idx + 1}")
-            answers = student_data.get("answers", {})
-
-            result = self._grade_student(
-                student_name=student_name,
-                student_index=idx,
-                student_answers=answers,
-                answer_key=answer_key,
-                total_questions=total_questions
-            )
-            student_results.append(result)
-
-        # Calculate statistics
-        statistics = self._calculate_statistics(student_results, total_questions)
+        students, correct = self._grade_students(answer_key, student_answers)
 
         return BatchGradingResult(
             answer_key=answer_key,
-            total_questions=total_questions,
-            students=student_results,
-            statistics=statistics
+            total_questions=len(answer_key),
+            students=students,
+            statistics=self._statistics_from_matrix(correct)
         )
 
-    def _grade_student(
+    def grade_matrix(
+        self,
+        answer_key: Sequence[int],
+        selections: NDArray[np.bool_],
+        selection_counts: Optional[NDArray[np.integer]] = None
+    ) -> NDArray[np.bool_]:
+        """
+        Compute per-question correctness for a packed selection matrix.
+
+        A question is correct when exactly one choice is selected and it
+        matches the key.
+
+        Args:
+            answer_key: (Q,) correct answers (1-indexed; 0 = no answer).
+            selections: (S, Q, C) boolean matrix of marked choices.
+            selection_counts: Optional (S, Q) selection counts. Derived from
+                selections when not provided.
+
+        Returns:
+            (S, Q) boolean correctness matrix.
+        """
+        key = np.asarray(answer_key, dtype=np.int64)
+        num_choices = selections.shape[2]
+        if selection_counts is None:
+            selection_counts = selections.sum(axis=2)
+
+        # Gather the selection at each question's correct choice
+        valid_key = (key >= 1) & (key <= num_choices)
+        key_idx = np.clip(key - 1, 0, num_choices - 1)
+        hit = np.take_along_axis(
+            selections, key_idx[np.newaxis, :, np.newaxis], axis=2
+        )[:, :, 0]
+
+        return hit & valid_key[np.newaxis, :] & (selection_counts == 1)
+
+    def grade_student(
         self,
-        student_name: str,
-        student_index: int,
-        student_answers: Dict[int, List[int]],
         answer_key: List[int],
-        total_questions: int
+        student_data: Dict[str, Any],
+        student_index: int = 0
     ) -> StudentResult:
-        """Grade a single student."""
-        correct_count = 0
-        details: List[Dict[str, Any]] = []
+        """
+        Grade one student against the answer key.
 
-        # Convert answer key to dict (1-indexed)
-        correct_answer_map = {
-            i + 1: ans for i, ans in enumerate(answer_key)
-        }
+        Useful for streaming results as each OMR card is processed.
 
-        for q_num in range(1, total_questions + 1):
-            correct_answer = correct_answer_map.get(q_num, 0)
-            student_selected = student_answers.get(q_num, [])
-
-            # Check if correct
-            is_correct = False
-            if len(student_selected) == 1 and student_selected[0] == correct_answer:
-                is_correct = True
-                correct_count += 1
-
-            details.append({
-                "question": q_num,
-                "correct_answer": correct_answer,
-                "student_answer": student_selected,
-                "is_correct": is_correct,
-                "status": "correct" if is_correct else (
-                    "wrong" if student_selected else "unanswered"
-                )
-            })
-
-        score = (correct_count / total_questions * 100) if total_questions > 0 else 0
-        points = correct_count * self.points_per_question
-
-        return StudentResult(
-            student_name=student_name,
-            student_index=student_index,
-            total_questions=total_questions,
-            correct_count=correct_count,
-            score=score,
-            points=points,
-            answers=student_answers,
-            correct_answers=correct_answer_map,
-            details=details
-        )
+        Args:
+            answer_key: List of correct answers (1-indexed, values 1-5).
+            student_data: Dict with 'name' and 'answers' keys.
+            student_index: Position of the student in the batch.
+
+        Returns:
+            StudentResult for the student.
+        """
+        students, _ = self._grade_students(answer_key, [student_data], student_index)
+        return students[0]
 
-    def _calculate_statistics(
+    def _grade_students(
+        self,
+        answer_key: List[int],
+        student_answers: List[Dict[str, Any]],
+        start_index: int = 0
+    ) -> Tuple[List[StudentResult], NDArray[np.bool_]]:
+        """Grade students through the matrix engine and wrap them as StudentResults."""
+        total_questions = len(answer_key)
+        answers = [data.get("answers", {}) for data in student_answers]
+        num_choices = max([DEFAULT_NUM_CHOICES] + list(answer_key))
+        selections, counts = pack_answers(answers, total_questions, num_choices)
+        correct = self.grade_matrix(answer_key, selections, counts)
+
+        # Shared by every student; the key is read-only
+        correct_answer_map = {i + 1: ans for i, ans in enumerate(answer_key)}
+        correct_counts = correct.sum(axis=1)
+        scores = correct_counts / total_questions * 100
+
+        students = []
+        for row, data in enumerate(student_answers):
+            idx = start_index + row
+            students.append(StudentResult(
+                student_name=data.get("name", f"Student {idx + 1}"),
+                student_index=idx,
+                total_questions=total_questions,
+                correct_count=int(correct_counts[row]),
+                score=float(scores[row]),
+                points=int(correct_counts[row]) * self.points_per_question,
+                answers=answers[row],
+                correct_answers=correct_answer_map,
+                correct_mask=correct[row]
+            ))
+        return students, correct
+
+    def calculate_statistics(
         self,
         results: List[StudentResult],
         total_questions: int
     ) -> Dict[str, Any]:
-        """Calculate batch statistics."""
+        """
+        Calculate batch statistics for already graded students.
+
+        Args:
+            results: Graded students.
+            total_questions: Number of questions in the answer key.
+
+        Returns:
+            Statistics dictionary as included in BatchGradingResult.
+        """
         if not results:
+            return self._statistics_from_matrix(np.zeros((0, total_questions), dtype=bool))
+        return self._statistics_from_matrix(np.stack([r.correct_mask for r in results]))
+
+    def _statistics_from_matrix(self, correct: NDArray[np.bool_]) -> Dict[str, Any]:
+        """Calculate batch statistics from an (S, Q) correctness matrix."""
+        num_students, total_questions = correct.shape
+        if num_students == 0:
             return {
                 "student_count": 0,
                 "average_score": 0,
@@ -182,43 +299,32 @@ class BatchGrader:
                 "question_accuracy": []
             }
 
-        scores = [r.score for r in results]
-        correct_counts = [r.correct_count for r in results]
-
-        # Basic statistics
-        avg_score = sum(scores) / len(scores)
-        highest = max(scores)
-        lowest = min(scores)
-
-        # Standard deviation
-        variance = sum((s - avg_score) ** 2 for s in scores) / len(scores)
-        std_dev = variance ** 0.5
+        correct_counts = correct.sum(axis=1)
+        scores = correct_counts / total_questions * 100
 
         # Per-question accuracy
-        question_accuracy: List[Dict[str, Any]] = []
-        for q_num in range(1, total_questions + 1):
-            correct_for_q = sum(
-                1 for r in results
-                if any(d["question"] == q_num and d["is_correct"] for d in r.details)
-            )
-            accuracy = (correct_for_q / len(results) * 100) if results else 0
-            question_accuracy.append({
-                "question": q_num,
-                "correct_count": correct_for_q,
-                "total_students": len(results),
-                "accuracy": accuracy
-            })
+        correct_per_question = correct.sum(axis=0)
+        accuracy = correct_per_question / num_students * 100
+        question_accuracy: List[Dict[str, Any]] = [
+            {
+                "question": q + 1,
+                "correct_count": int(correct_per_question[q]),
+                "total_students": num_students,
+                "accuracy": float(accuracy[q])
+            }
+            for q in range(total_questions)
+        ]
 
         return {
-            "student_count": len(results),
-            "average_score": round(avg_score, 2),
-            "average_correct": round(sum(correct_counts) / len(correct_counts), 2),
-            "highest_score": round(highest, 2),
-            "lowest_score": round(lowest, 2),
-            "std_deviation": round(std_dev, 2),
+            "student_count": num_students,
+            "average_score": round(float(scores.mean()), 2),
+            "average_correct": round(float(correct_counts.mean()), 2),
+            "highest_score": round(float(scores.max()), 2),
+            "lowest_score": round(float(scores.min()), 2),
+            "std_deviation": round(float(scores.std()), 2),
             "question_accuracy": question_accuracy,
-            "perfect_scores": sum(1 for r in results if r.score == 100),
-            "failing_scores": sum(1 for r in results if r.score < 60)
+            "perfect_scores": int(np.count_nonzero(correct_counts == total_questions)),
+            "failing_scores": int(np.count_nonzero(scores < 60))
         }
 
     def format_results_table(self, result: BatchGradingResult) -> str:
@@ -1,10 +1,12 @@
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any, Union
 
 import cv2
 import numpy as np
 from numpy.typing import NDArray
 
+from .shared_image import ImageInput, as_array
+
 
 # Type alias for bubble tuple: (x, y, width, height, contour)
 BubbleTuple = Tuple[int, int, int, int, NDArray[np.int32]]
@@ -44,8 +46,99 @@ class BubbleDetectorConfig:
     marking_threshold: float = 0.25
 
 
+class PreparedImage:
+    """
+    Preprocessing of one card image, shared by all detector calls on it.
+
+    Each product (grayscale, Otsu mask, opened mask, integral image) is
+    computed on first use and kept until release(). Pass the context to
+    detect_bubbles, check_marking and the score methods instead of the raw
+    image so a card is converted once, with no state kept in the detector.
+    """
+
+    def __init__(self, image: ImageInput, config: BubbleDetectorConfig):
+        """
+        Wrap an image for preprocessing.
+
+        Args:
+            image: Perspective-corrected OMR image (BGR).
+            config: Detector configuration the products are computed with.
+        """
+        self._image: Optional[NDArray[np.uint8]] = as_array(image)
+        self.config = config
+        self._gray: Optional[NDArray[np.uint8]] = None
+        self._otsu_mask: Optional[NDArray[np.uint8]] = None
+        self._opened_mask: Optional[NDArray[np.uint8]] = None
+        self._integral: Optional[NDArray[np.int32]] = None
+
+    @property
+    def image(self) -> NDArray[np.uint8]:
+        """The source image."""
+        if self._image is None:
+            raise ValueError("Prepared image has been released")
+        return self._image
+
+    @property
+    def gray(self) -> NDArray[np.uint8]:
+        """Grayscale image."""
+        if self._gray is None:
+            self._gray = cv2.cvtColor(self.image, cv2.COLOR_BGR2GRAY)
+        return self._gray
+
+    @property
+    def otsu_mask(self) -> NDArray[np.uint8]:
+        """Inverted Otsu binarization (dark marks are 255)."""
+        if self._otsu_mask is None:
+            _, self._otsu_mask = cv2.threshold(
+                self.gray, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU
+            )
+        return self._otsu_mask
+
+    @property
+    def opened_mask(self) -> NDArray[np.uint8]:
+        """Otsu mask after morphological opening, which removes thin grid lines."""
+        if self._opened_mask is None:
+            kernel = cv2.getStructuringElement(
+                cv2.MORPH_ELLIPSE, self.config.morph_kernel_size
+            )
+            self._opened_mask = cv2.morphologyEx(
+                self.otsu_mask, cv2.MORPH_OPEN, kernel, iterations=1
+            )
+        return self._opened_mask
+
+    @property
+    def integral(self) -> NDArray[np.int32]:
+        """Summed-area table of the grayscale image, shape (H + 1, W + 1)."""
+        if self._integral is None:
+            self._integral = cv2.integral(self.gray)
+        return self._integral
+
+    def release(self) -> None:
+        """Free the image and all preprocessing buffers."""
+        self._image = None
+        self._gray = None
+        self._otsu_mask = None
+        self._opened_mask = None
+        self._integral = None
+
+    def __enter__(self) -> "PreparedImage":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.release()
+
+
+# A card image, raw or already prepared
+BubbleInput = Union[ImageInput, PreparedImage]
+
+
 class BubbleDetector:
-    """Detector for OMR bubble marks in scanned documents."""
+    """
+    Detector for OMR bubble marks in scanned documents.
+
+    The detector holds no per-image state, so one instance can serve
+    concurrent requests.
+    """
 
     def __init__(
         self,
@@ -61,87 +154,118 @@ class BubbleDetector:
         """
         self.threshold = threshold
         self.config = config or BubbleDetectorConfig()
-        # Cache for grayscale conversion to avoid redundant processing
-        self._gray_cache: Optional[Tuple[int, NDArray[np.uint8]]] = None
 
-    def _get_grayscale(self, image: NDArray[np.uint8]) -> NDArray[np.uint8]:
+    def prepare(self, image: ImageInput) -> PreparedImage:
         """
-        Get grayscale version of image with caching.
+        Create the preprocessing context for a card image.
 
         Args:
-            image: Input BGR image.
+            image: Perspective-corrected OMR image.
 
         Returns:
-            Grayscale image.
+            Context to pass to the detector methods; release it (or use it
+            as a context manager) when the card is done.
         """
-        image_id = id(image)
-        if self._gray_cache is not None and self._gray_cache[0] == image_id:
-            return self._gray_cache[1]
+        return PreparedImage(image, self.config)
 
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        self._gray_cache = (image_id, gray)
-        return gray
+    def _prepared(self, image: BubbleInput) -> PreparedImage:
+        """Return the image's preprocessing context, creating a one-off one if needed."""
+        if isinstance(image, PreparedImage):
+            return image
+        return self.prepare(image)
 
     def clear_cache(self) -> None:
-        """Clear the grayscale image cache."""
-        self._gray_cache = None
+        """No-op, kept for compatibility: preprocessing lives in PreparedImage."""
 
-    def detect_bubbles(self, warped_image: NDArray[np.uint8]) -> List[BubbleTuple]:
+    def detect_bubbles(self, warped_image: BubbleInput) -> List[BubbleTuple]:
         """
         Detect bubble candidates in a warped OMR image.
 
         Args:
-            warped_image: Perspective-corrected OMR image.
+            warped_image: Perspective-corrected OMR image or its PreparedImage.
 
         Returns:
             List of bubble tuples (x, y, w, h, contour).
         """
-        gray = self._get_grayscale(warped_image)
-        _, thresh = cv2.threshold(
-            gray, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU
+        # Opening removes thin grid lines; RETR_LIST detects bubbles inside boxes
+        contours, _ = cv2.findContours(
+            self._prepared(warped_image).opened_mask, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE
         )
 
-        # Morphological opening to remove thin grid lines
-        kernel = cv2.getStructuringElement(
-            cv2.MORPH_ELLIPSE, self.config.morph_kernel_size
+        if not contours:
+            return []
+
+        # Vectorized size and aspect-ratio filter over all bounding rects
+        rects = np.array([cv2.boundingRect(c) for c in contours], dtype=np.int64)
+        widths, heights = rects[:, 2], rects[:, 3]
+        aspect_ratios = widths / heights.astype(np.float64)
+        cfg = self.config
+        size_ok = (
+            (widths >= cfg.min_bubble_size) & (widths <= cfg.max_bubble_size) &
+            (heights >= cfg.min_bubble_size) & (heights <= cfg.max_bubble_size) &
+            (aspect_ratios >= cfg.min_aspect_ratio) & (aspect_ratios <= cfg.max_aspect_ratio)
         )
-        thresh = cv2.morphologyEx(thresh, cv2.MORPH_OPEN, kernel, iterations=1)
-
-        # RETR_LIST detects bubbles inside boxes
-        contours, _ = cv2.findContours(thresh, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
-
-        bubble_candidates: List[BubbleTuple] = []
-        for c in contours:
-            (x, y, w, h) = cv2.boundingRect(c)
-            ar = w / float(h)
-
-            # Filter by size and aspect ratio
-            if (self.config.min_bubble_size <= w <= self.config.max_bubble_size and
-                self.config.min_bubble_size <= h <= self.config.max_bubble_size and
-                self.config.min_aspect_ratio <= ar <= self.config.max_aspect_ratio):
-                # Basic area filter to remove tiny specs
-                if cv2.contourArea(c) > self.config.min_contour_area:
-                    bubble_candidates.append((x, y, w, h, c))
-
-        # Sort by X coordinate and deduplicate
-        bubble_candidates = sorted(bubble_candidates, key=lambda b: b[0])
-        deduped: List[BubbleTuple] = []
-
-        for bubble in bubble_candidates:
-            is_duplicate = False
-            for existing in deduped:
-                # If centers are very close, it's a duplicate (inner/outer contour)
-                dist = np.sqrt(
-                    (bubble[0] - existing[0]) ** 2 +
-                    (bubble[1] - existing[1]) ** 2
-                )
-                if dist < self.config.dedup_distance:
-                    is_duplicate = True
-                    break
+
+        # Basic area filter to remove tiny specs (only on size-filtered contours)
+        candidate_idx = [
+            i for i in np.flatnonzero(size_ok)
+            if cv2.contourArea(contours[i]) > cfg.min_contour_area
+        ]
+
+        # Sort by X coordinate (stable, preserving contour order on ties) and deduplicate
+        candidate_idx = sorted(candidate_idx, key=lambda i: rects[i, 0])
+        kept_idx = self._deduplicate(rects, candidate_idx)
+
+        return [
+            (int(rects[i, 0]), int(rects[i, 1]), int(rects[i, 2]), int(rects[i, 3]), contours[i])
+            for i in kept_idx
+        ]
+
+    def _deduplicate(self, rects: NDArray[np.int64], candidate_idx: List[int]) -> List[int]:
+        """
+        Drop candidates whose top-left corner is within dedup_distance of a kept one.
+
+        Kept bubbles are bucketed in a spatial hash with cell size equal to the
+        dedup distance, so each candidate is only compared against the 3x3
+        neighbouring cells instead of every kept bubble. Candidates are
+        processed in the given order, so the result matches a greedy scan.
+
+        Args:
+            rects: (N, 4) array of bounding rects (x, y, w, h).
+            candidate_idx: Indices into rects, in processing order.
+
+        Returns:
+            Indices of the kept (non-duplicate) candidates.
+        """
+        dedup_distance = self.config.dedup_distance
+        if dedup_distance <= 0:
+            return list(candidate_idx)
+
+        # If centers are very close, it's a duplicate (inner/outer contour)
+        max_dist_sq = dedup_distance * dedup_distance
+        cells: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+        kept: List[int] = []
+
+        for i in candidate_idx:
+            x, y = int(rects[i, 0]), int(rects[i, 1])
+            cx, cy = int(x // dedup_distance), int(y // dedup_distance)
+
+            neighbours = (
+                cells.get((nx, ny), ())
+                for nx in (cx - 1, cx, cx + 1)
+                for ny in (cy - 1, cy, cy + 1)
+            )
+            is_duplicate = any(
+                (x - ex) ** 2 + (y - ey) ** 2 < max_dist_sq
+                for cell in neighbours
+                for ex, ey in cell
+            )
+
             if not is_duplicate:
-                deduped.append(bubble)
+                cells.setdefault((cx, cy), []).append((x, y))
+                kept.append(i)
 
-        return deduped
+        return kept
 
     def detect_columns(
         self,
@@ -217,64 +341,137 @@ class BubbleDetector:
 
     def check_marking(
         self,
-        warped_image: NDArray[np.uint8],
+        warped_image: BubbleInput,
         bubbles: List[BubbleTuple]
     ) -> List[Dict[str, Any]]:
         """
         Check which bubbles are marked based on pixel intensity.
 
         Args:
-            warped_image: Perspective-corrected OMR image.
+            warped_image: Perspective-corrected OMR image or its PreparedImage.
             bubbles: List of bubble tuples to check.
 
         Returns:
             List of dictionaries with 'bbox', 'score', and 'is_marked' keys.
         """
-        gray = self._get_grayscale(warped_image)
-        results: List[Dict[str, Any]] = []
+        scores = self.score_bubbles(warped_image, bubbles)
+        is_marked = scores > self.config.marking_threshold
 
-        for (x, y, w, h, _) in bubbles:
-            roi = gray[y:y+h, x:x+w]
-            avg_intensity = np.mean(roi)
-            marking_score = (255 - avg_intensity) / 255.0
+        return [
+            {
+                "bbox": (x, y, w, h),
+                "score": float(score),
+                "is_marked": bool(marked)
+            }
+            for (x, y, w, h, _), score, marked in zip(bubbles, scores, is_marked)
+        ]
 
-            is_marked = marking_score > self.config.marking_threshold
+    def score_bubbles(
+        self,
+        warped_image: BubbleInput,
+        bubbles: List[BubbleTuple]
+    ) -> NDArray[np.float64]:
+        """
+        Compute marking scores for all bubbles in one vectorized pass.
 
-            results.append({
-                "bbox": (x, y, w, h),
-                "score": float(marking_score),
-                "is_marked": bool(is_marked)
-            })
+        Mean intensities are read from a summed-area table built once per
+        image, so the cost is O(pixels + bubbles) regardless of bubble size.
+
+        Args:
+            warped_image: Perspective-corrected OMR image or its PreparedImage.
+            bubbles: List of bubble tuples to score.
+
+        Returns:
+            Array of marking scores (0-1, higher = darker) aligned with bubbles.
+            Bubbles lying entirely outside the image score NaN.
+        """
+        if not bubbles:
+            return np.zeros(0, dtype=np.float64)
+        boxes = np.array([b[:4] for b in bubbles], dtype=np.int64)
+        return self.score_boxes(warped_image, boxes)
+
+    def score_boxes(
+        self,
+        warped_image: BubbleInput,
+        boxes: NDArray[np.integer]
+    ) -> NDArray[np.float64]:
+        """
+        Compute marking scores for an array of boxes, e.g. layout template ROIs.
 
-        return results
+        Args:
+            warped_image: Perspective-corrected OMR image or its PreparedImage.
+            boxes: (..., 4) array of (x, y, w, h) boxes.
+
+        Returns:
+            Array of marking scores (0-1, higher = darker) of shape boxes.shape[:-1].
+            Boxes lying entirely outside the image score NaN.
+        """
+        boxes = np.asarray(boxes, dtype=np.int64)
+        if boxes.size == 0:
+            return np.zeros(boxes.shape[:-1], dtype=np.float64)
+
+        integral = self._prepared(warped_image).integral
+        img_h, img_w = integral.shape[0] - 1, integral.shape[1] - 1
+
+        x1 = np.clip(boxes[..., 0], 0, img_w)
+        y1 = np.clip(boxes[..., 1], 0, img_h)
+        x2 = np.clip(boxes[..., 0] + boxes[..., 2], x1, img_w)
+        y2 = np.clip(boxes[..., 1] + boxes[..., 3], y1, img_h)
+
+        sums = (
+            integral[y2, x2] - integral[y1, x2] - integral[y2, x1] + integral[y1, x1]
+        ).astype(np.float64)
+        areas = (x2 - x1) * (y2 - y1)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            avg_intensity = sums / areas
+        return (255 - avg_intensity) / 255.0
+
+    def score_rows(
+        self,
+        warped_image: BubbleInput,
+        rows: List[List[BubbleTuple]]
+    ) -> List[NDArray[np.float64]]:
+        """
+        Score several rows of bubbles with a single gather.
+
+        Args:
+            warped_image: Perspective-corrected OMR image or its PreparedImage.
+            rows: Rows of bubble tuples (e.g. one row per question).
+
+        Returns:
+            One score array per row, aligned with the bubbles in that row.
+        """
+        flat = [bubble for row in rows for bubble in row]
+        scores = self.score_bubbles(warped_image, flat)
+        offsets = np.cumsum([len(row) for row in rows])[:-1]
+        return np.split(scores, offsets) if rows else []
 
     def grade_paper(
         self,
-        warped_image: NDArray[np.uint8],
+        warped_image: BubbleInput,
         answer_key_mapping: Optional[Dict[int, int]] = None
     ) -> Dict[int, Dict[str, Any]]:
         """
         Grade an entire OMR paper.
 
         Args:
-            warped_image: Perspective-corrected OMR image.
+            warped_image: Perspective-corrected OMR image or its PreparedImage.
             answer_key_mapping: Optional mapping of question numbers to correct answers.
 
         Returns:
             Dictionary mapping question numbers to grading results.
         """
-        bubbles = self.detect_bubbles(warped_image)
+        prepared = self._prepared(warped_image)
+        bubbles = self.detect_bubbles(prepared)
         grid = self.sort_into_grid(bubbles)
         graded_results: Dict[int, Dict[str, Any]] = {}
 
-        for i, row in enumerate(grid):
-            marking_status = self.check_marking(warped_image, row)
-            marked_indices = [
-                idx for idx, res in enumerate(marking_status) if res["is_marked"]
-            ]
+        for i, row_scores in enumerate(self.score_rows(prepared, grid)):
+            marked_indices = np.flatnonzero(row_scores > self.config.marking_threshold)
             graded_results[i + 1] = {
-                "selected": marked_indices,
-                "confidence": [res["score"] for res in marking_status]
+                "selected": marked_indices.tolist(),
+                "confidence": row_scores.tolist()
             }
 
         return graded_results
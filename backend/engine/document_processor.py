@@ -127,7 +127,10 @@ class DocumentProcessor:
         return rect
 
     def four_point_transform(
-        self, image: NDArray[np.uint8], pts: NDArray[np.float32]
+        self,
+        image: NDArray[np.uint8],
+        pts: NDArray[np.float32],
+        offset: Tuple[int, int] = (0, 0)
     ) -> NDArray[np.uint8]:
         """
         Apply perspective transform to get a top-down view.
@@ -135,6 +138,8 @@ class DocumentProcessor:
         Args:
             image: Input image as numpy array.
             pts: Array of 4 corner points.
+            offset: Position in image of the origin of pts. Lets a region of
+                image be warped without cropping it first.
 
         Returns:
             Warped (perspective-corrected) image.
@@ -157,6 +162,9 @@ class DocumentProcessor:
             [0, maxHeight - 1]], dtype="float32")
 
         M = cv2.getPerspectiveTransform(rect, dst)
+        if offset != (0, 0):
+            # Fold the crop into the transform: source -> region -> top-down
+            M = M @ np.array([[1, 0, -offset[0]], [0, 1, -offset[1]], [0, 0, 1]], dtype=np.float64)
         warped = cv2.warpPerspective(image, M, (maxWidth, maxHeight))
 
         return warped
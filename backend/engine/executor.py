@@ -0,0 +1,178 @@
+"""
+Grading Executor Module
+
+Dispatches blocking grading work off the asyncio event loop.
+OpenCV stages run on a thread pool (OpenCV releases the GIL), while OCR and
+other Python-heavy stages can run on a process pool. Both pools have a bound
+on queued + running tasks so a saturated server rejects new work quickly
+instead of letting requests pile up.
+"""
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class ExecutorConfig:
+    """Configuration for the grading executor pools."""
+
+    # Worker threads for GIL-releasing OpenCV work
+    thread_workers: int = 4
+
+    # Worker processes for OCR / Python-heavy work (0 = use the thread pool)
+    process_workers: int = 1
+
+    # Maximum queued + running tasks per pool before rejecting new work
+    max_pending_threads: int = 16
+    max_pending_processes: int = 4
+
+    # Seconds clients are asked to wait when the executor is saturated
+    retry_after: int = 5
+
+    # Start method for worker processes ("spawn" avoids forking a threaded server)
+    process_start_method: str = "spawn"
+
+
+class ExecutorSaturatedError(RuntimeError):
+    """Raised when a pool already has its maximum number of pending tasks."""
+
+    def __init__(self, pool: str, limit: int, retry_after: int):
+        super().__init__(f"{pool} pool is saturated ({limit} pending tasks)")
+        self.pool = pool
+        self.limit = limit
+        self.retry_after = retry_after
+
+
+class _BoundedPool:
+    """An executor paired with a pending-task counter."""
+
+    def __init__(self, name: str, executor: Executor, max_pending: int):
+        self.name = name
+        self.executor = executor
+        self.max_pending = max_pending
+        self.pending = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, retry_after: int) -> None:
+        with self._lock:
+            if self.pending >= self.max_pending:
+                raise ExecutorSaturatedError(self.name, self.max_pending, retry_after)
+            self.pending += 1
+
+    def release(self) -> None:
+        with self._lock:
+            self.pending -= 1
+
+
+class GradingExecutor:
+    """Bounded thread and process pools shared by all API endpoints."""
+
+    def __init__(self, config: Optional[ExecutorConfig] = None):
+        """
+        Initialize the executor. Pools are created lazily on first use.
+
+        Args:
+            config: Configuration object. Uses defaults if not provided.
+        """
+        self.config = config or ExecutorConfig()
+        self._thread_pool: Optional[_BoundedPool] = None
+        self._process_pool: Optional[_BoundedPool] = None
+        self._init_lock = threading.Lock()
+
+    @property
+    def has_process_pool(self) -> bool:
+        """Whether process-bound work runs in separate worker processes."""
+        return self.config.process_workers > 0
+
+    def _get_thread_pool(self) -> _BoundedPool:
+        with self._init_lock:
+            if self._thread_pool is None:
+                self._thread_pool = _BoundedPool(
+                    "thread",
+                    ThreadPoolExecutor(
+                        max_workers=self.config.thread_workers,
+                        thread_name_prefix="grading"
+                    ),
+                    self.config.max_pending_threads
+                )
+            return self._thread_pool
+
+    def _get_process_pool(self) -> _BoundedPool:
+        if not self.has_process_pool:
+            return self._get_thread_pool()
+
+        with self._init_lock:
+            if self._process_pool is None:
+                logger.info(
+                    f"Starting {self.config.process_workers} grading worker process(es)"
+                )
+                self._process_pool = _BoundedPool(
+                    "process",
+                    ProcessPoolExecutor(
+                        max_workers=self.config.process_workers,
+                        mp_context=multiprocessing.get_context(
+                            self.config.process_start_method
+                        )
+                    ),
+                    self.config.max_pending_processes
+                )
+            return self._process_pool
+
+    async def _run(self, pool: _BoundedPool, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        pool.acquire(self.config.retry_after)
+        try:
+            future = pool.executor.submit(functools.partial(func, *args, **kwargs))
+        except BaseException:
+            pool.release()
+            raise
+        # Release when the work itself finishes, not when the awaiting request
+        # goes away: a cancelled request leaves a running task holding its slot
+        future.add_done_callback(lambda _: pool.release())
+        return await asyncio.wrap_future(future)
+
+    async def run_in_thread(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a blocking callable on the thread pool.
+
+        Raises:
+            ExecutorSaturatedError: If the thread pool queue is full.
+        """
+        return await self._run(self._get_thread_pool(), func, *args, **kwargs)
+
+    async def run_in_process(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a picklable, module-level callable on the process pool.
+
+        Falls back to the thread pool when process_workers is 0.
+
+        Raises:
+            ExecutorSaturatedError: If the pool queue is full.
+        """
+        return await self._run(self._get_process_pool(), func, *args, **kwargs)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Return pending-task counts and limits for each active pool."""
+        stats: Dict[str, Dict[str, int]] = {}
+        for pool in (self._thread_pool, self._process_pool):
+            if pool is not None:
+                stats[pool.name] = {"pending": pool.pending, "limit": pool.max_pending}
+        return stats
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down all pools."""
+        with self._init_lock:
+            for pool in (self._thread_pool, self._process_pool):
+                if pool is not None:
+                    pool.executor.shutdown(wait=wait)
+            self._thread_pool = None
+            self._process_pool = None
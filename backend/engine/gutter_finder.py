@@ -0,0 +1,206 @@
+"""
+Gutter Finder Module
+
+Splits a page of stacked OMR cards at the blank gutters between them. The
+ink projection is computed on a decimated copy of the page and smoothed
+with a cumulative-sum box filter, so segmentation touches only a small
+fraction of the scan's pixels. The card count is either given
+or inferred from the number of deep valleys in the projection.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from numpy.typing import NDArray
+
+from .shared_image import ImageInput, as_array
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class GutterFinderConfig:
+    """Configuration for page segmentation at card gutters."""
+
+    # Longest side of the decimated page the projection is computed on
+    max_dimension: int = 800
+
+    # Minimum card length along the split axis, as a fraction of the page
+    # size across it (cards stacked on a page span its width)
+    min_card_ratio: float = 0.25
+
+    # Width of the box filter smoothing the projection, as a fraction of the
+    # minimum card length (wide enough to flatten bubble rows inside a card)
+    smoothing_ratio: float = 0.15
+
+    # With a known card count, each gutter is searched within this fraction
+    # of a card length around its evenly spaced position
+    search_ratio: float = 0.35
+
+    # Auto-detection: minimum valley depth relative to the projection peak
+    min_valley_depth: float = 0.5
+
+    # Auto-detection: maximum number of cards on a page
+    max_cards: int = 8
+
+
+def box_filter_1d(profile: NDArray[np.floating], window: int) -> NDArray[np.float64]:
+    """
+    Smooth a 1-D profile with a centered moving average using a cumulative sum.
+
+    Args:
+        profile: Values to smooth.
+        window: Filter width in samples (made odd).
+
+    Returns:
+        Smoothed profile of the same length; edges are padded by replication.
+    """
+    window = max(1, int(window)) | 1
+    half = window // 2
+    padded = np.pad(np.asarray(profile, dtype=np.float64), (half, half), mode="edge")
+    cumsum = np.concatenate([[0.0], np.cumsum(padded)])
+    return (cumsum[window:] - cumsum[:-window]) / window
+
+
+def _plateau_center(profile: NDArray[np.float64], index: int, start: int, stop: int) -> int:
+    """Middle of the run of values equal to profile[index] within [start, stop)."""
+    value = profile[index]
+    left = index
+    while left > start and profile[left - 1] == value:
+        left -= 1
+    right = index
+    while right < stop - 1 and profile[right + 1] == value:
+        right += 1
+    return (left + right) // 2
+
+
+class GutterFinder:
+    """Finds the gutters between cards stacked along one axis of a page."""
+
+    def __init__(self, config: Optional[GutterFinderConfig] = None):
+        """
+        Initialize the gutter finder.
+
+        Args:
+            config: Configuration object. Uses defaults if not provided.
+        """
+        self.config = config or GutterFinderConfig()
+
+    def projection(self, image: ImageInput, axis: int = 0) -> Tuple[NDArray[np.float64], float]:
+        """
+        Compute the smoothed ink projection of a downsampled page.
+
+        Args:
+            image: Page image (BGR or grayscale).
+            axis: 0 for cards stacked vertically (gutters are rows),
+                1 for cards side by side (gutters are columns).
+
+        Returns:
+            Tuple of (smoothed ink fraction per row/column, downsampling scale).
+        """
+        image = as_array(image)
+        # Decimate by striding before any per-pixel work; blank gutters stay blank
+        step = max(1, -(-max(image.shape[:2]) // self.config.max_dimension))
+        small = np.ascontiguousarray(image[::step, ::step])
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY) if small.ndim == 3 else small
+        scale = 1.0 / step
+
+        _, ink = cv2.threshold(gray, 0, 1, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+        profile = ink.mean(axis=1 - axis)
+        window = round(self.config.smoothing_ratio * self._min_card_length(gray.shape, axis))
+        return box_filter_1d(profile, window), scale
+
+    def _min_card_length(self, shape: Tuple[int, ...], axis: int) -> int:
+        """Minimum card length along the axis, in pixels of an image of this shape."""
+        return max(1, int(self.config.min_card_ratio * shape[1 - axis]))
+
+    def split_points(
+        self,
+        image: ImageInput,
+        num_cards: Optional[int] = None,
+        axis: int = 0
+    ) -> List[int]:
+        """
+        Find where to split a page into cards.
+
+        Args:
+            image: Page image (BGR or grayscale).
+            num_cards: Number of cards on the page; inferred from the
+                projection valleys if None.
+            axis: 0 for cards stacked vertically, 1 for cards side by side.
+
+        Returns:
+            Full-resolution split coordinates along the axis, starting with 0
+            and ending with the page length, so card i spans
+            [points[i], points[i + 1]).
+        """
+        shape = as_array(image).shape
+        length = shape[axis]
+        smoothed, scale = self.projection(image, axis)
+
+        if num_cards is None:
+            min_card = self._min_card_length((shape[0] * scale, shape[1] * scale), axis)
+            gutters = self._auto_gutters(smoothed, min_card)
+        else:
+            gutters = self._fixed_gutters(smoothed, num_cards)
+
+        points = [0] + [min(length, int(round(g / scale))) for g in gutters] + [length]
+        logger.debug(f"Gutter split points: {points}")
+        return points
+
+    def _fixed_gutters(self, smoothed: NDArray[np.float64], num_cards: int) -> List[int]:
+        """Deepest point near each of the num_cards - 1 evenly spaced gutter positions."""
+        if num_cards < 1:
+            raise ValueError("num_cards must be at least 1")
+        n = len(smoothed)
+        card = n / num_cards
+        reach = max(1, int(self.config.search_ratio * card))
+
+        gutters = []
+        for i in range(1, num_cards):
+            expected = int(i * card)
+            start = max(gutters[-1] + 1 if gutters else 0, expected - reach)
+            stop = min(n, expected + reach + 1)
+            if stop <= start:
+                start, stop = expected, expected + 1
+            index = start + int(np.argmin(smoothed[start:stop]))
+            gutters.append(_plateau_center(smoothed, index, start, stop))
+        return gutters
+
+    def _auto_gutters(self, smoothed: NDArray[np.float64], reach: int) -> List[int]:
+        """Valleys at least min_valley_depth deep and one minimum card length (reach) apart."""
+        n = len(smoothed)
+        peak = float(smoothed.max())
+        if peak <= 0 or n <= 2 * reach:
+            return []
+
+        # Highest ink level within one card length on each side of every position
+        padded = np.pad(smoothed, reach, mode="edge")
+        windows = sliding_window_view(padded, reach)
+        left_max = windows[:n].max(axis=1)
+        right_max = windows[reach + 1:reach + 1 + n].max(axis=1)
+
+        depth = (np.minimum(left_max, right_max) - smoothed) / peak
+        # A gutter leaves at least one minimum card length before and after it
+        depth[:reach] = -np.inf
+        depth[n - reach:] = -np.inf
+
+        # Only the lowest point within a card length on either side is a valley
+        neighborhood = sliding_window_view(padded, 2 * reach + 1).min(axis=1)
+        candidates = np.flatnonzero(
+            (depth >= self.config.min_valley_depth) & (smoothed <= neighborhood)
+        )
+
+        # Deepest first, skipping valleys within a card length of an accepted one
+        gutters: List[int] = []
+        for index in candidates[np.argsort(-depth[candidates], kind="stable")]:
+            center = _plateau_center(smoothed, int(index), 0, n)
+            if all(abs(center - g) >= reach for g in gutters):
+                gutters.append(center)
+            if len(gutters) == self.config.max_cards - 1:
+                break
+        return sorted(gutters)
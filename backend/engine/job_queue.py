@@ -0,0 +1,405 @@
+"""
+Job Queue Module
+
+Persistent background job queue for long-running grading pipelines.
+Jobs are stored in a local SQLite database so queued and interrupted jobs
+survive worker restarts without an external message broker.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class JobStatus:
+    """Job lifecycle states."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+@dataclass
+class Job:
+    """A grading job and its current state."""
+
+    job_id: str
+    status: str
+    stage: str
+    progress: float  # 0.0 - 1.0
+    params: Dict[str, Any]
+    result: Optional[Dict[str, Any]]
+    error: Optional[str]
+    created_at: float
+    updated_at: float
+
+    def to_dict(self, include_result: bool = True) -> Dict[str, Any]:
+        """Serialize the job for API responses (input params are internal)."""
+        data: Dict[str, Any] = {
+            "job_id": self.job_id,
+            "status": self.status,
+            "stage": self.stage,
+            "progress": round(self.progress, 3),
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+        if self.error:
+            data["error"] = self.error
+        if include_result and self.result is not None:
+            data["result"] = self.result
+        return data
+
+
+class JobQueueFullError(RuntimeError):
+    """Raised when the maximum number of jobs are already waiting to run."""
+
+    def __init__(self, limit: int):
+        super().__init__(f"Job queue is full ({limit} queued jobs)")
+        self.limit = limit
+
+
+# Progress callback: (stage, progress 0.0-1.0)
+ProgressCallback = Callable[[str, float], None]
+
+# Job handler: runs the pipeline for a job and returns its JSON-serializable result
+JobHandler = Callable[[Job, ProgressCallback], Dict[str, Any]]
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    stage TEXT NOT NULL DEFAULT '',
+    progress REAL NOT NULL DEFAULT 0,
+    params TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    owner_pid INTEGER,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_updated ON jobs (status, updated_at);
+"""
+
+
+def _pid_alive(pid: Optional[int]) -> bool:
+    """Check whether a process with the given PID is still running."""
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobStore:
+    """SQLite-backed storage for grading jobs."""
+
+    def __init__(self, db_path: str):
+        """
+        Initialize the store, creating the database if needed.
+
+        Args:
+            db_path: Path to the SQLite database file.
+        """
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # A connection per operation keeps the store safe to share across threads
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _row_to_job(row: sqlite3.Row) -> Job:
+        return Job(
+            job_id=row["job_id"],
+            status=row["status"],
+            stage=row["stage"],
+            progress=row["progress"],
+            params=json.loads(row["params"]),
+            result=json.loads(row["result"]) if row["result"] else None,
+            error=row["error"],
+            created_at=row["created_at"],
+            updated_at=row["updated_at"],
+        )
+
+    def create(
+        self,
+        params: Dict[str, Any],
+        job_id: Optional[str] = None,
+        max_queued: Optional[int] = None
+    ) -> Job:
+        """
+        Enqueue a new job.
+
+        Args:
+            params: JSON-serializable job parameters (e.g. input file paths).
+            job_id: Optional ID. A UUID is generated if not provided.
+            max_queued: Reject the job if this many jobs are already queued.
+
+        Returns:
+            The queued job.
+
+        Raises:
+            JobQueueFullError: If max_queued jobs are already waiting.
+        """
+        job_id = job_id or str(uuid.uuid4())
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if max_queued is not None and self._count(conn, JobStatus.QUEUED) >= max_queued:
+                    raise JobQueueFullError(max_queued)
+                conn.execute(
+                    "INSERT INTO jobs (job_id, status, stage, progress, params, created_at, updated_at) "
+                    "VALUES (?, ?, ?, 0, ?, ?, ?)",
+                    (job_id, JobStatus.QUEUED, "queued", json.dumps(params), now, now)
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return self.get(job_id)
+
+    @staticmethod
+    def _count(conn: sqlite3.Connection, status: str) -> int:
+        return conn.execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (status,)).fetchone()[0]
+
+    def count(self, status: str) -> int:
+        """Number of jobs in a given status."""
+        with self._connect() as conn:
+            return self._count(conn, status)
+
+    def prune_finished(self, max_age: float) -> int:
+        """
+        Delete completed and failed jobs, with their results, after a retention period.
+
+        Args:
+            max_age: Seconds a finished job is kept after its last update.
+
+        Returns:
+            Number of deleted jobs.
+        """
+        cutoff = time.time() - max_age
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+                (JobStatus.COMPLETED, JobStatus.FAILED, cutoff)
+            )
+        return cursor.rowcount
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Fetch a job by ID, or None if it does not exist."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def claim_next(self) -> Optional[Job]:
+        """
+        Atomically claim the oldest queued job for this process.
+
+        Returns:
+            The claimed job (now running), or None if the queue is empty.
+        """
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT job_id FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1",
+                    (JobStatus.QUEUED,)
+                ).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+                conn.execute(
+                    "UPDATE jobs SET status = ?, stage = ?, owner_pid = ?, updated_at = ? "
+                    "WHERE job_id = ?",
+                    (JobStatus.RUNNING, "starting", os.getpid(), time.time(), row["job_id"])
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return self.get(row["job_id"])
+
+    def update_progress(self, job_id: str, stage: str, progress: float) -> None:
+        """Record the current stage and progress of a running job."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET stage = ?, progress = ?, updated_at = ? WHERE job_id = ?",
+                (stage, min(1.0, max(0.0, progress)), time.time(), job_id)
+            )
+
+    def complete(self, job_id: str, result: Dict[str, Any]) -> None:
+        """Mark a job as completed and store its result."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, stage = ?, progress = 1, result = ?, updated_at = ? "
+                "WHERE job_id = ?",
+                (JobStatus.COMPLETED, "completed", json.dumps(result), time.time(), job_id)
+            )
+
+    def fail(self, job_id: str, error: str) -> None:
+        """Mark a job as failed with an error message."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, stage = ?, error = ?, updated_at = ? WHERE job_id = ?",
+                (JobStatus.FAILED, "failed", error, time.time(), job_id)
+            )
+
+    def requeue_interrupted(self) -> List[str]:
+        """
+        Requeue running jobs whose owning process is no longer alive.
+
+        Returns:
+            IDs of the requeued jobs.
+        """
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = conn.execute(
+                    "SELECT job_id, owner_pid FROM jobs WHERE status = ?",
+                    (JobStatus.RUNNING,)
+                ).fetchall()
+                requeued = [
+                    r["job_id"] for r in rows
+                    if r["owner_pid"] == os.getpid() or not _pid_alive(r["owner_pid"])
+                ]
+                for job_id in requeued:
+                    conn.execute(
+                        "UPDATE jobs SET status = ?, stage = ?, progress = 0, owner_pid = NULL, "
+                        "updated_at = ? WHERE job_id = ?",
+                        (JobStatus.QUEUED, "queued", time.time(), job_id)
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return requeued
+
+
+class JobRunner:
+    """Background worker threads that execute queued jobs."""
+
+    def __init__(
+        self,
+        store: JobStore,
+        handler: JobHandler,
+        num_workers: int = 1,
+        poll_interval: float = 2.0,
+        retention: Optional[float] = None
+    ):
+        """
+        Initialize the runner.
+
+        Args:
+            store: Job store to pull jobs from.
+            handler: Callable that runs a job and returns its result.
+            num_workers: Number of worker threads.
+            poll_interval: Seconds between queue polls when idle.
+            retention: Seconds finished jobs are kept before they are pruned
+                (on startup and whenever a job is claimed). None keeps them.
+        """
+        self.store = store
+        self.handler = handler
+        self.num_workers = num_workers
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> None:
+        """Requeue interrupted jobs and start the worker threads."""
+        if self._threads:
+            return
+        requeued = self.store.requeue_interrupted()
+        if requeued:
+            logger.info(f"Requeued {len(requeued)} interrupted job(s)")
+        self.prune()
+        self._stopping.clear()
+        for i in range(self.num_workers):
+            thread = threading.Thread(
+                target=self._worker_loop, name=f"job-worker-{i}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Signal worker threads to stop after their current job."""
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def prune(self) -> None:
+        """Delete finished jobs older than the retention period."""
+        if self.retention is None:
+            return
+        try:
+            pruned = self.store.prune_finished(self.retention)
+        except sqlite3.Error as e:
+            logger.error(f"Failed to prune finished jobs: {e}")
+            return
+        if pruned:
+            logger.info(f"Pruned {pruned} finished job(s)")
+
+    def notify(self) -> None:
+        """Wake idle workers after a job has been enqueued."""
+        self._wakeup.set()
+
+    def _worker_loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                job = self.store.claim_next()
+            except sqlite3.Error as e:
+                logger.error(f"Failed to claim job: {e}")
+                job = None
+
+            if job is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+
+            self.prune()
+            self.run_job(job)
+
+    def run_job(self, job: Job) -> None:
+        """Run a single claimed job and record its outcome."""
+        logger.info(f"Running job {job.job_id}")
+
+        def report_progress(stage: str, progress: float) -> None:
+            self.store.update_progress(job.job_id, stage, progress)
+
+        try:
+            result = self.handler(job, report_progress)
+            self.store.complete(job.job_id, result)
+            logger.info(f"Job {job.job_id} completed")
+        except Exception as e:
+            logger.exception(f"Job {job.job_id} failed: {e}")
+            self.store.fail(job.job_id, str(e) or e.__class__.__name__)
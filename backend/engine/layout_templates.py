@@ -0,0 +1,423 @@
+"""
+Layout Templates Module
+
+Declarative OMR card layouts. A template (JSON, in backend/layouts) lists the
+question blocks and registration grid of a card; it is compiled once into
+arrays of bubble centers per (question, choice) and per (digit, value) and
+cached by template ID. Grading an aligned card is then a single vectorized
+sampling pass instead of contour discovery and column/row clustering; a
+cheap contrast check (LayoutTemplate.verify) confirms the card is aligned
+before the template is trusted.
+
+Coordinates are in one of two units:
+- "frame": pixels of a reference card of the template's frame size, scaled
+  to the size of the warped card.
+- "grid": multiples of a step measured on the card itself (e.g. the Ye-dam
+  registration grid), mapped with an origin and scale given at sampling time.
+"""
+
+import functools
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .bubble_detector import BubbleDetector, BubbleInput, PreparedImage
+
+logger = logging.getLogger(__name__)
+
+# Directory holding the bundled <template_id>.json layouts
+LAYOUTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "layouts")
+
+LAYOUT_UNITS = ("frame", "grid")
+
+# Default minimum darkness contrast between bubbles and the gaps between them
+DEFAULT_MIN_CONTRAST = 0.03
+
+# Verification boxes are this much larger than sampling boxes, to cover the
+# printed bubble outlines rather than only their centers
+VERIFY_BOX_SCALE = 1.5
+
+
+@dataclass(frozen=True, eq=False)
+class LayoutSample:
+    """Marking scores of every bubble of a template on one card."""
+
+    # (questions, choices) scores, 0-1, higher = darker
+    question_scores: NDArray[np.float64]
+
+    # Question number of each row of question_scores
+    question_numbers: NDArray[np.int64]
+
+    # (digits, values) scores of the registration grid, empty if the layout has none
+    registration_scores: NDArray[np.float64]
+
+    # Score above which a bubble counts as marked
+    threshold: float
+
+    def answers(self) -> Dict[int, List[int]]:
+        """Marked choices (1-based) per question number."""
+        marked = self.question_scores > self.threshold
+        return {
+            int(q): (np.flatnonzero(row) + 1).tolist()
+            for q, row in zip(self.question_numbers, marked)
+        }
+
+    def confidence_scores(self) -> Dict[int, List[float]]:
+        """Choice scores per question number."""
+        return {
+            int(q): row.tolist()
+            for q, row in zip(self.question_numbers, self.question_scores)
+        }
+
+    def registration(self) -> str:
+        """Registration number: the darkest marked value of each digit column."""
+        digits = []
+        for column in self.registration_scores:
+            if column.size and np.nanmax(column) > self.threshold:
+                digits.append(str(int(np.nanargmax(column))))
+        return "".join(digits)
+
+
+@dataclass(frozen=True, eq=False)
+class LayoutTemplate:
+    """A card layout compiled into bubble center arrays."""
+
+    template_id: str
+    name: str
+    units: str
+
+    # Reference card size (width, height) for "frame" units, else None
+    frame: Optional[Tuple[int, int]]
+
+    # Half size of the square sampled around each center (template pixels)
+    roi_half_size: float
+
+    # Marking threshold override; None uses the bubble detector's
+    marking_threshold: Optional[float]
+
+    # (questions, choices, 2) bubble centers as (x, y) in template units
+    question_centers: NDArray[np.float64] = field(repr=False)
+
+    # Question number of each row of question_centers
+    question_numbers: NDArray[np.int64] = field(repr=False)
+
+    # (digits, values, 2) registration bubble centers, (0, 0, 2) if none
+    registration_centers: NDArray[np.float64] = field(repr=False)
+
+    # (N, 2) points midway between diagonal neighbours of question bubbles,
+    # blank paper on an aligned card
+    gap_centers: NDArray[np.float64] = field(repr=False)
+
+    # Minimum median darkness of bubbles over gaps for verify() to pass
+    min_contrast: float
+
+    # Settings for contour-based grading when the template does not apply
+    fallback: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+    # Source specification, e.g. for cache fingerprints
+    spec: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+    @property
+    def num_questions(self) -> int:
+        """Number of questions in the layout."""
+        return int(self.question_centers.shape[0])
+
+    def matches(self, image_shape: Tuple[int, ...], tolerance: float = 0.05) -> bool:
+        """
+        Whether a warped card can be sampled with the template as is.
+
+        Args:
+            image_shape: Shape of the warped card.
+            tolerance: Allowed relative difference of the aspect ratio.
+
+        Returns:
+            True if the card has the frame's aspect ratio. Always False for
+            "grid" units, which need an origin and scale measured on the card.
+        """
+        if self.frame is None:
+            return False
+        height, width = image_shape[:2]
+        if height <= 0 or width <= 0:
+            return False
+        expected = self.frame[0] / self.frame[1]
+        return abs(width / height - expected) <= tolerance * expected
+
+    def verify(
+        self,
+        image: BubbleInput,
+        bubble_detector: BubbleDetector,
+        origin: Optional[Tuple[float, float]] = None,
+        scale: Optional[Tuple[float, float]] = None
+    ) -> bool:
+        """
+        Check that the card's printed bubbles sit where the template expects them.
+
+        Compares the median darkness of boxes around the question bubbles,
+        which cover their printed outlines, with boxes midway between bubbles.
+        A shifted or foreign card shows no such contrast. The boxes are scored
+        on the integral image that sample() reuses.
+
+        Args:
+            image: Warped card image or its PreparedImage.
+            bubble_detector: Detector providing the darkness score.
+            origin: Pixel position of the grid origin ("grid" units only).
+            scale: Pixel size (x, y) of one grid unit ("grid" units only).
+
+        Returns:
+            True if the card is aligned with the template (or the template has
+            no gaps to compare against).
+        """
+        if self.gap_centers.size == 0:
+            return True
+        prepared = image if isinstance(image, PreparedImage) else bubble_detector.prepare(image)
+        offset, factor, half = self._transform(prepared.image.shape, origin, scale)
+        half = int(round(half * VERIFY_BOX_SCALE))
+
+        bubbles = bubble_detector.score_boxes(
+            prepared, _to_boxes(self.question_centers.reshape(-1, 2), offset, factor, half)
+        )
+        gaps = bubble_detector.score_boxes(
+            prepared, _to_boxes(self.gap_centers, offset, factor, half)
+        )
+        contrast = float(np.median(bubbles) - np.median(gaps))
+        if contrast < self.min_contrast:
+            logger.debug(f"Card does not fit layout {self.template_id} (contrast {contrast:.3f})")
+            return False
+        return True
+
+    def _transform(
+        self,
+        image_shape: Tuple[int, ...],
+        origin: Optional[Tuple[float, float]],
+        scale: Optional[Tuple[float, float]]
+    ) -> Tuple[NDArray[np.float64], NDArray[np.float64], float]:
+        """Return the (origin, scale, roi half size) mapping template units to pixels."""
+        if self.units == "frame":
+            height, width = image_shape[:2]
+            sx, sy = width / self.frame[0], height / self.frame[1]
+            half = self.roi_half_size * (sx + sy) / 2
+            return np.zeros(2), np.array([sx, sy]), half
+        if origin is None or scale is None:
+            raise ValueError(f"Layout {self.template_id} uses grid units; origin and scale are required")
+        return np.asarray(origin, dtype=np.float64), np.asarray(scale, dtype=np.float64), self.roi_half_size
+
+    def boxes(
+        self,
+        image_shape: Tuple[int, ...],
+        origin: Optional[Tuple[float, float]] = None,
+        scale: Optional[Tuple[float, float]] = None
+    ) -> Tuple[NDArray[np.int64], NDArray[np.int64]]:
+        """
+        Map the bubble centers onto a card as (x, y, w, h) sampling boxes.
+
+        Args:
+            image_shape: Shape of the warped card.
+            origin: Pixel position of the grid origin ("grid" units only).
+            scale: Pixel size (x, y) of one grid unit ("grid" units only).
+
+        Returns:
+            Tuple of (questions, choices, 4) and (digits, values, 4) box arrays.
+        """
+        offset, factor, half = self._transform(image_shape, origin, scale)
+        half = int(round(half))
+        return (
+            _to_boxes(self.question_centers, offset, factor, half),
+            _to_boxes(self.registration_centers, offset, factor, half)
+        )
+
+    def sample(
+        self,
+        image: BubbleInput,
+        bubble_detector: BubbleDetector,
+        origin: Optional[Tuple[float, float]] = None,
+        scale: Optional[Tuple[float, float]] = None
+    ) -> LayoutSample:
+        """
+        Score every question and registration bubble of an aligned card.
+
+        Args:
+            image: Warped card image or its PreparedImage.
+            bubble_detector: Detector providing the marking score.
+            origin: Pixel position of the grid origin ("grid" units only).
+            scale: Pixel size (x, y) of one grid unit ("grid" units only).
+
+        Returns:
+            LayoutSample with the scores of all bubbles.
+        """
+        prepared = image if isinstance(image, PreparedImage) else bubble_detector.prepare(image)
+        question_boxes, registration_boxes = self.boxes(prepared.image.shape, origin, scale)
+        threshold = self.marking_threshold
+        if threshold is None:
+            threshold = bubble_detector.config.marking_threshold
+        return LayoutSample(
+            question_scores=bubble_detector.score_boxes(prepared, question_boxes),
+            question_numbers=self.question_numbers,
+            registration_scores=bubble_detector.score_boxes(prepared, registration_boxes),
+            threshold=threshold
+        )
+
+
+def _to_boxes(
+    centers: NDArray[np.float64],
+    offset: NDArray[np.float64],
+    factor: NDArray[np.float64],
+    half: int
+) -> NDArray[np.int64]:
+    """(..., 4) square (x, y, w, h) boxes around centers mapped to pixels."""
+    pixels = np.floor(offset + centers * factor).astype(np.int64)
+    sizes = np.full(pixels.shape, 2 * half, dtype=np.int64)
+    return np.concatenate([pixels - half, sizes], axis=-1)
+
+
+def _vector(spec: Dict[str, Any], key: str, context: str) -> NDArray[np.float64]:
+    value = np.asarray(spec.get(key), dtype=np.float64)
+    if value.shape != (2,):
+        raise ValueError(f"{context}: '{key}' must be an [x, y] pair")
+    return value
+
+
+def _grid_centers(
+    origin: NDArray[np.float64],
+    outer_step: NDArray[np.float64],
+    inner_step: NDArray[np.float64],
+    outer: int,
+    inner: int
+) -> NDArray[np.float64]:
+    """(outer, inner, 2) centers of a regular grid."""
+    i = np.arange(outer, dtype=np.float64)[:, None, None]
+    j = np.arange(inner, dtype=np.float64)[None, :, None]
+    return origin + i * outer_step + j * inner_step
+
+
+def compile_template(spec: Dict[str, Any]) -> LayoutTemplate:
+    """
+    Compile a layout specification into a LayoutTemplate.
+
+    Args:
+        spec: Parsed template JSON.
+
+    Returns:
+        The compiled template; its arrays are read-only.
+
+    Raises:
+        ValueError: If the specification is invalid.
+    """
+    template_id = spec.get("id")
+    if not template_id:
+        raise ValueError("Layout template has no 'id'")
+    units = spec.get("units", "frame")
+    if units not in LAYOUT_UNITS:
+        raise ValueError(f"Layout {template_id}: unknown units '{units}'")
+
+    frame = None
+    if units == "frame":
+        frame_spec = spec.get("frame") or {}
+        frame = (int(frame_spec.get("width", 0)), int(frame_spec.get("height", 0)))
+        if frame[0] <= 0 or frame[1] <= 0:
+            raise ValueError(f"Layout {template_id}: 'frame' needs a positive width and height")
+
+    blocks = spec.get("question_blocks") or []
+    if not blocks:
+        raise ValueError(f"Layout {template_id}: no question blocks")
+
+    block_centers = []
+    block_numbers = []
+    block_gaps = []
+    choices = None
+    for idx, block in enumerate(blocks):
+        context = f"Layout {template_id} block {idx}"
+        rows, block_choices = int(block.get("rows", 0)), int(block.get("choices", 0))
+        if rows <= 0 or block_choices <= 0:
+            raise ValueError(f"{context}: 'rows' and 'choices' must be positive")
+        if choices is not None and block_choices != choices:
+            raise ValueError(f"{context}: all blocks must have the same number of choices")
+        choices = block_choices
+        origin = _vector(block, "origin", context)
+        row_step = _vector(block, "row_step", context)
+        choice_step = _vector(block, "choice_step", context)
+        block_centers.append(_grid_centers(origin, row_step, choice_step, rows, block_choices))
+        # Centers of the squares between four neighbouring bubbles
+        gap_origin = origin + (row_step + choice_step) / 2
+        block_gaps.append(_grid_centers(
+            gap_origin, row_step, choice_step, rows - 1, block_choices - 1
+        ).reshape(-1, 2))
+        first = int(block.get("first_question", 1 + sum(len(n) for n in block_numbers)))
+        block_numbers.append(np.arange(first, first + rows, dtype=np.int64))
+
+    question_numbers = np.concatenate(block_numbers)
+    if len(np.unique(question_numbers)) != len(question_numbers):
+        raise ValueError(f"Layout {template_id}: question numbers overlap")
+    order = np.argsort(question_numbers, kind="stable")
+    question_centers = np.concatenate(block_centers)[order]
+    question_numbers = question_numbers[order]
+
+    registration_centers = np.zeros((0, 0, 2), dtype=np.float64)
+    registration = spec.get("registration")
+    if registration:
+        context = f"Layout {template_id} registration"
+        registration_centers = _grid_centers(
+            _vector(registration, "origin", context),
+            _vector(registration, "digit_step", context),
+            _vector(registration, "value_step", context),
+            int(registration.get("digits", 0)), int(registration.get("values", 10))
+        )
+
+    roi_half_size = float(spec.get("roi_half_size", 0))
+    if roi_half_size <= 0:
+        raise ValueError(f"Layout {template_id}: 'roi_half_size' must be positive")
+    marking_threshold = spec.get("marking_threshold")
+    gap_centers = np.concatenate(block_gaps)
+
+    for array in (question_centers, question_numbers, registration_centers, gap_centers):
+        array.setflags(write=False)
+
+    return LayoutTemplate(
+        template_id=template_id,
+        name=spec.get("name", template_id),
+        units=units,
+        frame=frame,
+        roi_half_size=roi_half_size,
+        marking_threshold=None if marking_threshold is None else float(marking_threshold),
+        question_centers=question_centers,
+        question_numbers=question_numbers,
+        registration_centers=registration_centers,
+        gap_centers=gap_centers,
+        min_contrast=float(spec.get("min_contrast", DEFAULT_MIN_CONTRAST)),
+        fallback=dict(spec.get("fallback") or {}),
+        spec=spec
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def load_template(template_id: str, layouts_dir: Optional[str] = None) -> LayoutTemplate:
+    """
+    Load and compile a layout template, once per template ID.
+
+    Args:
+        template_id: Template name; the file is <layouts_dir>/<template_id>.json.
+        layouts_dir: Directory holding the templates. Defaults to backend/layouts.
+
+    Returns:
+        The cached compiled template.
+
+    Raises:
+        FileNotFoundError: If no such template exists.
+        ValueError: If the template is invalid.
+    """
+    path = os.path.join(layouts_dir or LAYOUTS_DIR, f"{template_id}.json")
+    with open(path, "r", encoding="utf-8") as f:
+        spec = json.load(f)
+    if spec.get("id", template_id) != template_id:
+        raise ValueError(f"Layout file {path} declares id '{spec.get('id')}'")
+    spec.setdefault("id", template_id)
+    template = compile_template(spec)
+    logger.info(
+        f"Compiled layout {template_id}: {template.num_questions} questions, "
+        f"{template.registration_centers.shape[0]} registration digits"
+    )
+    return template
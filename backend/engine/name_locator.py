@@ -0,0 +1,295 @@
+"""
+Name Field Locator Module
+
+Reads the student name from an OMR card by OCRing only the name box.
+The box comes from a configured layout region, or from the position of the
+"이름"/"성명" label found once by full-card OCR and cached per layout.
+"""
+
+import logging
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .ocr_engine import OCREngine, bbox_bounds
+
+logger = logging.getLogger(__name__)
+
+# Relative region (x, y, width, height as fractions of the card size)
+RelativeRegion = Tuple[float, float, float, float]
+
+
+@dataclass
+class NameFieldConfig:
+    """Configuration for locating the name field."""
+
+    # Labels marking the name field
+    labels: Tuple[str, ...] = ("이름", "성명")
+
+    # Fixed name box for the layout, relative to the card size.
+    # If None, the box is derived from the label found by full-card OCR.
+    name_region: Optional[RelativeRegion] = None
+
+    # Width of the name box to the right of the label (fraction of card width)
+    name_width_ratio: float = 0.35
+
+    # Height of the name box as a multiple of the label height
+    name_height_scale: float = 3.0
+
+    # Padding around the label (pixels)
+    label_padding: int = 10
+
+    # Consecutive cards whose learned name box yields no name and whose
+    # full-card OCR shows no label, after which the learned box is dropped
+    max_anchor_misses: int = 3
+
+
+def parse_student_name(
+    text_results: List[Dict[str, Any]],
+    labels: Tuple[str, ...] = ("이름", "성명")
+) -> str:
+    """
+    Find the student name in OCR results.
+
+    The name is taken from a "label: name" block or the block after the
+    label; otherwise the first 2-4 character Korean word is used.
+
+    Args:
+        text_results: OCR results with 'text' keys.
+        labels: Labels marking the name field.
+
+    Returns:
+        Student name, or "Unknown".
+    """
+    all_texts = [r["text"] for r in text_results]
+
+    for i, text in enumerate(all_texts):
+        if any(label in text for label in labels):
+            # Often the name is in the same block or the next one
+            if ":" in text and len(text.split(":")[1].strip()) > 0:
+                return text.split(":")[1].strip()
+            elif i + 1 < len(all_texts):
+                return all_texts[i + 1]
+
+    # Try to find a name-like text (Korean characters)
+    for text in all_texts:
+        # Match Korean name pattern (2-4 characters)
+        if re.match(r'^[가-힣]{2,4}$', text.strip()):
+            return text.strip()
+
+    return "Unknown"
+
+
+class NameFieldLocator:
+    """Locates and reads the name field of OMR cards."""
+
+    def __init__(self, config: Optional[NameFieldConfig] = None):
+        """
+        Initialize the locator.
+
+        Args:
+            config: Configuration object. Uses defaults if not provided.
+        """
+        self.config = config or NameFieldConfig()
+        # Name boxes learned from label positions, keyed by layout
+        self._anchor_regions: Dict[str, RelativeRegion] = {}
+        # Consecutive name-box misses per layout
+        self._anchor_misses: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def extract_name(
+        self,
+        image: NDArray[np.uint8],
+        ocr_engine: OCREngine,
+        layout_key: str = "default"
+    ) -> Tuple[str, List[Dict[str, Any]]]:
+        """
+        Read the student name, OCRing only the name box when it is known.
+
+        Falls back to full-card OCR when no box is known for the layout or
+        the crop yields no name; the label found there is (re)cached for the
+        layout, and a learned box is dropped after repeated misses.
+
+        Args:
+            image: Warped OMR card image.
+            ocr_engine: OCR engine to use.
+            layout_key: Identifier of the card layout sharing a name box.
+
+        Returns:
+            Tuple of (student name or "Unknown", OCR results used).
+        """
+        region = self.name_region(image.shape, layout_key)
+        if region is not None:
+            text_results = ocr_engine.extract_from_region(image, region)
+            name = parse_student_name(text_results, self.config.labels)
+            if name != "Unknown":
+                self._reset_misses(layout_key)
+                return name, text_results
+            logger.debug(f"No name in name box for layout {layout_key}, using full-card OCR")
+
+        return self._read_full_card(image, ocr_engine, layout_key, region is not None)
+
+    def extract_names(
+        self,
+        images: Sequence[NDArray[np.uint8]],
+        ocr_engine: OCREngine,
+        layout_key: str = "default"
+    ) -> List[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        Read the student names of several cards sharing a layout.
+
+        Name boxes are OCRed together with OCREngine.extract_text_batch. If no
+        box is known yet, the first card is read in full to find it.
+
+        Args:
+            images: Warped OMR card images.
+            ocr_engine: OCR engine to use.
+            layout_key: Identifier of the card layout sharing a name box.
+
+        Returns:
+            Per-card tuples of (student name or "Unknown", OCR results used).
+        """
+        results: Dict[int, Tuple[str, List[Dict[str, Any]]]] = {}
+        pending = list(range(len(images)))
+
+        if pending and self.name_region(images[0].shape, layout_key) is None:
+            # Locate the name box once; the remaining cards can then be cropped
+            results[0] = self.extract_name(images[0], ocr_engine, layout_key)
+            pending = pending[1:]
+
+        crops: List[NDArray[np.uint8]] = []
+        cropped: List[int] = []
+        for idx in pending:
+            region = self.name_region(images[idx].shape, layout_key)
+            if region is None:
+                results[idx] = self.extract_name(images[idx], ocr_engine, layout_key)
+                continue
+            x, y, w, h = region
+            crops.append(images[idx][y:y + h, x:x + w])
+            cropped.append(idx)
+
+        for idx, text_results in zip(cropped, ocr_engine.extract_text_batch(crops)):
+            name = parse_student_name(text_results, self.config.labels)
+            if name == "Unknown":
+                logger.debug(f"No name in name box for layout {layout_key}, using full-card OCR")
+                results[idx] = self._read_full_card(images[idx], ocr_engine, layout_key, True)
+                continue
+            self._reset_misses(layout_key)
+            results[idx] = (name, text_results)
+
+        return [results[idx] for idx in range(len(images))]
+
+    def name_region(
+        self,
+        image_shape: Tuple[int, ...],
+        layout_key: str = "default"
+    ) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Return the name box for a card in pixels as (x, y, width, height).
+
+        Args:
+            image_shape: Shape of the card image.
+            layout_key: Identifier of the card layout.
+
+        Returns:
+            Name box, or None if not known for the layout.
+        """
+        relative = self.config.name_region
+        if relative is None:
+            with self._lock:
+                relative = self._anchor_regions.get(layout_key)
+        if relative is None:
+            return None
+
+        height, width = image_shape[:2]
+        x = int(round(relative[0] * width))
+        y = int(round(relative[1] * height))
+        w = int(round(relative[2] * width))
+        h = int(round(relative[3] * height))
+        x, y = max(0, x), max(0, y)
+        w, h = min(w, width - x), min(h, height - y)
+        if w <= 0 or h <= 0:
+            return None
+        return x, y, w, h
+
+    def _read_full_card(
+        self,
+        image: NDArray[np.uint8],
+        ocr_engine: OCREngine,
+        layout_key: str,
+        crop_missed: bool
+    ) -> Tuple[str, List[Dict[str, Any]]]:
+        """
+        Read the name from full-card OCR and re-learn the layout's name box.
+
+        A label found on the card replaces the cached box. If the name box was
+        tried and no label is found either, the miss is counted and the learned
+        box is dropped after max_anchor_misses consecutive misses.
+        """
+        text_results = ocr_engine.extract_text(image)
+        if self.config.name_region is None:
+            if self._learn_anchor(text_results, image.shape, layout_key):
+                self._reset_misses(layout_key)
+            elif crop_missed:
+                self._record_miss(layout_key)
+        return parse_student_name(text_results, self.config.labels), text_results
+
+    def _reset_misses(self, layout_key: str) -> None:
+        """Clear the name-box miss count of a layout."""
+        with self._lock:
+            self._anchor_misses.pop(layout_key, None)
+
+    def _record_miss(self, layout_key: str) -> None:
+        """Count a name-box miss, dropping the learned box after too many."""
+        with self._lock:
+            misses = self._anchor_misses.get(layout_key, 0) + 1
+            if misses < self.config.max_anchor_misses:
+                self._anchor_misses[layout_key] = misses
+                return
+            self._anchor_misses.pop(layout_key, None)
+            self._anchor_regions.pop(layout_key, None)
+        logger.info(f"Dropped name box for layout {layout_key} after {misses} misses")
+
+    def _learn_anchor(
+        self,
+        text_results: List[Dict[str, Any]],
+        image_shape: Tuple[int, ...],
+        layout_key: str
+    ) -> bool:
+        """
+        Cache the name box next to the first label found by full-card OCR.
+
+        Returns:
+            True if a label was found and its name box cached.
+        """
+        for r in text_results:
+            if not any(label in r["text"] for label in self.config.labels):
+                continue
+            bounds = bbox_bounds(r.get("bbox"))
+            if bounds is None:
+                continue
+
+            height, width = image_shape[:2]
+            x1, y1, x2, y2 = bounds
+            pad = self.config.label_padding
+            label_h = y2 - y1
+            center_y = (y1 + y2) / 2
+            half_h = label_h * self.config.name_height_scale / 2 + pad
+
+            left = max(0.0, x1 - pad)
+            right = min(float(width), x2 + self.config.name_width_ratio * width)
+            top = max(0.0, center_y - half_h)
+            bottom = min(float(height), center_y + half_h)
+            if right <= left or bottom <= top:
+                continue
+
+            region = (left / width, top / height, (right - left) / width, (bottom - top) / height)
+            with self._lock:
+                self._anchor_regions[layout_key] = region
+            logger.info(f"Cached name box for layout {layout_key}")
+            return True
+        return False
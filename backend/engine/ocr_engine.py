@@ -1,5 +1,6 @@
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 import logging
+import threading
 
 try:
     from paddleocr import PaddleOCR
@@ -9,12 +10,54 @@ except ImportError:
 import numpy as np
 from numpy.typing import NDArray
 
+from .shared_image import ImageInput, as_array
+
 logger = logging.getLogger(__name__)
 
 
+def bbox_bounds(bbox: Any) -> Optional[Tuple[float, float, float, float]]:
+    """
+    Normalize an OCR bounding box to (x1, y1, x2, y2).
+
+    Args:
+        bbox: Box as [x1, y1, x2, y2] or a polygon of (x, y) points.
+
+    Returns:
+        Box bounds, or None if the box is missing or malformed.
+    """
+    if bbox is None:
+        return None
+    try:
+        box = np.asarray(bbox, dtype=np.float64)
+    except (TypeError, ValueError):
+        return None
+    if box.shape == (4,):
+        return float(box[0]), float(box[1]), float(box[2]), float(box[3])
+    if box.ndim == 2 and box.shape[1] == 2 and len(box):
+        return (
+            float(box[:, 0].min()), float(box[:, 1].min()),
+            float(box[:, 0].max()), float(box[:, 1].max())
+        )
+    return None
+
+
+def _shift_bbox(bbox: Any, dy: float) -> Any:
+    """Shift an OCR bounding box vertically, keeping its format."""
+    box = np.asarray(bbox, dtype=np.float64)
+    if box.shape == (4,):
+        box = box + np.array([0, dy, 0, dy])
+    else:
+        box = box + np.array([0, dy])
+    return box.tolist()
+
+
 class OCREngine:
     """Engine for extracting text from images using PaddleOCR."""
 
+    # PaddleOCR's text detector resizes inputs so their longest side is at
+    # most this many pixels (det_limit_side_len, limit type "max")
+    det_limit_side_len: int = 960
+
     def __init__(self, use_gpu: bool = False, lang: str = 'en'):
         """
         Initialize PaddleOCR with specified settings.
@@ -24,6 +67,8 @@ class OCREngine:
             lang: Language code ('ko' for Korean, 'en' for English).
         """
         self.ocr: Optional[Any] = None
+        # PaddleOCR predictors are not thread-safe; serialize inference
+        self._lock = threading.Lock()
         if PaddleOCR:
             try:
                 # Try with use_gpu for older versions
@@ -37,12 +82,17 @@ class OCREngine:
         else:
             logger.warning("PaddleOCR not installed. OCR functionality will be limited.")
 
-    def extract_text(self, image: NDArray[np.uint8]) -> List[Dict[str, Any]]:
+    @property
+    def available(self) -> bool:
+        """Whether an OCR model is loaded."""
+        return self.ocr is not None
+
+    def extract_text(self, image: ImageInput) -> List[Dict[str, Any]]:
         """
         Extract all text from an image.
 
         Args:
-            image: Input image as numpy array (BGR format).
+            image: Input image as numpy array or shared image (BGR format).
 
         Returns:
             List of dictionaries containing 'text', 'confidence', and 'bbox' keys.
@@ -51,11 +101,122 @@ class OCREngine:
             return []
 
         try:
-            result = self.ocr.ocr(image)
+            with self._lock:
+                result = self.ocr.ocr(as_array(image))
         except Exception as e:
             logger.error(f"OCR Error: {e}")
             return []
 
+        return self._parse_result(result)
+
+    def extract_text_batch(
+        self,
+        images: Sequence[ImageInput],
+        max_mosaic_height: Optional[int] = None,
+        gap: int = 32
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Extract text from several small images with as few OCR calls as possible.
+
+        Images are stacked into vertical mosaics separated by blank gaps, each
+        mosaic is OCRed in one call, and detected boxes are mapped back to the
+        image they fall in. Meant for crops such as name fields, where one call
+        per crop would be dominated by per-call overhead.
+
+        Mosaics never exceed the detector's side limit, so stacking does not
+        make the detector shrink the crops (and drop small text) more than
+        OCRing each crop alone would.
+
+        Args:
+            images: Input images as numpy arrays (BGR format).
+            max_mosaic_height: Maximum height and width of one mosaic (pixels).
+                Defaults to det_limit_side_len. Images larger than this are
+                OCRed on their own.
+            gap: Blank rows between stacked images (pixels).
+
+        Returns:
+            Per-image lists in the extract_text format, with boxes relative
+            to their own image.
+        """
+        results: List[List[Dict[str, Any]]] = [[] for _ in images]
+        if not self.available:
+            return results
+        images = [as_array(image) for image in images]
+        limit = max_mosaic_height or self.det_limit_side_len
+
+        # Group consecutive images into mosaics under the size limit
+        groups: List[List[int]] = []
+        height = 0
+        for idx, image in enumerate(images):
+            if image is None or image.size == 0:
+                continue
+            h, w = image.shape[:2]
+            if groups and w <= limit and height + gap + h <= limit:
+                groups[-1].append(idx)
+                height += gap + h
+            else:
+                groups.append([idx])
+                # Oversized images stay alone; nothing may be stacked onto them
+                height = h if w <= limit else limit
+
+        for group in groups:
+            if len(group) == 1:
+                results[group[0]] = self.extract_text(images[group[0]])
+                continue
+
+            mosaic, offsets = self._build_mosaic([images[i] for i in group], gap)
+            for idx, image_results in zip(group, self._split_mosaic_results(
+                self.extract_text(mosaic), offsets, [images[i].shape[0] for i in group]
+            )):
+                results[idx] = image_results
+
+        return results
+
+    @staticmethod
+    def _build_mosaic(
+        images: Sequence[NDArray[np.uint8]],
+        gap: int
+    ) -> Tuple[NDArray[np.uint8], List[int]]:
+        """Stack images vertically on a white canvas, returning it and each image's y offset."""
+        width = max(image.shape[1] for image in images)
+        height = sum(image.shape[0] for image in images) + gap * (len(images) - 1)
+        mosaic = np.full((height, width, 3), 255, dtype=np.uint8)
+
+        offsets: List[int] = []
+        y = 0
+        for image in images:
+            h, w = image.shape[:2]
+            if image.ndim == 2:
+                mosaic[y:y + h, :w] = image[:, :, np.newaxis]
+            else:
+                mosaic[y:y + h, :w] = image[:, :, :3]
+            offsets.append(y)
+            y += h + gap
+        return mosaic, offsets
+
+    @staticmethod
+    def _split_mosaic_results(
+        text_results: List[Dict[str, Any]],
+        offsets: List[int],
+        heights: List[int]
+    ) -> List[List[Dict[str, Any]]]:
+        """Assign mosaic OCR results to images by box center and shift boxes back."""
+        split: List[List[Dict[str, Any]]] = [[] for _ in offsets]
+        starts = np.asarray(offsets)
+        for r in text_results:
+            bounds = bbox_bounds(r.get("bbox"))
+            if bounds is None:
+                continue
+            center_y = (bounds[1] + bounds[3]) / 2
+            idx = int(np.searchsorted(starts, center_y, side="right")) - 1
+            if idx < 0 or center_y > offsets[idx] + heights[idx]:
+                continue  # Box lies in a gap between images
+            split[idx].append({**r, "bbox": _shift_bbox(r["bbox"], -offsets[idx])})
+        return split
+
+    @staticmethod
+    def _parse_result(result: Any) -> List[Dict[str, Any]]:
+        """Convert a PaddleOCR result into the extract_text format."""
         if not result or not result[0]:
             return []
 
@@ -111,20 +272,20 @@ class OCREngine:
         return parsed_results
 
     def extract_from_region(
-        self, image: NDArray[np.uint8], bbox: Tuple[int, int, int, int]
+        self, image: ImageInput, bbox: Tuple[int, int, int, int]
     ) -> List[Dict[str, Any]]:
         """
         Extract text from a specific region.
 
         Args:
-            image: Input image as numpy array.
+            image: Input image as numpy array or shared image.
             bbox: Region of interest as (x, y, width, height).
 
         Returns:
             List of text extraction results from the region.
         """
         x, y, w, h = bbox
-        roi = image[y:y+h, x:x+w]
+        roi = as_array(image)[y:y+h, x:x+w]
         return self.extract_text(roi)
 
     def identify_structural_elements(
@@ -0,0 +1,355 @@
+"""
+OCR Worker Pool Module
+
+Runs OCR in dedicated worker processes, each loading the PaddleOCR model
+once at startup. Images travel to workers through shared memory and results
+come back as futures, so concurrent requests are spread over several cores
+instead of queueing on one in-process model. Workers that crash have their
+tasks failed and are restarted.
+"""
+
+import itertools
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from multiprocessing.connection import wait as wait_for_ready
+from typing import Any, Dict, List, Optional, Tuple
+
+from .ocr_engine import OCREngine
+from .shared_image import ImageInput, SharedImage, SharedImageHandle, as_array
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class OCRPoolConfig:
+    """Configuration for the OCR worker pool."""
+
+    # Number of worker processes, each holding its own model
+    workers: int = 2
+
+    # OCR model settings (see OCREngine)
+    lang: str = "en"
+    use_gpu: bool = False
+
+    # Seconds to wait for workers to load their models at startup
+    startup_timeout: float = 300.0
+
+    # Seconds extract_text waits for a worker's result
+    task_timeout: float = 120.0
+
+    # Crashed workers restarted over the pool's lifetime (guards crash loops)
+    max_restarts: int = 10
+
+    # Seconds the collector waits for worker messages before re-checking for shutdown
+    poll_interval: float = 0.5
+
+    # Start method for worker processes ("spawn" avoids forking a threaded server)
+    start_method: str = "spawn"
+
+
+def _ocr_worker_main(
+    worker_id: int,
+    lang: str,
+    use_gpu: bool,
+    task_queue: Any,
+    result_conn: Any
+) -> None:
+    """Worker process loop: load the model once, then OCR images from shared memory."""
+    engine = OCREngine(use_gpu=use_gpu, lang=lang)
+    result_conn.send(("ready", worker_id, None, engine.available))
+
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        task_id, handle = task
+        try:
+            with SharedImage.attach(handle) as image:
+                results = engine.extract_text(image)
+            result_conn.send(("result", worker_id, task_id, results))
+        except Exception as e:
+            result_conn.send(("error", worker_id, task_id, f"{type(e).__name__}: {e}"))
+
+
+def _release(image: Optional[SharedImage]) -> None:
+    """Close and unlink a task-owned input copy."""
+    if image is not None:
+        image.close()
+        image.unlink()
+
+
+class _Worker:
+    """A worker process with its own task queue, result pipe and in-flight task count."""
+
+    def __init__(self, worker_id: int, process: Any, task_queue: Any, result_conn: Any):
+        self.worker_id = worker_id
+        self.process = process
+        self.task_queue = task_queue
+        # Private pipe, so a worker dying mid-send cannot block the others
+        self.result_conn = result_conn
+        self.pending = 0
+        self.ready = False
+        self.model_loaded = False
+        # Set once the process has died and its tasks were failed
+        self.exited = False
+
+
+class OCRWorkerPool(OCREngine):
+    """
+    Pool of OCR worker processes with warm models.
+
+    Drop-in replacement for OCREngine: extract_text and the methods built on
+    it run in the least loaded worker.
+    """
+
+    def __init__(self, config: Optional[OCRPoolConfig] = None):
+        """
+        Initialize the pool. Workers are started by start() or on first use.
+
+        Args:
+            config: Configuration object. Uses defaults if not provided.
+        """
+        self.config = config or OCRPoolConfig()
+        self.ocr = None
+        self._lock = threading.Lock()
+        self._workers: List[_Worker] = []
+        self._collector: Optional[threading.Thread] = None
+        # task_id -> (future, worker, input copy owned by the task)
+        self._tasks: Dict[int, Tuple[Future, _Worker, Optional[SharedImage]]] = {}
+        self._task_ids = itertools.count()
+        self._ready = threading.Event()
+        self._closed = False
+        self._context: Any = None
+        self._restarts = 0
+
+    @property
+    def available(self) -> bool:
+        """Whether any worker loaded an OCR model."""
+        if self._closed:
+            return False
+        self.start()
+        return any(w.model_loaded and not w.exited for w in self._workers)
+
+    def start(self) -> None:
+        """Spawn the workers and wait until they have loaded their models."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("OCR worker pool is closed")
+            if not self._workers:
+                self._spawn_workers()
+
+        if not self._ready.wait(self.config.startup_timeout):
+            logger.warning("OCR workers did not finish loading before the startup timeout")
+
+    def _spawn_workers(self) -> None:
+        self._context = multiprocessing.get_context(self.config.start_method)
+        logger.info(f"Starting {self.config.workers} OCR worker process(es)")
+        for worker_id in range(max(1, self.config.workers)):
+            self._workers.append(self._spawn_worker(worker_id))
+
+        self._collector = threading.Thread(
+            target=self._collect_results, name="ocr-pool-collector", daemon=True
+        )
+        self._collector.start()
+
+    def _spawn_worker(self, worker_id: int) -> _Worker:
+        """Start one worker process with its own task queue."""
+        task_queue = self._context.Queue()
+        result_conn, worker_conn = self._context.Pipe(duplex=False)
+        process = self._context.Process(
+            target=_ocr_worker_main,
+            args=(worker_id, self.config.lang, self.config.use_gpu,
+                  task_queue, worker_conn),
+            name=f"ocr-worker-{worker_id}",
+            daemon=True
+        )
+        process.start()
+        worker_conn.close()
+        return _Worker(worker_id, process, task_queue, result_conn)
+
+    def submit(self, image: ImageInput) -> "Future[List[Dict[str, Any]]]":
+        """
+        Queue an image for OCR on the least loaded worker.
+
+        Args:
+            image: Input image as numpy array or shared image (BGR format).
+                Numpy images are copied into shared memory once; shared
+                images are passed by handle and must stay open until the
+                future resolves.
+
+        Returns:
+            Future resolving to the extract_text result for the image.
+        """
+        self.start()
+        # Inputs copied here are owned by the task and freed when it finishes
+        owned: Optional[SharedImage] = None
+        if not isinstance(image, SharedImage):
+            owned = image = SharedImage.from_array(as_array(image))
+        handle: SharedImageHandle = image.handle
+
+        future: "Future[List[Dict[str, Any]]]" = Future()
+        with self._lock:
+            live = [w for w in self._workers if w.process.is_alive()]
+            if self._closed or not live:
+                _release(owned)
+                raise RuntimeError("No OCR workers are running")
+            worker = min(live, key=lambda w: w.pending)
+            worker.pending += 1
+            task_id = next(self._task_ids)
+            self._tasks[task_id] = (future, worker, owned)
+
+        worker.task_queue.put((task_id, handle))
+        return future
+
+    def extract_text(self, image: ImageInput) -> List[Dict[str, Any]]:
+        """
+        Extract all text from an image on a worker process.
+
+        Args:
+            image: Input image as numpy array or shared image (BGR format).
+
+        Returns:
+            List of dictionaries containing 'text', 'confidence', and 'bbox' keys.
+            Empty if the workers fail or take longer than task_timeout.
+        """
+        if not self.available:
+            return []
+        try:
+            return self.submit(image).result(timeout=self.config.task_timeout)
+        except FutureTimeoutError:
+            logger.error(f"OCR Error: no worker result within {self.config.task_timeout}s")
+            return []
+        except Exception as e:
+            logger.error(f"OCR Error: {e}")
+            return []
+
+    def _finish_task(self, task_id: int) -> Optional[Future]:
+        """Forget a task, releasing its shared memory; returns its future."""
+        with self._lock:
+            entry = self._tasks.pop(task_id, None)
+            if entry is None:
+                return None
+            future, worker, owned = entry
+            worker.pending -= 1
+        _release(owned)
+        return future
+
+    def _collect_results(self) -> None:
+        """Resolve futures from worker results until the pool is closed."""
+        while not self._closed:
+            with self._lock:
+                workers = [w for w in self._workers if not w.exited]
+            conns = {w.result_conn: w for w in workers}
+            sentinels = {w.process.sentinel: w for w in workers}
+            try:
+                ready = wait_for_ready(list(conns) + list(sentinels), self.config.poll_interval)
+            except OSError:
+                return
+
+            exited = False
+            for obj in ready:
+                if obj in sentinels:
+                    exited = True
+                    continue
+                try:
+                    self._handle_message(obj.recv())
+                except (EOFError, OSError):
+                    exited = True
+            # Sentinels fire as soon as a worker dies, even while others keep answering
+            if exited:
+                self._check_workers()
+
+    def _handle_message(self, message: Tuple[str, int, Optional[int], Any]) -> None:
+        """Apply a ready, result or error message from a worker."""
+        kind, worker_id, task_id, payload = message
+        if kind == "ready":
+            with self._lock:
+                worker = self._workers[worker_id]
+                worker.ready = True
+                worker.model_loaded = bool(payload)
+                if all(w.ready for w in self._workers):
+                    self._ready.set()
+            return
+
+        future = self._finish_task(task_id)
+        if future is None:
+            return
+        if kind == "result":
+            future.set_result(payload)
+        else:
+            future.set_exception(RuntimeError(payload))
+
+    def _check_workers(self) -> None:
+        """Fail the tasks of workers that exited unexpectedly and restart them."""
+        with self._lock:
+            dead = [w for w in self._workers if not w.exited and w.process.exitcode is not None]
+        if not dead:
+            return
+
+        # Results a worker sent before exiting are still valid
+        for worker in dead:
+            try:
+                while worker.result_conn.poll():
+                    self._handle_message(worker.result_conn.recv())
+            except (EOFError, OSError):
+                pass
+            worker.result_conn.close()
+
+        with self._lock:
+            lost = [tid for tid, (_, w, _) in self._tasks.items() if w in dead]
+            for worker in dead:
+                logger.error(
+                    f"OCR worker {worker.worker_id} exited with code {worker.process.exitcode}, "
+                    f"failing {worker.pending} task(s)"
+                )
+                worker.exited = True
+                if self._closed or self._restarts >= self.config.max_restarts:
+                    worker.ready = True  # Do not keep start() waiting on it
+                    continue
+                self._restarts += 1
+                replacement = self._spawn_worker(worker.worker_id)
+                replacement.ready = worker.ready
+                replacement.model_loaded = worker.model_loaded
+                self._workers[worker.worker_id] = replacement
+                logger.info(
+                    f"Restarted OCR worker {worker.worker_id} "
+                    f"({self._restarts}/{self.config.max_restarts})"
+                )
+            if all(w.ready for w in self._workers):
+                self._ready.set()
+            if not any(w.process.is_alive() for w in self._workers):
+                logger.error("All OCR workers have exited; OCR is unavailable")
+
+        for task_id in lost:
+            future = self._finish_task(task_id)
+            if future is not None:
+                future.set_exception(RuntimeError("OCR worker exited unexpectedly"))
+
+    def close(self) -> None:
+        """Stop the workers and fail any queued tasks."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            workers = list(self._workers)
+
+        for worker in workers:
+            if worker.process.is_alive():
+                worker.task_queue.put(None)
+        for worker in workers:
+            worker.process.join(timeout=5)
+            if worker.process.is_alive():
+                worker.process.terminate()
+        if self._collector is not None:
+            self._collector.join(timeout=self.config.poll_interval * 4)
+        for worker in workers:
+            worker.result_conn.close()
+
+        for task_id in list(self._tasks):
+            future = self._finish_task(task_id)
+            if future is not None:
+                future.set_exception(RuntimeError("OCR worker pool is closed"))
+        self._ready.set()
@@ -3,12 +3,25 @@ PDF Answer Extractor Module
 
 Extracts answer keys from PDF files containing exam questions and answers.
 Uses OCR and pattern matching to automatically detect and parse answer sections.
+
+Born-digital PDFs are read from their embedded text layer; only pages
+without usable text are rasterized and sent to OCR. Pages are read lazily,
+last page first by default, and scanning stops once a complete answer key
+has been found. When a full scan is needed, remaining pages can be split
+into disjoint ranges read by a pool of worker processes.
+
+Scanned pages are first rendered as a low-DPI preview to locate the answer
+section; only that region is re-rendered at high DPI for OCR. Pages whose
+preview has answer-like text but no heading are OCRed in full at pdf_dpi.
 """
 
 import re
 import logging
-from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Tuple
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 from numpy.typing import NDArray
@@ -19,12 +32,16 @@ except ImportError:
     fitz = None
 
 try:
-    from pdf2image import convert_from_path, convert_from_bytes
+    from pdf2image import (
+        convert_from_path, convert_from_bytes, pdfinfo_from_path, pdfinfo_from_bytes
+    )
 except ImportError:
     convert_from_path = None
     convert_from_bytes = None
+    pdfinfo_from_path = None
+    pdfinfo_from_bytes = None
 
-from .ocr_engine import OCREngine
+from .ocr_engine import OCREngine, bbox_bounds
 
 logger = logging.getLogger(__name__)
 
@@ -66,6 +83,98 @@ class AnswerExtractorConfig:
     # Minimum confidence for OCR results
     min_ocr_confidence: float = 0.5
 
+    # Read the embedded text layer before rasterizing pages for OCR
+    use_text_layer: bool = True
+
+    # Pages with fewer non-whitespace characters are treated as scanned
+    min_text_layer_chars: int = 20
+
+    # Answer pages whose text layer parses below this confidence are OCRed
+    min_text_layer_confidence: float = 0.6
+
+    # Page scan order: "last_first" (answer tables are usually at the end) or "first_first"
+    page_order: str = "last_first"
+
+    # Stop reading pages once answers 1..N are complete with this confidence
+    early_exit: bool = True
+    early_exit_confidence: float = 0.85
+
+    # Worker processes for full scans (0 or 1 = read pages sequentially)
+    parallel_workers: int = 0
+
+    # Pages read sequentially (for early exit) before the workers take over
+    lazy_pages: int = 2
+
+    # Locate the answer section on a low-DPI preview (or the text layer) and
+    # OCR only that region at roi_dpi, instead of the full page at pdf_dpi
+    adaptive_dpi: bool = True
+    preview_dpi: int = 72
+    roi_dpi: int = 300
+
+    # Points kept above the answer keyword when clipping the answer region
+    roi_margin: float = 20.0
+
+    # Headings that start an answer section, used to place the answer region.
+    # Unlike answer_keywords, these do not occur in ordinary question text
+    # (e.g. "답" in "알맞은 답을 고르시오")
+    heading_keywords: List[str] = field(default_factory=lambda: [
+        "정답", "정답표", "모범답안", "Answer", "ANSWER"
+    ])
+
+    # Answer regions taller than this fraction of the page are not worth
+    # clipping; the full page is OCRed at pdf_dpi instead
+    max_roi_fraction: float = 0.6
+
+
+# PDF source: file path or file content
+PDFSource = Union[str, bytes]
+
+# Page reader: page index -> (text, source)
+PageReader = Callable[[int], Tuple[str, str]]
+
+# Batch page reader: page indices -> {page index: (text, source)}
+PageBatchReader = Callable[[Sequence[int]], Dict[int, Tuple[str, str]]]
+
+
+@dataclass
+class AnswerMatch:
+    """A question/answer pair found by one of the answer patterns."""
+
+    question: int
+    answer: str  # Raw answer token (digit or circle number)
+    pattern_index: int  # Position in answer_patterns; lower wins
+    start: int  # Offsets of the match in the parsed text
+    end: int
+
+
+@lru_cache(maxsize=8)
+def _compile_answer_patterns(patterns: Tuple[str, ...]) -> List[Optional["re.Pattern[str]"]]:
+    """
+    Compile answer patterns once per configuration.
+
+    Each pattern is kept as its own regex, so backreferences, conditionals
+    and named groups in configured patterns behave exactly as written.
+
+    Returns:
+        Compiled regex per pattern. Patterns without (question, answer)
+        groups get None and are ignored.
+    """
+    compiled = [re.compile(pattern) for pattern in patterns]
+    return [regex if regex.groups >= 2 else None for regex in compiled]
+
+
+@lru_cache(maxsize=8)
+def _compile_keywords(keywords: Tuple[str, ...]) -> "re.Pattern[str]":
+    """Compile answer keywords into one case-insensitive alternation."""
+    return re.compile("|".join(re.escape(k) for k in keywords), re.IGNORECASE)
+
+
+def _open_document(source: PDFSource) -> Any:
+    """Open a PDF path or PDF bytes with PyMuPDF."""
+    if isinstance(source, str):
+        return fitz.open(source)
+    return fitz.open(stream=source, filetype="pdf")
+
 
 class PDFAnswerExtractor:
     """Extracts answer keys from PDF exam documents."""
@@ -84,6 +193,7 @@ class PDFAnswerExtractor:
         """
         self.config = config or AnswerExtractorConfig()
         self._ocr_engine = ocr_engine
+        self._page_pool: Optional[ProcessPoolExecutor] = None
 
     @property
     def ocr_engine(self) -> OCREngine:
@@ -106,13 +216,14 @@ class PDFAnswerExtractor:
                 - raw_text: Raw OCR text for debugging
                 - confidence: Extraction confidence score
         """
-        # Try PyMuPDF first (faster), then pdf2image
-        images = self._pdf_to_images_path(pdf_path)
-        if not images:
-            logger.error(f"Failed to convert PDF to images: {pdf_path}")
-            return self._empty_result("PDF conversion failed")
+        if fitz is not None:
+            try:
+                with _open_document(pdf_path) as doc:
+                    return self._extract_from_document(doc, pdf_path)
+            except Exception as e:
+                logger.warning(f"PyMuPDF failed, trying pdf2image: {e}")
 
-        return self._extract_from_images(images)
+        return self._extract_with_pdf2image(pdf_path)
 
     def extract_from_pdf_bytes(self, pdf_bytes: bytes) -> Dict[str, Any]:
         """
@@ -124,103 +235,395 @@ class PDFAnswerExtractor:
         Returns:
             Dictionary containing answers and metadata.
         """
-        images = self._pdf_to_images_bytes(pdf_bytes)
-        if not images:
-            logger.error("Failed to convert PDF bytes to images")
-            return self._empty_result("PDF conversion failed")
+        if fitz is not None:
+            try:
+                with _open_document(pdf_bytes) as doc:
+                    return self._extract_from_document(doc, pdf_bytes)
+            except Exception as e:
+                logger.warning(f"PyMuPDF failed, trying pdf2image: {e}")
 
-        return self._extract_from_images(images)
+        return self._extract_with_pdf2image(pdf_bytes)
 
-    def _pdf_to_images_path(self, pdf_path: str) -> List[NDArray[np.uint8]]:
-        """Convert PDF file to list of images."""
-        images = []
+    def iter_pdf_images(self, source: PDFSource) -> Iterator[NDArray[np.uint8]]:
+        """
+        Render PDF pages one at a time, in page order.
+
+        Each yielded array owns its pixels and stays valid after the next page
+        is rendered; only the pixmap of the current page is alive at a time.
+        If PyMuPDF is unavailable or fails, the remaining pages are rendered
+        one by one with pdf2image.
+
+        Args:
+            source: PDF file path or PDF bytes.
 
-        # Try PyMuPDF first
+        Yields:
+            BGR (or grayscale) page images.
+        """
+        rendered = 0
         if fitz is not None:
             try:
-                doc = fitz.open(pdf_path)
-                for page in doc:
-                    # Render page to image
+                with _open_document(source) as doc:
                     mat = fitz.Matrix(self.config.pdf_dpi / 72, self.config.pdf_dpi / 72)
-                    pix = page.get_pixmap(matrix=mat)
-                    img = np.frombuffer(pix.samples, dtype=np.uint8).reshape(
-                        pix.height, pix.width, pix.n
-                    )
-                    # Convert to BGR if needed
-                    if pix.n == 4:  # RGBA
-                        img = img[:, :, :3]
-                    if pix.n >= 3:
-                        img = img[:, :, ::-1]  # RGB to BGR
-                    images.append(img)
-                doc.close()
-                return images
+                    for page in doc:
+                        pix = page.get_pixmap(matrix=mat)
+                        yield self._pixmap_to_bgr(pix)
+                        rendered += 1
+                return
             except Exception as e:
-                logger.warning(f"PyMuPDF failed, trying pdf2image: {e}")
+                logger.warning(f"PyMuPDF failed after {rendered} page(s), trying pdf2image: {e}")
+
+        num_pages = self._pdf2image_page_count(source)
+        for page_idx in range(rendered, num_pages):
+            image = self._pdf2image_render(source, page_idx)
+            if image is None:
+                return
+            yield image
+
+    def _pixmap_to_bgr(self, pix: Any) -> NDArray[np.uint8]:
+        """Copy a pixmap's samples into an owned BGR image."""
+        img = np.frombuffer(pix.samples_mv, dtype=np.uint8).reshape(
+            pix.height, pix.width, pix.n
+        )
+        # Convert to BGR if needed
+        if pix.n == 4:  # RGBA
+            img = img[:, :, :3]
+        if pix.n >= 3:
+            img = img[:, :, ::-1]  # RGB to BGR
+        # The pixmap is freed with its page, so the channel reorder and the
+        # copy out of it are done in one pass
+        return img.copy()
+
+    def _render_page(
+        self,
+        page: Any,
+        dpi: Optional[int] = None,
+        clip: Optional[Any] = None
+    ) -> NDArray[np.uint8]:
+        """
+        Render a PyMuPDF page to a BGR image.
 
-        # Fallback to pdf2image
-        if convert_from_path is not None:
-            try:
-                pil_images = convert_from_path(pdf_path, dpi=self.config.pdf_dpi)
-                for pil_img in pil_images:
-                    img = np.array(pil_img)
-                    if len(img.shape) == 3 and img.shape[2] == 3:
-                        img = img[:, :, ::-1]  # RGB to BGR
-                    images.append(img)
-                return images
-            except Exception as e:
-                logger.error(f"pdf2image failed: {e}")
+        Args:
+            page: PyMuPDF page.
+            dpi: Render resolution. Defaults to the configured pdf_dpi.
+            clip: Optional fitz.Rect (in points) limiting the rendered area.
+        """
+        dpi = dpi or self.config.pdf_dpi
+        mat = fitz.Matrix(dpi / 72, dpi / 72)
+        pix = page.get_pixmap(matrix=mat, clip=clip)
+        return self._pixmap_to_bgr(pix)
+
+    def _pdf2image_page_count(self, source: PDFSource) -> int:
+        """Count pages with pdf2image (poppler), or 0 if unavailable."""
+        if pdfinfo_from_path is None:
+            return 0
+        try:
+            if isinstance(source, str):
+                info = pdfinfo_from_path(source)
+            else:
+                info = pdfinfo_from_bytes(source)
+            return int(info["Pages"])
+        except Exception as e:
+            logger.error(f"pdf2image failed: {e}")
+            return 0
+
+    def _pdf2image_render(self, source: PDFSource, page_idx: int) -> Optional[NDArray[np.uint8]]:
+        """Render a single page with pdf2image."""
+        try:
+            convert = convert_from_path if isinstance(source, str) else convert_from_bytes
+            pil_images = convert(
+                source, dpi=self.config.pdf_dpi, first_page=page_idx + 1, last_page=page_idx + 1
+            )
+        except Exception as e:
+            logger.error(f"pdf2image failed: {e}")
+            return None
+        if not pil_images:
+            return None
+        img = np.array(pil_images[0])
+        if len(img.shape) == 3 and img.shape[2] == 3:
+            img = img[:, :, ::-1]  # RGB to BGR
+        return img
+
+    def _extract_with_pdf2image(self, source: PDFSource) -> Dict[str, Any]:
+        """Extract answers by rendering pages on demand with pdf2image."""
+        num_pages = self._pdf2image_page_count(source)
+        if not num_pages:
+            logger.error("Failed to convert PDF to images")
+            return self._empty_result("PDF conversion failed")
+
+        def read_page(page_idx: int) -> Tuple[str, str]:
+            image = self._pdf2image_render(source, page_idx)
+            return (self._ocr_page_text(image) if image is not None else ""), "ocr"
 
-        return images
+        page_texts, page_sources = self._scan_pages(num_pages, read_page)
+        result = self._extract_from_texts(page_texts)
+        result["page_sources"] = page_sources
+        return result
+
+    def _pdf_to_images_path(self, pdf_path: str) -> List[NDArray[np.uint8]]:
+        """Convert PDF file to list of images."""
+        return list(self.iter_pdf_images(pdf_path))
 
     def _pdf_to_images_bytes(self, pdf_bytes: bytes) -> List[NDArray[np.uint8]]:
         """Convert PDF bytes to list of images."""
-        images = []
+        return list(self.iter_pdf_images(pdf_bytes))
 
-        # Try PyMuPDF first
-        if fitz is not None:
-            try:
-                doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-                for page in doc:
-                    mat = fitz.Matrix(self.config.pdf_dpi / 72, self.config.pdf_dpi / 72)
-                    pix = page.get_pixmap(matrix=mat)
-                    img = np.frombuffer(pix.samples, dtype=np.uint8).reshape(
-                        pix.height, pix.width, pix.n
-                    )
-                    if pix.n == 4:
-                        img = img[:, :, :3]
-                    if pix.n >= 3:
-                        img = img[:, :, ::-1]
-                    images.append(img)
-                doc.close()
-                return images
-            except Exception as e:
-                logger.warning(f"PyMuPDF failed, trying pdf2image: {e}")
+    def close(self) -> None:
+        """Shut down the page worker pool, if one was started."""
+        if self._page_pool is not None:
+            self._page_pool.shutdown(wait=True)
+            self._page_pool = None
 
-        # Fallback to pdf2image
-        if convert_from_bytes is not None:
-            try:
-                pil_images = convert_from_bytes(pdf_bytes, dpi=self.config.pdf_dpi)
-                for pil_img in pil_images:
-                    img = np.array(pil_img)
-                    if len(img.shape) == 3 and img.shape[2] == 3:
-                        img = img[:, :, ::-1]
-                    images.append(img)
-                return images
-            except Exception as e:
-                logger.error(f"pdf2image failed: {e}")
+    def _extract_from_document(self, doc: Any, source: Optional[PDFSource] = None) -> Dict[str, Any]:
+        """
+        Extract answers from an open PyMuPDF document, one page at a time.
+
+        Pages are read from the text layer when it is usable, otherwise
+        rasterized and OCRed. If no answers are found at all, pages read from
+        the text layer are OCRed as well (e.g. answer tables embedded as images).
+
+        Args:
+            doc: Open PyMuPDF document.
+            source: Path or bytes of the document, required for parallel reads.
+        """
+        if doc.page_count == 0:
+            return self._empty_result("PDF conversion failed")
+
+        parallel = source is not None and self.config.parallel_workers > 1
+
+        def read_page(page_idx: int) -> Tuple[str, str]:
+            return self._read_page(doc, page_idx)
+
+        def read_pages(page_indices: Sequence[int]) -> Dict[int, Tuple[str, str]]:
+            return self._read_pages_parallel(source, page_indices)
+
+        page_texts, page_sources = self._scan_pages(
+            doc.page_count, read_page, read_pages if parallel else None
+        )
+
+        result = self._extract_from_texts(page_texts)
+        text_pages = [
+            idx for idx, src in enumerate(page_sources) if src in ("text", "preview")
+        ]
+        if not result["answers"] and text_pages:
+            logger.info("No answers found, falling back to full-page OCR")
+            if parallel:
+                ocr_results = self._read_pages_parallel(source, text_pages, force_ocr=True)
+            else:
+                ocr_results = {
+                    idx: self._read_page(doc, idx, force_ocr=True) for idx in text_pages
+                }
+            for page_idx, (text, page_source) in ocr_results.items():
+                page_texts[page_idx] = text
+                page_sources[page_idx] = page_source
+            result = self._extract_from_texts(page_texts)
+
+        logger.info(
+            f"Extracted answers from {page_sources.count('text')} text-layer page(s), "
+            f"{page_sources.count('ocr')} OCR page(s), "
+            f"{page_sources.count('roi')} answer-region page(s), "
+            f"{page_sources.count('preview')} preview page(s), "
+            f"{page_sources.count('skipped')} skipped page(s)"
+        )
+        result["page_sources"] = page_sources
+        return result
+
+    def _read_page(self, doc: Any, page_idx: int, force_ocr: bool = False) -> Tuple[str, str]:
+        """
+        Read one page.
+
+        Returns:
+            Tuple of (text, source). Source is "text" (text layer), "roi"
+            (answer region OCR), "preview" (low-DPI OCR of a page without
+            answer headings or answer-like text) or "ocr" (full-page OCR:
+            answer-like text without a located heading, an answer region
+            covering most of the page, or force_ocr).
+        """
+        page = doc[page_idx]
+        if force_ocr:
+            return self._ocr_page_text(self._render_page(page)), "ocr"
+        if self.config.use_text_layer:
+            text = " ".join(page.get_text().split())
+            if self._text_layer_usable(text):
+                return text, "text"
+        if self.config.adaptive_dpi:
+            return self._read_page_adaptive(page)
+        return self._ocr_page_text(self._render_page(page)), "ocr"
+
+    def _read_page_adaptive(self, page: Any) -> Tuple[str, str]:
+        """OCR only the answer section of a page, located on a low-DPI preview."""
+        section_top = self._find_keyword_top_in_text_layer(page)
+        if section_top is None:
+            preview = self._render_page(page, dpi=self.config.preview_dpi)
+            preview_results = self.ocr_engine.extract_text(preview)
+            preview_text = " ".join([r["text"] for r in preview_results])
+            section_top = self._find_keyword_top_in_ocr(preview_results)
+            if section_top is None:
+                if self.find_answer_matches(preview_text):
+                    # Answer-like text without a readable heading (small text is
+                    # unreliable at preview_dpi); read the whole page properly
+                    return self._ocr_page_text(self._render_page(page)), "ocr"
+                return preview_text, "preview"
+            section_top *= 72 / self.config.preview_dpi  # Pixels to points
+
+        # Answer tables sit below their heading; keep the full width and page bottom
+        rect = page.rect
+        top = max(rect.y0, section_top - self.config.roi_margin)
+        if (rect.y1 - top) > self.config.max_roi_fraction * rect.height:
+            # The region is most of the page; a high-DPI crop would cost more
+            return self._ocr_page_text(self._render_page(page)), "ocr"
+        clip = fitz.Rect(rect.x0, top, rect.x1, rect.y1)
+        region = self._render_page(page, dpi=self.config.roi_dpi, clip=clip)
+        return self._ocr_page_text(region), "roi"
+
+    def _find_keyword_top_in_text_layer(self, page: Any) -> Optional[float]:
+        """Return the top (in points) of the first answer heading in the text layer."""
+        tops = [
+            rect.y0
+            for keyword in self.config.heading_keywords
+            for rect in page.search_for(keyword)
+        ]
+        return min(tops) if tops else None
+
+    def _find_keyword_top_in_ocr(self, ocr_results: List[Dict[str, Any]]) -> Optional[float]:
+        """Return the top (in pixels) of the first OCR box containing an answer heading."""
+        if not self.config.heading_keywords:
+            return None
+        headings = _compile_keywords(tuple(self.config.heading_keywords))
+        tops = []
+        for r in ocr_results:
+            bounds = bbox_bounds(r.get("bbox"))
+            if bounds is not None and headings.search(r["text"]):
+                tops.append(bounds[1])
+        return min(tops) if tops else None
+
+    def _read_pages_parallel(
+        self,
+        source: PDFSource,
+        page_indices: Sequence[int],
+        force_ocr: bool = False
+    ) -> Dict[int, Tuple[str, str]]:
+        """
+        Read pages in worker processes, each handling a disjoint page range.
+
+        Workers open the document themselves and return only page text, so
+        at most one rendered page per worker is held in memory.
+        """
+        if not page_indices:
+            return {}
+        if self._page_pool is None:
+            self._page_pool = ProcessPoolExecutor(
+                max_workers=self.config.parallel_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+
+        indices = sorted(page_indices)
+        num_chunks = min(self.config.parallel_workers, len(indices))
+        chunk_size = -(-len(indices) // num_chunks)  # Ceiling division
+        futures = [
+            self._page_pool.submit(
+                _read_page_range, source, indices[i:i + chunk_size], self.config, force_ocr
+            )
+            for i in range(0, len(indices), chunk_size)
+        ]
+
+        pages: Dict[int, Tuple[str, str]] = {}
+        for future in futures:
+            for page_idx, text, page_source in future.result():
+                pages[page_idx] = (text, page_source)
+        return pages
+
+    def _scan_pages(
+        self,
+        num_pages: int,
+        read_page: PageReader,
+        read_pages: Optional[PageBatchReader] = None
+    ) -> Tuple[List[str], List[str]]:
+        """
+        Read pages in the configured order until the answer key is complete.
+
+        Args:
+            num_pages: Number of pages in the document.
+            read_page: Returns (text, source) for a page index.
+            read_pages: Optional batch reader. Pages left after the first
+                lazy_pages (all pages when early exit is disabled) are handed
+                to it in one call.
 
-        return images
+        Returns:
+            Tuple of (page_texts, page_sources) in page order. Pages not read
+            because of an early exit have empty text and source "skipped".
+        """
+        page_texts = [""] * num_pages
+        page_sources = ["skipped"] * num_pages
+        page_answers: Dict[int, Dict[int, int]] = {}
+
+        order = list(range(num_pages))
+        if self.config.page_order == "last_first":
+            order.reverse()
+        sequential_pages = self.config.lazy_pages if self.config.early_exit else 0
+
+        for position, page_idx in enumerate(order):
+            if read_pages is not None and position >= sequential_pages:
+                logger.info(f"Reading {len(order) - position} remaining page(s) in parallel")
+                for idx, (text, source) in read_pages(order[position:]).items():
+                    page_texts[idx] = text
+                    page_sources[idx] = source
+                break
+
+            text, source = read_page(page_idx)
+            page_texts[page_idx] = text
+            page_sources[page_idx] = source
+
+            if not self.config.early_exit or not self._contains_answer_section(text):
+                continue
+            page_answers[page_idx] = self._parse_answers(text)
+
+            # Merge in page order, as in _extract_from_texts
+            merged: Dict[int, int] = {}
+            for idx in sorted(page_answers):
+                merged.update(page_answers[idx])
+            read_texts = [t for t, src in zip(page_texts, page_sources) if src != "skipped"]
+            if self._answers_complete(merged, read_texts):
+                logger.info(f"Answer key complete after reading page {page_idx + 1}, stopping early")
+                break
+
+        return page_texts, page_sources
+
+    def _answers_complete(self, answers: Dict[int, int], texts: List[str]) -> bool:
+        """Check whether answers form a contiguous 1..N sequence with high confidence."""
+        if not answers or set(answers) != set(range(1, max(answers) + 1)):
+            return False
+        return self._calculate_confidence(answers, texts) >= self.config.early_exit_confidence
+
+    def _text_layer_usable(self, text: str) -> bool:
+        """Check whether a page's text layer can be used instead of OCR."""
+        if self._contains_answer_section(text):
+            # Answer pages must parse cleanly, otherwise the table may be an image
+            answers = self._parse_answers(text)
+            confidence = self._calculate_confidence(answers, [text])
+            return confidence >= self.config.min_text_layer_confidence
+        return len(text.replace(" ", "")) >= self.config.min_text_layer_chars
+
+    def _ocr_page_text(self, image: NDArray[np.uint8]) -> str:
+        """OCR a page image and join the recognized text."""
+        ocr_results = self.ocr_engine.extract_text(image)
+        return " ".join([r["text"] for r in ocr_results])
 
     def _extract_from_images(self, images: List[NDArray[np.uint8]]) -> Dict[str, Any]:
         """Extract answers from list of page images."""
+        page_texts, page_sources = self._scan_pages(
+            len(images), lambda page_idx: (self._ocr_page_text(images[page_idx]), "ocr")
+        )
+        result = self._extract_from_texts(page_texts)
+        result["page_sources"] = page_sources
+        return result
+
+    def _extract_from_texts(self, page_texts: List[str]) -> Dict[str, Any]:
+        """Extract answers from the text of each page."""
         all_text = []
         all_answers: Dict[int, int] = {}
 
         # Process each page
-        for page_idx, image in enumerate(images):
-            # OCR the page
-            ocr_results = self.ocr_engine.extract_text(image)
-            page_text = " ".join([r["text"] for r in ocr_results])
+        for page_idx, page_text in enumerate(page_texts):
             all_text.append(page_text)
 
             # Check if this page contains answer section
@@ -254,11 +657,35 @@ class PDFAnswerExtractor:
 
     def _contains_answer_section(self, text: str) -> bool:
         """Check if text contains answer section keywords."""
-        text_lower = text.lower()
-        for keyword in self.config.answer_keywords:
-            if keyword.lower() in text_lower:
-                return True
-        return False
+        if not self.config.answer_keywords:
+            return False
+        return _compile_keywords(tuple(self.config.answer_keywords)).search(text) is not None
+
+    def find_answer_matches(self, text: str) -> List[AnswerMatch]:
+        """
+        Find every answer pattern match in the text.
+
+        Each precompiled pattern contributes the same non-overlapping matches
+        that re.findall would return for it; matches of different patterns
+        may overlap.
+
+        Args:
+            text: Text containing answers.
+
+        Returns:
+            Matches ordered by (pattern priority, position).
+        """
+        matches: List[AnswerMatch] = []
+        for idx, regex in enumerate(_compile_answer_patterns(tuple(self.config.answer_patterns))):
+            if regex is None:
+                continue
+            for m in regex.finditer(text):
+                try:
+                    question = int(m.group(1))
+                except (ValueError, TypeError):
+                    continue
+                matches.append(AnswerMatch(question, m.group(2), idx, m.start(), m.end()))
+        return matches
 
     def _parse_answers(self, text: str) -> Dict[int, int]:
         """
@@ -272,24 +699,20 @@ class PDFAnswerExtractor:
         """
         answers: Dict[int, int] = {}
 
-        for pattern in self.config.answer_patterns:
-            matches = re.findall(pattern, text)
-            for match in matches:
-                try:
-                    q_num = int(match[0])
-                    answer_str = match[1]
-
-                    # Convert circle number to integer
-                    if answer_str in self.config.circle_to_int:
-                        answer = self.config.circle_to_int[answer_str]
-                    else:
-                        answer = int(answer_str)
-
-                    # Only update if not already set (first match wins)
-                    if q_num not in answers and 1 <= answer <= 10:
-                        answers[q_num] = answer
-                except (ValueError, IndexError):
-                    continue
+        # Earlier patterns take priority, then earlier positions
+        for match in self.find_answer_matches(text):
+            try:
+                # Convert circle number to integer
+                if match.answer in self.config.circle_to_int:
+                    answer = self.config.circle_to_int[match.answer]
+                else:
+                    answer = int(match.answer)
+            except (ValueError, TypeError):  # TypeError: optional group did not match
+                continue
+
+            # Only update if not already set (first match wins)
+            if match.question not in answers and 1 <= answer <= 10:
+                answers[match.question] = answer
 
         return answers
 
@@ -333,22 +756,70 @@ class PDFAnswerExtractor:
         }
 
 
+# Process-wide extractor reused by the convenience function, so worker
+# processes load the OCR model once instead of once per call
+_default_extractor: Optional[PDFAnswerExtractor] = None
+
+
+def get_default_extractor(config: Optional[AnswerExtractorConfig] = None) -> PDFAnswerExtractor:
+    """
+    Return the process-wide PDFAnswerExtractor, creating it on first use.
+
+    Args:
+        config: Extractor configuration. The extractor is recreated (keeping
+            its OCR engine) if it differs from the current one.
+    """
+    global _default_extractor
+    config = config or AnswerExtractorConfig()
+    if _default_extractor is None:
+        _default_extractor = PDFAnswerExtractor(config)
+    elif _default_extractor.config != config:
+        _default_extractor.close()
+        _default_extractor = PDFAnswerExtractor(config, ocr_engine=_default_extractor._ocr_engine)
+    return _default_extractor
+
+
+def _read_page_range(
+    source: PDFSource,
+    page_indices: Sequence[int],
+    config: AnswerExtractorConfig,
+    force_ocr: bool = False
+) -> List[Tuple[int, str, str]]:
+    """
+    Read a range of pages in a worker process.
+
+    Returns:
+        List of (page_index, text, source) tuples.
+    """
+    # Worker-side reads are sequential; never start a nested pool
+    extractor = get_default_extractor(replace(config, parallel_workers=0))
+    with _open_document(source) as doc:
+        return [
+            (page_idx, *extractor._read_page(doc, page_idx, force_ocr))
+            for page_idx in page_indices
+        ]
+
+
 # Convenience function
 def extract_answers_from_pdf(
     pdf_path: Optional[str] = None,
-    pdf_bytes: Optional[bytes] = None
+    pdf_bytes: Optional[bytes] = None,
+    config: Optional[AnswerExtractorConfig] = None
 ) -> Dict[str, Any]:
     """
     Extract answers from a PDF file.
 
+    Module-level so it can be dispatched to a worker process.
+
     Args:
         pdf_path: Path to PDF file.
         pdf_bytes: PDF content as bytes.
+        config: Extractor configuration. Uses defaults if not provided.
 
     Returns:
         Dictionary with answers and metadata.
     """
-    extractor = PDFAnswerExtractor()
+    extractor = get_default_extractor(config)
 
     if pdf_path:
         return extractor.extract_from_pdf_path(pdf_path)
@@ -0,0 +1,206 @@
+"""
+Result Cache Module
+
+Content-addressed cache for grading results. Entries are keyed on the
+SHA-256 of the uploaded bytes plus a fingerprint of the configuration that
+produced them, so re-uploading an identical scan or answer-key PDF returns
+the stored result without re-running OpenCV or OCR.
+"""
+
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def config_fingerprint(*parts: Any) -> str:
+    """
+    Build a stable fingerprint of configuration objects.
+
+    Args:
+        parts: Dataclass configs, dicts or plain values.
+
+    Returns:
+        Hex digest identifying the configuration.
+    """
+    normalized = [
+        dataclasses.asdict(p) if dataclasses.is_dataclass(p) else p
+        for p in parts
+    ]
+    encoded = json.dumps(normalized, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """Two-level (memory + disk) LRU cache keyed by content hash."""
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_memory_bytes: int = 64 * 1024 * 1024,
+        max_disk_bytes: int = 512 * 1024 * 1024
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory for the disk tier. Memory only if None.
+            max_memory_bytes: Size limit of the in-memory tier.
+            max_disk_bytes: Size limit of the disk tier.
+        """
+        self.cache_dir = cache_dir
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        # Values are stored pickled so callers never share mutable results
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._disk_bytes = sum(size for _, _, size in self._disk_entries())
+
+    @staticmethod
+    def make_key(content: bytes, namespace: str, *config_parts: Any) -> str:
+        """
+        Build a cache key from upload bytes and the config that processes them.
+
+        Args:
+            content: Uploaded file bytes.
+            namespace: Kind of result (e.g. "grade", "answer_key").
+            config_parts: Configuration objects affecting the result.
+
+        Returns:
+            Hex cache key.
+        """
+        digest = hashlib.sha256()
+        digest.update(namespace.encode("utf-8"))
+        digest.update(config_fingerprint(*config_parts).encode("ascii"))
+        digest.update(content)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for a key, or None on a miss."""
+        with self._lock:
+            payload = self._memory.get(key)
+            if payload is not None:
+                self._memory.move_to_end(key)
+
+        if payload is None and self.cache_dir:
+            path = self._disk_path(key)
+            try:
+                with open(path, "rb") as f:
+                    payload = f.read()
+                os.utime(path)  # Mark as recently used for disk LRU
+            except OSError:
+                return None
+            self._remember(key, payload)
+
+        if payload is None:
+            return None
+        try:
+            return pickle.loads(payload)
+        except Exception as e:
+            logger.warning(f"Discarding unreadable cache entry {key}: {e}")
+            self.discard(key)
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value in both tiers, evicting least recently used entries."""
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        self._remember(key, payload)
+        if self.cache_dir:
+            self._write_disk(key, payload)
+
+    def discard(self, key: str) -> None:
+        """Remove a key from both tiers."""
+        with self._lock:
+            payload = self._memory.pop(key, None)
+            if payload is not None:
+                self._memory_bytes -= len(payload)
+        if self.cache_dir:
+            path = self._disk_path(key)
+            try:
+                size = os.path.getsize(path)
+                os.remove(path)
+                with self._lock:
+                    self._disk_bytes -= size
+            except OSError:
+                pass
+
+    def _remember(self, key: str, payload: bytes) -> None:
+        if len(payload) > self.max_memory_bytes:
+            return
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= len(previous)
+            self._memory[key] = payload
+            self._memory_bytes += len(payload)
+            while self._memory_bytes > self.max_memory_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.pkl")
+
+    def _disk_entries(self) -> List[Tuple[str, float, int]]:
+        """List (path, mtime, size) for every entry in the disk tier."""
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(".pkl"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((path, stat.st_mtime, stat.st_size))
+        return entries
+
+    def _write_disk(self, key: str, payload: bytes) -> None:
+        if len(payload) > self.max_disk_bytes:
+            return
+        path = self._disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            previous = os.path.getsize(path) if os.path.exists(path) else 0
+            # Write atomically so concurrent readers never see partial entries
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write cache entry {key}: {e}")
+            return
+
+        with self._lock:
+            self._disk_bytes += len(payload) - previous
+            over_limit = self._disk_bytes > self.max_disk_bytes
+        if over_limit:
+            self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        """Delete least recently used disk entries until under the size limit."""
+        entries = sorted(self._disk_entries(), key=lambda e: e[1])
+        total = sum(size for _, _, size in entries)
+        for path, _, size in entries:
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
+        with self._lock:
+            self._disk_bytes = total
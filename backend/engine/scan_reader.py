@@ -0,0 +1,217 @@
+"""
+Scan Reader Module
+
+Streams the pages of a batch scan upload one at a time: a single image, a
+multi-page TIFF, a scanned PDF (rendered through PDFAnswerExtractor's
+PyMuPDF path) or a ZIP archive of any of these. Only the page being graded
+is decoded, so a document-feeder scan of hundreds of sheets is read in
+one pass without holding every page in memory.
+"""
+
+import logging
+import os
+import zipfile
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+import cv2
+import numpy as np
+from numpy.typing import NDArray
+
+from .pdf_answer_extractor import PDFAnswerExtractor, AnswerExtractorConfig, PDFSource
+
+logger = logging.getLogger(__name__)
+
+SCAN_FORMATS = ("image", "tiff", "pdf", "zip")
+
+
+@dataclass
+class ScanReaderConfig:
+    """Configuration for reading batch scan uploads."""
+
+    # Resolution scanned PDF pages are rendered at
+    pdf_dpi: int = 300
+
+    # Maximum number of pages read from one upload
+    max_pages: int = 500
+
+    # ZIP archives: maximum uncompressed size of one member, and of all
+    # members together (guards against decompression bombs)
+    max_member_bytes: int = 100 * 1024 * 1024
+    max_archive_bytes: int = 2 * 1024 * 1024 * 1024
+
+
+@dataclass
+class ScanPage:
+    """One decoded page of a batch scan."""
+
+    # Position of the page in the upload, from 0
+    index: int
+
+    # Human-readable origin, e.g. "scan.pdf page 3" or "sheets.zip/a.jpg"
+    source: str
+
+    # Contiguous BGR page image
+    image: NDArray[np.uint8]
+
+
+def detect_scan_format(header: bytes) -> str:
+    """
+    Identify a scan file from its leading bytes.
+
+    Args:
+        header: The first few bytes of the file.
+
+    Returns:
+        One of "tiff", "pdf", "zip" or "image" (anything OpenCV may decode).
+    """
+    if header[:4] in (b"II*\x00", b"MM\x00*"):
+        return "tiff"
+    if header[:5] == b"%PDF-":
+        return "pdf"
+    if header[:4] == b"PK\x03\x04":
+        return "zip"
+    return "image"
+
+
+def _to_bgr(image: NDArray[np.uint8]) -> NDArray[np.uint8]:
+    """Return a 3-channel BGR image."""
+    if image.ndim == 2:
+        return cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+    if image.shape[2] == 4:
+        return cv2.cvtColor(image, cv2.COLOR_BGRA2BGR)
+    return np.ascontiguousarray(image)
+
+
+def _skip_member(name: str) -> bool:
+    """Whether a ZIP member is archive metadata rather than a scan."""
+    base = os.path.basename(name)
+    return name.endswith("/") or name.startswith("__MACOSX/") or not base or base.startswith(".")
+
+
+class ScanReader:
+    """Decodes batch scan uploads page by page."""
+
+    def __init__(
+        self,
+        config: Optional[ScanReaderConfig] = None,
+        pdf_renderer: Optional[PDFAnswerExtractor] = None
+    ):
+        """
+        Initialize the scan reader.
+
+        Args:
+            config: Configuration object. Uses defaults if not provided.
+            pdf_renderer: Extractor whose page renderer reads scanned PDFs.
+                Created with the configured DPI if not provided.
+        """
+        self.config = config or ScanReaderConfig()
+        self.pdf_renderer = pdf_renderer or PDFAnswerExtractor(
+            config=AnswerExtractorConfig(pdf_dpi=self.config.pdf_dpi)
+        )
+
+    def iter_pages(self, path: str, name: Optional[str] = None) -> Iterator[ScanPage]:
+        """
+        Decode the pages of a scan file one at a time, in order.
+
+        Each page is decoded only when requested; a ZIP archive is read
+        member by member in name order.
+
+        Args:
+            path: Path of the uploaded file.
+            name: Display name for page sources. Defaults to the file name.
+
+        Yields:
+            ScanPage per page.
+
+        Raises:
+            ValueError: If the file (or a ZIP member) cannot be decoded, or the
+                upload has more than max_pages pages.
+        """
+        name = name or os.path.basename(path)
+        with open(path, "rb") as f:
+            scan_format = detect_scan_format(f.read(8))
+
+        if scan_format == "zip":
+            images = self._iter_zip(path, name)
+        else:
+            images = self._iter_file(path, scan_format, name)
+
+        index = 0
+        for source, image in images:
+            if index >= self.config.max_pages:
+                raise ValueError(f"{name} has more than {self.config.max_pages} pages")
+            yield ScanPage(index=index, source=source, image=_to_bgr(image))
+            index += 1
+
+        if index == 0:
+            raise ValueError(f"{name} contains no pages")
+
+    def _iter_file(self, path: str, scan_format: str, name: str) -> Iterator[tuple]:
+        """Yield (source, image) for each page of an image, TIFF or PDF file on disk."""
+        if scan_format == "pdf":
+            yield from self._iter_pdf(path, name)
+        elif scan_format == "tiff":
+            count = cv2.imcount(path)
+            for page in range(count):
+                ok, images = cv2.imreadmulti(path, page, 1, flags=cv2.IMREAD_COLOR)
+                if not ok or not images:
+                    raise ValueError(f"Could not decode {name} page {page + 1}")
+                yield f"{name} page {page + 1}", images[0]
+        else:
+            image = cv2.imread(path, cv2.IMREAD_COLOR)
+            if image is None:
+                raise ValueError(f"Could not decode {name}")
+            yield name, image
+
+    def _iter_bytes(self, content: bytes, name: str) -> Iterator[tuple]:
+        """Yield (source, image) for each page of an image, TIFF or PDF held in memory."""
+        scan_format = detect_scan_format(content[:8])
+        if scan_format == "pdf":
+            yield from self._iter_pdf(content, name)
+            return
+        if scan_format == "zip":
+            logger.warning(f"Skipping nested archive {name}")
+            return
+
+        buf = np.frombuffer(content, dtype=np.uint8)
+        if scan_format == "tiff":
+            page = 0
+            while True:
+                ok, images = cv2.imdecodemulti(buf, cv2.IMREAD_COLOR, range=(page, page + 1))
+                if not ok or not images:
+                    break
+                yield f"{name} page {page + 1}", images[0]
+                page += 1
+            if page == 0:
+                raise ValueError(f"Could not decode {name}")
+        else:
+            image = cv2.imdecode(buf, cv2.IMREAD_COLOR)
+            if image is None:
+                raise ValueError(f"Could not decode {name}")
+            yield name, image
+
+    def _iter_pdf(self, source: PDFSource, name: str) -> Iterator[tuple]:
+        """Yield (source, image) for each rendered page of a scanned PDF."""
+        for page, image in enumerate(self.pdf_renderer.iter_pdf_images(source)):
+            yield f"{name} page {page + 1}", image
+
+    def _iter_zip(self, path: str, name: str) -> Iterator[tuple]:
+        """Yield (source, image) for each page of every scan in a ZIP archive."""
+        try:
+            archive = zipfile.ZipFile(path)
+        except zipfile.BadZipFile as e:
+            raise ValueError(f"Could not open {name}: {e}")
+
+        with archive:
+            members = sorted(
+                (info for info in archive.infolist() if not _skip_member(info.filename)),
+                key=lambda info: info.filename
+            )
+            total = 0
+            for info in members:
+                total += info.file_size
+                if info.file_size > self.config.max_member_bytes or total > self.config.max_archive_bytes:
+                    raise ValueError(f"{name}: {info.filename} exceeds the uncompressed size limit")
+                content = archive.read(info)
+                yield from self._iter_bytes(content, f"{name}/{info.filename}")
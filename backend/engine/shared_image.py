@@ -0,0 +1,138 @@
+"""
+Shared Image Module
+
+Images backed by multiprocessing shared memory, so card images can move
+between worker processes by passing a small picklable handle instead of
+pickling the pixel data. Engine entry points accept a SharedImage wherever
+they accept a numpy image.
+
+Lifetime is explicit: the creating process owns the segment and unlinks it
+once every consumer is done; each process closes its own mapping.
+"""
+
+import logging
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Optional, Tuple, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SharedImageHandle:
+    """Picklable reference to a shared memory image."""
+
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+
+
+class SharedImage:
+    """A numpy image stored in a shared memory segment."""
+
+    def __init__(
+        self,
+        shm: shared_memory.SharedMemory,
+        shape: Tuple[int, ...],
+        dtype: Any,
+        owner: bool
+    ):
+        """
+        Wrap an open shared memory segment. Use create, from_array or attach.
+
+        Args:
+            shm: Open shared memory segment.
+            shape: Image shape.
+            dtype: Image dtype.
+            owner: Whether this process created the segment and must unlink it.
+        """
+        self._shm = shm
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.owner = owner
+        # One view per mapping, so id()-keyed caches see the same array each time
+        self._array: Optional[NDArray[Any]] = np.ndarray(
+            self.shape, dtype=self.dtype, buffer=shm.buf
+        )
+
+    @classmethod
+    def create(cls, shape: Tuple[int, ...], dtype: Any = np.uint8) -> "SharedImage":
+        """Allocate an uninitialized shared image owned by this process."""
+        nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        shm = shared_memory.SharedMemory(create=True, size=max(1, nbytes))
+        return cls(shm, shape, dtype, owner=True)
+
+    @classmethod
+    def from_array(cls, array: NDArray[Any]) -> "SharedImage":
+        """Copy an array into a new shared image owned by this process."""
+        image = cls.create(array.shape, array.dtype)
+        image.array[...] = array
+        return image
+
+    @classmethod
+    def attach(cls, handle: SharedImageHandle) -> "SharedImage":
+        """Map a shared image created by another process (or this one)."""
+        shm = shared_memory.SharedMemory(name=handle.name)
+        return cls(shm, handle.shape, handle.dtype, owner=False)
+
+    @property
+    def handle(self) -> SharedImageHandle:
+        """Picklable handle for attaching from another process."""
+        return SharedImageHandle(self._shm.name, self.shape, self.dtype.str)
+
+    @property
+    def array(self) -> NDArray[Any]:
+        """Zero-copy numpy view of the image."""
+        if self._array is None:
+            raise ValueError("Shared image is closed")
+        return self._array
+
+    @property
+    def closed(self) -> bool:
+        """Whether the segment is unmapped in this process."""
+        return self._array is None
+
+    def close(self) -> None:
+        """
+        Unmap the segment in this process.
+
+        Views obtained from array must be released first; the segment
+        itself stays alive until the owner unlinks it.
+        """
+        if self._array is None:
+            return
+        self._array = None
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """Free the segment once every process is done with it (owner only)."""
+        if not self.owner:
+            raise ValueError("Only the creating process may unlink a shared image")
+        self._shm.unlink()
+        self.owner = False
+
+    def __enter__(self) -> "SharedImage":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+        if self.owner:
+            self.unlink()
+
+    def __del__(self) -> None:
+        if getattr(self, "owner", False):
+            logger.warning(f"Shared image {self._shm.name} was garbage collected without unlink()")
+
+
+# An image given either as a numpy array or in shared memory
+ImageInput = Union[NDArray[np.uint8], SharedImage]
+
+
+def as_array(image: ImageInput) -> NDArray[np.uint8]:
+    """Return a numpy view of an image that may live in shared memory."""
+    if isinstance(image, SharedImage):
+        return image.array
+    return image
@@ -1,14 +1,27 @@
 
+import logging
 import cv2
 import numpy as np
 from typing import Dict, List, Any, Optional
 from .document_processor import DocumentProcessor
 from .bubble_detector import BubbleDetector, BubbleDetectorConfig
+from .gutter_finder import GutterFinder
+from .layout_templates import LayoutTemplate, load_template
+from .shared_image import ImageInput, as_array
+
+logger = logging.getLogger(__name__)
 
 class YeDamGrader:
     """Specialized grader for Ye-dam OMR layout (3 cards per page)."""
 
-    def __init__(self, bubble_detector: Optional[BubbleDetector] = None, doc_processor: Optional[DocumentProcessor] = None):
+    def __init__(
+        self,
+        bubble_detector: Optional[BubbleDetector] = None,
+        doc_processor: Optional[DocumentProcessor] = None,
+        layout: Optional[LayoutTemplate] = None,
+        gutter_finder: Optional[GutterFinder] = None,
+        num_cards: Optional[int] = 3
+    ):
         self.bubble_detector = bubble_detector or BubbleDetector(
             config=BubbleDetectorConfig(
                 min_bubble_size=10,
@@ -18,30 +31,21 @@ class YeDamGrader:
             )
         )
         self.doc_processor = doc_processor or DocumentProcessor()
+        # Question bubble positions in registration grid units (backend/layouts/yedam.json)
+        self.layout = layout or load_template("yedam")
+        self.gutter_finder = gutter_finder or GutterFinder()
+        # Cards per page (None = infer from the gutters)
+        self.num_cards = num_cards
 
-    def process_page(self, image: np.ndarray) -> List[Dict[str, Any]]:
-        """Process a full page containing 3 cards using projection-based segmentation."""
-        # 1. Convert to grayscale and invert
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        _, thresh = cv2.threshold(gray, 200, 255, cv2.THRESH_BINARY_INV)
-        
-        # 2. Vertical Projection to find card gutters
-        # Use Otsu to get a better binary image for projection
-        _, thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
-        
-        v_proj = np.sum(thresh, axis=1)
-        v_proj_smoothed = np.convolve(v_proj, np.ones(50)/50, mode='same')
-        h_total = image.shape[0]
-        
-        # We KNOW there are 3 cards, so we find the two best split points in the expected gutter ranges
-        gutter1_min = np.argmin(v_proj_smoothed[int(h_total*0.3):int(h_total*0.45)]) + int(h_total*0.3)
-        gutter2_min = np.argmin(v_proj_smoothed[int(h_total*0.6):int(h_total*0.75)]) + int(h_total*0.6)
-        
-        split_points = [0, gutter1_min, gutter2_min, h_total]
-        print(f"Adaptive split points: {split_points}")
+    def process_page(self, image: ImageInput) -> List[Dict[str, Any]]:
+        """Process a full page of stacked cards (3 by default) using projection-based segmentation."""
+        image = as_array(image)
+        # 1. Find the card gutters on a decimated, box-filtered ink projection
+        split_points = self.gutter_finder.split_points(image, num_cards=self.num_cards)
+        logger.info(f"Adaptive split points: {split_points}")
 
         results = []
-        for i in range(3):
+        for i in range(len(split_points) - 1):
             y_start, y_end = split_points[i], split_points[i+1]
             # Crop with small inner padding to avoid edge noise
             card_crop = image[y_start+10:y_end-10, :]
@@ -134,102 +138,83 @@ class YeDamGrader:
         return "".join([d for d in reg_grid if d is not None])
 
     def _process_card_v2(self, image: np.ndarray, bubbles: List[Any]) -> Dict[str, Any]:
-        """Process card by targeting every bubble position (ROI Sampling)."""
+        """
+        Process card by targeting every bubble position (ROI Sampling).
+
+        The registration grid found among the detected bubbles places the
+        layout template on the card; all question bubbles are then sampled
+        in one integral-image pass.
+
+        Returns:
+            Dict with "registration", "answers" (marked choices per question)
+            and "darkness", the (questions x choices) matrix of ROI darkness
+            (0-1, NaN where the ROI falls outside the card), or without
+            "darkness" if no registration grid was found.
+        """
         h, w = image.shape[:2]
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        
+
         # 1. Use adaptive threshold only to find candidate bubbles for GRID ALIGNMENT
-        centers = [(x + w_b/2, y + h_b/2) for (x, y, w_b, h_b) in bubbles]
-        reg_centers = [c for c in centers if c[0] < w * 0.25]
-        
+        boxes = np.array([b[:4] for b in bubbles], dtype=np.float64).reshape(-1, 4)
+        centers = boxes[:, :2] + boxes[:, 2:] / 2
+        reg_centers = centers[centers[:, 0] < w * 0.25]
+
         # 2. Extract registration params
         reg_id, params = self._extract_registration_and_params(reg_centers, h, w)
         if not params:
             return {"registration": "", "answers": {}}
 
-        # 3. Sample every question bubble position
-        answers = {}
-        y0, dy = params["y_start"], params["y_step"]
-        x0, dx = params["x_start"], params["x_step"]
-        block_offsets = [7.5, 11.0, 14.5, 18.2]
-        
-        roi_size = 12 # Half-size of bubble ROI
-        
-        for g_idx, b_off in enumerate(block_offsets):
-            for r_idx in range(10):
-                q_num = g_idx * 10 + r_idx + 1
-                for c_idx in range(5):
-                    # Target coordinates
-                    tx = int(x0 + (b_off + c_idx * 0.5) * dx)
-                    ty = int(y0 + r_idx * dy)
-                    
-                    # Prevent out of bounds
-                    y1, y2 = max(0, ty - roi_size), min(h, ty + roi_size)
-                    x1, x2 = max(0, tx - roi_size), min(w, tx + roi_size)
-                    
-                    roi = gray[y1:y2, x1:x2]
-                    if roi.size == 0: continue
-                    
-                    # FINAL CALIBRATION: Threshold 180 ensures only dark marks are caught.
-                    # Empty circles average ~213-230.
-                    if np.mean(roi) < 180:
-                        if q_num not in answers: answers[int(q_num)] = []
-                        answers[int(q_num)].append(int(c_idx + 1))
-                        
-        return {"registration": reg_id, "answers": answers}
+        # 3. Sample every question bubble position of the layout at once
+        with self.bubble_detector.prepare(image) as prepared:
+            sample = self.layout.sample(
+                prepared, self.bubble_detector,
+                origin=(params["x_start"], params["y_start"]),
+                scale=(params["x_step"], params["y_step"])
+            )
 
-    def _extract_registration_and_params(self, centers: List[tuple], h: int, w: int) -> tuple:
-        if not centers: return "", None
-        xs = sorted([c[0] for c in centers])
-        col_peaks = []
-        if xs:
-            curr = [xs[0]]
-            for i in range(1, len(xs)):
-                if xs[i] - xs[i-1] > 20:
-                    col_peaks.append(np.mean(curr))
-                    curr = [xs[i]]
-                else: curr.append(xs[i])
-            col_peaks.append(np.mean(curr))
-        
+        # FINAL CALIBRATION: the threshold (mean < 180) ensures only dark marks are caught.
+        # Empty circles average ~213-230.
+        answers = {q: choices for q, choices in sample.answers().items() if choices}
+        return {"registration": reg_id, "answers": answers, "darkness": sample.question_scores}
+
+    @staticmethod
+    def _cluster_peaks(values: np.ndarray, gap: float) -> np.ndarray:
+        """Means of the runs of sorted values separated by more than gap."""
+        values = np.sort(values)
+        bounds = np.flatnonzero(np.diff(values) > gap) + 1
+        return np.array([run.mean() for run in np.split(values, bounds)])
+
+    def _extract_registration_and_params(self, centers: np.ndarray, h: int, w: int) -> tuple:
+        centers = np.asarray(centers, dtype=np.float64).reshape(-1, 2)
+        if not len(centers): return "", None
+        col_peaks = self._cluster_peaks(centers[:, 0], 20)
         if len(col_peaks) < 2: return "", None
-        
-        ys = sorted([c[1] for c in centers])
-        row_peaks = []
-        if ys:
-            curr = [ys[0]]
-            for i in range(1, len(ys)):
-                if ys[i] - ys[i-1] > 15:
-                    row_peaks.append(np.mean(curr))
-                    curr = [ys[i]]
-                else: curr.append(ys[i])
-            row_peaks.append(np.mean(curr))
-            
+
+        row_peaks = self._cluster_peaks(centers[:, 1], 15)
         if len(row_peaks) < 2: return "", None
-        
+
         # Calculate steps
-        x_step = (max(col_peaks) - min(col_peaks)) / (len(col_peaks) - 1)
-        y_step = (max(row_peaks) - min(row_peaks)) / (len(row_peaks) - 1)
-        
+        x_step = (col_peaks.max() - col_peaks.min()) / (len(col_peaks) - 1)
+        y_step = (row_peaks.max() - row_peaks.min()) / (len(row_peaks) - 1)
+
         params = {
-            "x_start": min(col_peaks), "x_step": x_step,
-            "y_start": min(row_peaks), "y_step": y_step
+            "x_start": col_peaks.min(), "x_step": x_step,
+            "y_start": row_peaks.min(), "y_step": y_step
         }
-        
-        # Extract ID
-        reg_id = ""
-        for cp in col_peaks[:5]:
-            best_digit = None
-            min_d = 999
-            for bx, by in centers:
-                if abs(bx - cp) < 15:
-                    digit = round((by - params["y_start"]) / params["y_step"])
-                    if 0 <= digit <= 9:
-                        dist = abs((by - params["y_start"]) - digit * params["y_step"])
-                        if dist < min_d:
-                            min_d = dist
-                            best_digit = digit
-            if best_digit is not None: reg_id += str(best_digit)
-            
+
+        # Extract ID: per column peak, the bubble nearest to a digit row
+        rel_y = centers[:, 1] - params["y_start"]
+        digits = np.round(rel_y / y_step)
+        dist = np.abs(rel_y - digits * y_step)
+        candidates = (
+            (np.abs(centers[None, :, 0] - col_peaks[:5, None]) < 15)
+            & (digits >= 0) & (digits <= 9)
+        )
+        dist = np.where(candidates, dist, np.inf)
+        best = np.argmin(dist, axis=1)
+        reg_id = "".join(
+            str(int(digits[b])) for b, found in zip(best, candidates.any(axis=1)) if found
+        )
+
         return reg_id, params
 
     def _extract_questions_anchored(self, centers: List[tuple], params: dict, h: int, w: int) -> Dict[int, List[int]]:
@@ -1,18 +1,32 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, Form
+from fastapi import FastAPI, UploadFile, File, HTTPException, Form, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.staticfiles import StaticFiles
 import os
+import json
+import shutil
 import uuid
 import cv2
+import numpy as np
 import logging
 import aiofiles
-from typing import List, Optional
+from dataclasses import replace
+from typing import Dict, Iterator, List, Optional, Tuple
 from engine.document_processor import DocumentProcessor
-from engine.bubble_detector import BubbleDetector
+from engine.bubble_detector import BubbleDetector, PreparedImage
 from engine.ocr_engine import OCREngine
-from engine.pdf_answer_extractor import PDFAnswerExtractor
-from engine.omr_grid_detector import OMRGridDetector
+from engine.ocr_pool import OCRWorkerPool, OCRPoolConfig
+from engine.pdf_answer_extractor import PDFAnswerExtractor, AnswerExtractorConfig, extract_answers_from_pdf
+from engine.omr_grid_detector import OMRGridDetector, GridDetectorConfig, OMRCardResult
+from engine.yedam_grader import YeDamGrader
+from engine.scan_reader import ScanReader, ScanReaderConfig, ScanPage
+from engine.name_locator import NameFieldLocator
+from engine.layout_templates import load_template
 from engine.batch_grader import BatchGrader
+from engine.executor import GradingExecutor, ExecutorConfig, ExecutorSaturatedError
+from engine.job_queue import Job, JobQueueFullError, JobRunner, JobStatus, JobStore, ProgressCallback
+from engine.result_cache import ResultCache, config_fingerprint
+from engine.answer_key_registry import AnswerKey, AnswerKeyRegistry, pdf_hash
 
 os.environ["DISABLE_MODEL_SOURCE_CHECK"] = "True"
 
@@ -31,15 +45,67 @@ ALLOWED_PDF_MIME_TYPES = {"application/pdf"}
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
 MAX_PDF_SIZE = 50 * 1024 * 1024  # 50MB for PDFs
 
+# Batch scans: one image, a multi-page TIFF, a scanned PDF or a ZIP of scans
+ALLOWED_BATCH_EXTENSIONS = ALLOWED_IMAGE_EXTENSIONS | {".tif", ".pdf", ".zip"}
+ALLOWED_BATCH_MIME_TYPES = ALLOWED_IMAGE_MIME_TYPES | {
+    "application/pdf", "application/zip", "application/x-zip-compressed"
+}
+MAX_BATCH_FILE_SIZE = int(os.getenv("MAX_BATCH_FILE_SIZE_MB", "200")) * 1024 * 1024
+MAX_BATCH_PAGES = int(os.getenv("MAX_BATCH_PAGES", "500"))
+BATCH_SCAN_DPI = int(os.getenv("BATCH_SCAN_DPI", "300"))
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+# Card layouts a batch scan can hold: SS-03 grids or pages of stacked Ye-dam cards
+CARD_LAYOUTS = ("ss03", "yedam")
+
 # Combined allowed extensions for backward compatibility
 ALLOWED_EXTENSIONS = ALLOWED_IMAGE_EXTENSIONS
 ALLOWED_MIME_TYPES = ALLOWED_IMAGE_MIME_TYPES
 
-# SS-03 OMR Format Configuration
-SS03_QUESTION_COLUMN_X_OFFSET = 300  # X coordinate threshold for question columns (skip ID columns)
-SS03_COLUMN_THRESHOLD = 60  # Pixel threshold for grouping bubbles into columns
-SS03_NUM_QUESTION_COLUMNS = 4  # Number of question columns in SS-03 format
-SS03_QUESTIONS_PER_COLUMN = 10  # Questions per column
+# SS-03 OMR Format Configuration (backend/layouts/ss03.json)
+# Aligned cards are graded by sampling the template's bubble positions; the
+# fallback settings drive contour-based grading for cards that do not match it.
+SS03_LAYOUT = load_template("ss03")
+SS03_QUESTION_COLUMN_X_OFFSET = SS03_LAYOUT.fallback["question_column_x_offset"]  # Skip ID columns
+SS03_COLUMN_THRESHOLD = SS03_LAYOUT.fallback["column_threshold"]  # Pixels for grouping bubbles into columns
+SS03_NUM_QUESTION_COLUMNS = SS03_LAYOUT.fallback["num_question_columns"]
+SS03_QUESTIONS_PER_COLUMN = SS03_LAYOUT.fallback["questions_per_column"]
+SS03_SETTINGS = SS03_LAYOUT.spec
+
+# Grading executor configuration (keeps CPU-bound work off the event loop)
+GRADING_THREAD_WORKERS = int(os.getenv("GRADING_THREAD_WORKERS", "4"))
+GRADING_PROCESS_WORKERS = int(os.getenv("GRADING_PROCESS_WORKERS", "1"))
+GRADING_MAX_PENDING_THREADS = int(os.getenv("GRADING_MAX_PENDING_THREADS", "16"))
+GRADING_MAX_PENDING_PROCESSES = int(os.getenv("GRADING_MAX_PENDING_PROCESSES", "4"))
+GRADING_RETRY_AFTER = int(os.getenv("GRADING_RETRY_AFTER", "5"))
+
+# Background grading job configuration
+JOBS_DIR = os.getenv("JOBS_DIR", "jobs")
+JOBS_DB_PATH = os.getenv("JOBS_DB_PATH", os.path.join(JOBS_DIR, "jobs.db"))
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "1"))
+MAX_JOB_IMAGES = 50
+# Jobs waiting to run before new submissions get 503 (each may hold MAX_JOB_IMAGES uploads)
+MAX_QUEUED_JOBS = int(os.getenv("MAX_QUEUED_JOBS", "20"))
+# Hours finished jobs and their results are kept before being pruned
+JOB_RETENTION_HOURS = float(os.getenv("JOB_RETENTION_HOURS", "24"))
+
+# Content-hash result cache for repeated uploads
+RESULT_CACHE_DIR = os.getenv("RESULT_CACHE_DIR", "cache")
+RESULT_CACHE_MEMORY_MB = int(os.getenv("RESULT_CACHE_MEMORY_MB", "64"))
+RESULT_CACHE_DISK_MB = int(os.getenv("RESULT_CACHE_DISK_MB", "512"))
+
+# Threads grading the cards of one grid scan concurrently (0 = one card at a time)
+GRID_CARD_WORKERS = int(os.getenv("GRID_CARD_WORKERS", "4"))
+
+# Dedicated OCR worker processes, each with its own warm model (0 = OCR in-process)
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", "0"))
+
+# Worker processes reading PDF pages during full answer-key scans (0 = sequential)
+PDF_PARALLEL_WORKERS = int(os.getenv("PDF_PARALLEL_WORKERS", "0"))
+
+# Registry of extracted answer keys, reusable across batches via answer_key_id
+ANSWER_KEYS_DB_PATH = os.getenv(
+    "ANSWER_KEYS_DB_PATH", os.path.join("answer_keys", "answer_keys.db")
+)
 
 # Configure CORS with specific origins
 app.add_middleware(
@@ -53,6 +119,7 @@ UPLOAD_DIR = "uploads"
 PROCESSED_DIR = "processed"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 os.makedirs(PROCESSED_DIR, exist_ok=True)
+os.makedirs(JOBS_DIR, exist_ok=True)
 
 # Mount static files to serve processed images
 app.mount("/processed", StaticFiles(directory=PROCESSED_DIR), name="processed")
@@ -61,26 +128,80 @@ app.mount("/processed", StaticFiles(directory=PROCESSED_DIR), name="processed")
 doc_processor = DocumentProcessor()
 bubble_detector = BubbleDetector()
 batch_grader = BatchGrader()
+answer_extractor_config = AnswerExtractorConfig(parallel_workers=PDF_PARALLEL_WORKERS)
+grid_detector_config = GridDetectorConfig(card_workers=GRID_CARD_WORKERS)
+# Shared so the name box learned for a layout is reused across requests
+name_locator = NameFieldLocator()
 _ocr_engine: Optional[OCREngine] = None
 _pdf_extractor: Optional[PDFAnswerExtractor] = None
 _grid_detector: Optional[OMRGridDetector] = None
+_yedam_grader: Optional[YeDamGrader] = None
+# Batch scans are decoded one page at a time
+scan_reader = ScanReader(ScanReaderConfig(pdf_dpi=BATCH_SCAN_DPI, max_pages=MAX_BATCH_PAGES))
+
+# All blocking grading work is dispatched through this executor
+grading_executor = GradingExecutor(ExecutorConfig(
+    thread_workers=GRADING_THREAD_WORKERS,
+    process_workers=GRADING_PROCESS_WORKERS,
+    max_pending_threads=GRADING_MAX_PENDING_THREADS,
+    max_pending_processes=GRADING_MAX_PENDING_PROCESSES,
+    retry_after=GRADING_RETRY_AFTER
+))
+
+# Identical uploads processed with identical settings reuse stored results
+result_cache = ResultCache(
+    cache_dir=RESULT_CACHE_DIR,
+    max_memory_bytes=RESULT_CACHE_MEMORY_MB * 1024 * 1024,
+    max_disk_bytes=RESULT_CACHE_DISK_MB * 1024 * 1024
+)
+
+answer_key_registry = AnswerKeyRegistry(ANSWER_KEYS_DB_PATH)
+# Keys are only reused for PDFs extracted with the current extractor settings
+answer_extractor_fingerprint = config_fingerprint(
+    replace(answer_extractor_config, parallel_workers=0)  # Worker count does not change results
+)
+
+
+@app.on_event("shutdown")
+def shutdown_executor() -> None:
+    """Stop grading worker threads and processes."""
+    grading_executor.shutdown(wait=False)
+    if _pdf_extractor is not None:
+        _pdf_extractor.close()
+    if _grid_detector is not None:
+        _grid_detector.close()
+    if isinstance(_ocr_engine, OCRWorkerPool):
+        _ocr_engine.close()
 
 
 def get_ocr_engine() -> OCREngine:
-    """Lazy initialization of OCR engine to improve startup time."""
+    """Lazy initialization of OCR engine (or the OCR worker pool) to improve startup time."""
     global _ocr_engine
     if _ocr_engine is None:
-        logger.info("Initializing OCR engine (first use)...")
-        _ocr_engine = OCREngine()
+        if OCR_WORKERS > 0:
+            _ocr_engine = OCRWorkerPool(OCRPoolConfig(workers=OCR_WORKERS))
+        else:
+            logger.info("Initializing OCR engine (first use)...")
+            _ocr_engine = OCREngine()
     return _ocr_engine
 
 
+@app.on_event("startup")
+def start_ocr_workers() -> None:
+    """Load the OCR models in the worker processes before serving requests."""
+    if OCR_WORKERS > 0:
+        get_ocr_engine().start()
+
+
 def get_pdf_extractor() -> PDFAnswerExtractor:
     """Lazy initialization of PDF answer extractor."""
     global _pdf_extractor
     if _pdf_extractor is None:
         logger.info("Initializing PDF answer extractor...")
-        _pdf_extractor = PDFAnswerExtractor(ocr_engine=get_ocr_engine())
+        _pdf_extractor = PDFAnswerExtractor(
+            config=answer_extractor_config,
+            ocr_engine=get_ocr_engine()
+        )
     return _pdf_extractor
 
 
@@ -90,12 +211,23 @@ def get_grid_detector() -> OMRGridDetector:
     if _grid_detector is None:
         logger.info("Initializing OMR grid detector...")
         _grid_detector = OMRGridDetector(
+            config=grid_detector_config,
             bubble_detector=bubble_detector,
-            ocr_engine=get_ocr_engine()
+            ocr_engine=get_ocr_engine(),
+            name_locator=name_locator
         )
     return _grid_detector
 
 
+def get_yedam_grader() -> YeDamGrader:
+    """Lazy initialization of the Ye-dam page grader."""
+    global _yedam_grader
+    if _yedam_grader is None:
+        logger.info("Initializing Ye-dam grader...")
+        _yedam_grader = YeDamGrader()
+    return _yedam_grader
+
+
 def validate_file(file: UploadFile) -> None:
     """Validate uploaded image file type and size."""
     # Check file extension
@@ -131,6 +263,492 @@ def validate_pdf_file(file: UploadFile) -> None:
             detail="Invalid file type. Please upload a PDF file."
         )
 
+
+def validate_batch_file(file: UploadFile) -> None:
+    """Validate an uploaded batch scan (image, multi-page TIFF, PDF or ZIP)."""
+    if file.filename:
+        ext = os.path.splitext(file.filename)[1].lower()
+        if ext not in ALLOWED_BATCH_EXTENSIONS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid file type. Allowed: {', '.join(sorted(ALLOWED_BATCH_EXTENSIONS))}"
+            )
+
+    if file.content_type and file.content_type not in ALLOWED_BATCH_MIME_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid file type. Please upload an image, TIFF, PDF or ZIP file."
+        )
+
+
+def _service_busy(error: ExecutorSaturatedError) -> HTTPException:
+    """Build the 503 response returned when a worker pool is saturated."""
+    return HTTPException(
+        status_code=503,
+        detail="Server is busy grading other uploads. Please retry shortly.",
+        headers={"Retry-After": str(error.retry_after)}
+    )
+
+
+async def run_cpu_bound(func, *args, **kwargs):
+    """Run OpenCV-bound work on the thread pool, off the event loop."""
+    try:
+        return await grading_executor.run_in_thread(func, *args, **kwargs)
+    except ExecutorSaturatedError as e:
+        logger.warning(f"Rejecting request: {e}")
+        raise _service_busy(e)
+
+
+def _omr_cards_cache_key(omr_content: bytes) -> str:
+    """Cache key for the graded cards detected in an OMR image."""
+    return ResultCache.make_key(
+        omr_content, "omr_cards",
+        bubble_detector.config, grid_detector_config, doc_processor.config,
+        name_locator.config, SS03_SETTINGS
+    )
+
+
+def _grade_cache_key(content: bytes) -> str:
+    """Cache key for a single-card /api/grade result."""
+    return ResultCache.make_key(
+        content, "grade", bubble_detector.config, doc_processor.config,
+        name_locator.config, SS03_SETTINGS
+    )
+
+
+async def extract_answer_key(pdf_path: str) -> dict:
+    """Extract the answer key from a PDF on the OCR process pool."""
+    try:
+        if grading_executor.has_process_pool:
+            return await grading_executor.run_in_process(
+                extract_answers_from_pdf, pdf_path, None, answer_extractor_config
+            )
+        return await grading_executor.run_in_thread(
+            get_pdf_extractor().extract_from_pdf_path, pdf_path
+        )
+    except ExecutorSaturatedError as e:
+        logger.warning(f"Rejecting request: {e}")
+        raise _service_busy(e)
+
+
+async def register_answer_key(pdf_path: str, pdf_content: bytes) -> AnswerKey:
+    """Return the registered key for a PDF, extracting and registering it on first use."""
+    digest = await run_cpu_bound(pdf_hash, pdf_content)
+    existing = answer_key_registry.find_by_hash(digest, answer_extractor_fingerprint)
+    if existing is not None:
+        logger.info(f"Reusing registered answer key {existing.key_id}")
+        return existing
+
+    answer_result = await extract_answer_key(pdf_path)
+    if not answer_result["answers"]:
+        raise HTTPException(
+            status_code=400,
+            detail="Could not extract answer key from PDF. Please check the PDF format."
+        )
+    return answer_key_registry.register(answer_result, digest, answer_extractor_fingerprint)
+
+
+def get_answer_key(answer_key_id: str) -> AnswerKey:
+    """Look up a registered answer key or raise 404."""
+    key = answer_key_registry.get(answer_key_id)
+    if key is None:
+        raise HTTPException(status_code=404, detail="Answer key not found.")
+    return key
+
+
+def _require_answer_key_source(answer_pdf: Optional[UploadFile], answer_key_id: Optional[str]) -> None:
+    """Validate that a request provides either an answer key ID or an answer PDF."""
+    if answer_key_id:
+        get_answer_key(answer_key_id)
+    elif answer_pdf is None:
+        raise HTTPException(status_code=400, detail="Provide either answer_pdf or answer_key_id.")
+    else:
+        validate_pdf_file(answer_pdf)
+
+
+async def resolve_answer_key(
+    answer_pdf: Optional[UploadFile],
+    answer_key_id: Optional[str],
+    pdf_path: str
+) -> AnswerKey:
+    """Use the referenced answer key, or save the PDF and register its key."""
+    if answer_key_id:
+        return get_answer_key(answer_key_id)
+    pdf_content = await _save_upload(
+        answer_pdf, pdf_path, MAX_PDF_SIZE, "PDF file too large. Maximum size is 50MB."
+    )
+    return await register_answer_key(pdf_path, pdf_content)
+
+
+def _question_rows(question_columns: List[list]) -> dict:
+    """Map SS-03 question numbers to their row of bubbles."""
+    question_rows = {}
+    for col_idx, col_bubbles in enumerate(question_columns[:SS03_NUM_QUESTION_COLUMNS]):
+        grid_rows = bubble_detector.sort_into_grid(col_bubbles)
+        for row_idx, row in enumerate(grid_rows):
+            q_num = col_idx * SS03_QUESTIONS_PER_COLUMN + row_idx + 1
+            question_rows[q_num] = row
+    return question_rows
+
+
+def _score_questions(prepared: PreparedImage) -> Tuple[Dict[int, list], Dict[int, np.ndarray]]:
+    """
+    Score the SS-03 question bubbles of a warped card.
+
+    Cards with the layout's proportions whose bubbles verify against the
+    template are sampled at its bubble positions in one pass; others fall back
+    to contour detection and clustering.
+
+    Returns:
+        Tuple of (question -> (x, y, w, h) box per choice, question -> choice scores).
+    """
+    if SS03_LAYOUT.matches(prepared.image.shape) and SS03_LAYOUT.verify(prepared, bubble_detector):
+        sample = SS03_LAYOUT.sample(prepared, bubble_detector)
+        question_boxes, _ = SS03_LAYOUT.boxes(prepared.image.shape)
+        return (
+            {int(q): [tuple(box) for box in boxes.tolist()]
+             for q, boxes in zip(sample.question_numbers, question_boxes)},
+            {int(q): scores for q, scores in zip(sample.question_numbers, sample.question_scores)}
+        )
+
+    bubbles = bubble_detector.detect_bubbles(prepared)
+    # Sort by X to find columns; columns right of the offset are questions (skip Class/ID info)
+    columns = bubble_detector.detect_columns(bubbles, col_threshold=SS03_COLUMN_THRESHOLD)
+    question_columns = [
+        col for col in columns if col and col[0][0] > SS03_QUESTION_COLUMN_X_OFFSET
+    ]
+    question_rows = _question_rows(question_columns)
+    row_scores = bubble_detector.score_rows(prepared, list(question_rows.values()))
+    return (
+        {q: [tuple(b[:4]) for b in row] for q, row in question_rows.items()},
+        dict(zip(question_rows, row_scores))
+    )
+
+
+def _grade_single_image(input_path: str, file_id: str) -> dict:
+    """Align, detect and grade a single OMR scan (blocking)."""
+    # 1. Processing (Alignment)
+    warped = doc_processor.process_document(input_path)
+    if warped is None:
+        raise HTTPException(status_code=400, detail="Could not detect document corners.")
+
+    warped_path = os.path.join(PROCESSED_DIR, f"warped_{file_id}.jpg")
+
+    # 2. Bubble Scoring & Grading (the card is preprocessed once for all stages)
+    with bubble_detector.prepare(warped) as prepared:
+        question_boxes, question_scores = _score_questions(prepared)
+    threshold = bubble_detector.config.marking_threshold
+
+    grading_results = {}
+    vis_image = warped.copy()
+    for q_num, scores in question_scores.items():
+        marked_indices = np.flatnonzero(scores > threshold)
+        grading_results[q_num] = {
+            "selected": marked_indices.tolist(),
+            "confidence": scores.tolist()
+        }
+        # Visualize graded bubbles on warped image
+        for (x, y, w, h), score in zip(question_boxes[q_num], scores):
+            color = (0, 255, 0) if score > threshold else (0, 0, 255)
+            cv2.rectangle(vis_image, (x, y), (x + w, y + h), color, 2)
+
+    cv2.imwrite(warped_path, vis_image)
+
+    # 3. Handwriting OCR (optional for name) - lazy loaded, name box only when known
+    student_name, text_results = name_locator.extract_name(
+        warped, get_ocr_engine(), layout_key="ss03"
+    )
+
+    return {
+        "grades": grading_results,
+        "text_found": text_results,
+        "student_name": student_name,
+    }
+
+
+def _process_omr_cards(omr_path: str) -> List[OMRCardResult]:
+    """Detect and grade every OMR card in an uploaded image (blocking)."""
+    return list(_iter_omr_cards(omr_path))
+
+
+def _iter_omr_cards(omr_path: str) -> Iterator[OMRCardResult]:
+    """Yield each OMR card in an uploaded image as soon as it is graded (blocking)."""
+    omr_image_data = cv2.imread(omr_path)
+    if omr_image_data is None:
+        raise HTTPException(status_code=400, detail="Could not read OMR image.")
+    yield from _iter_image_cards(omr_image_data)
+
+
+def _iter_image_cards(omr_image_data: np.ndarray) -> Iterator[OMRCardResult]:
+    """Yield each OMR card in a decoded scan page as soon as it is graded (blocking)."""
+    # Detect and grade individual OMR cards
+    grid_detector = get_grid_detector()
+    found_cards = False
+    for card in grid_detector.iter_grid_image(
+        omr_image_data,
+        col_threshold=SS03_COLUMN_THRESHOLD,
+        question_x_offset=SS03_QUESTION_COLUMN_X_OFFSET,
+        num_question_columns=SS03_NUM_QUESTION_COLUMNS,
+        questions_per_column=SS03_QUESTIONS_PER_COLUMN,
+        layout=SS03_LAYOUT
+    ):
+        found_cards = True
+        yield card
+
+    if not found_cards:
+        # If no cards detected in grid, treat the entire image as a single OMR card
+        logger.info("No grid detected, processing as single OMR card")
+        yield _process_single_omr_card(omr_image_data)
+
+
+def _process_single_omr_card(omr_image_data: np.ndarray) -> OMRCardResult:
+    """Grade a whole image as one OMR card (blocking)."""
+    # Process as single card using existing single-grade logic
+    warped = doc_processor.process_document_image(omr_image_data)
+    if warped is None:
+        warped = omr_image_data
+
+    with bubble_detector.prepare(warped) as prepared:
+        _, question_scores = _score_questions(prepared)
+
+    answers = {}
+    confidence_scores = {}
+    for q_num, scores in question_scores.items():
+        marked_indices = np.flatnonzero(scores > bubble_detector.config.marking_threshold)
+        answers[q_num] = (marked_indices + 1).tolist()
+        confidence_scores[q_num] = scores.tolist()
+
+    # Extract student name
+    student_name, _ = name_locator.extract_name(warped, get_ocr_engine(), layout_key="ss03")
+
+    return OMRCardResult(
+        card_index=0,
+        image=warped,
+        bbox=(0, 0, warped.shape[1], warped.shape[0]),
+        student_name=student_name,
+        answers=answers,
+        confidence_scores=confidence_scores
+    )
+
+
+def _save_card_image(card: OMRCardResult, batch_id: str, idx: int) -> str:
+    """Save one processed card image for visualization and return its URL."""
+    card_path = os.path.join(PROCESSED_DIR, f"card_{batch_id}_{idx}.jpg")
+    cv2.imwrite(card_path, card.image)
+    return f"/processed/card_{batch_id}_{idx}.jpg"
+
+
+async def _save_upload(upload: UploadFile, path: str, max_size: int, too_large_detail: str) -> bytes:
+    """Write an uploaded file to disk, enforcing a size limit, and return its bytes."""
+    content = await upload.read()
+    if len(content) > max_size:
+        raise HTTPException(status_code=400, detail=too_large_detail)
+    async with aiofiles.open(path, "wb") as f:
+        await f.write(content)
+    return content
+
+
+async def _save_upload_stream(upload: UploadFile, path: str, max_size: int, too_large_detail: str) -> int:
+    """Copy an uploaded file to disk in chunks, enforcing a size limit, and return its size."""
+    size = 0
+    async with aiofiles.open(path, "wb") as f:
+        while True:
+            chunk = await upload.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_size:
+                raise HTTPException(status_code=400, detail=too_large_detail)
+            await f.write(chunk)
+    return size
+
+
+def _processed_file_exists(url: Optional[str]) -> bool:
+    """Check that a /processed/ URL from a cached result still has its file."""
+    if not url:
+        return False
+    return os.path.exists(os.path.join(PROCESSED_DIR, os.path.basename(url)))
+
+
+def _card_summary(card: OMRCardResult, image_url: str) -> dict:
+    """Image-free, cacheable summary of a graded OMR card."""
+    return {
+        "name": card.student_name,
+        "answers": card.answers,
+        "confidence_scores": card.confidence_scores,
+        "image_url": image_url,
+    }
+
+
+def _grade_card_summaries(
+    omr_path: str,
+    omr_content: bytes,
+    batch_id: str,
+    start_index: int = 0
+) -> List[dict]:
+    """
+    Detect and grade all cards in an OMR image, reusing cached results (blocking).
+
+    Cached summaries are only reused while their card images still exist
+    in the processed directory.
+    """
+    cache_key = _omr_cards_cache_key(omr_content)
+    cached = result_cache.get(cache_key)
+    if cached is not None and all(_processed_file_exists(c["image_url"]) for c in cached):
+        logger.info(f"OMR card cache hit for {batch_id}")
+        return cached
+
+    card_results = _process_omr_cards(omr_path)
+    summaries = [
+        _card_summary(card, _save_card_image(card, batch_id, start_index + idx))
+        for idx, card in enumerate(card_results)
+    ]
+    result_cache.set(cache_key, summaries)
+    return summaries
+
+
+def _page_cards_cache_key(page: ScanPage, card_layout: str) -> str:
+    """Cache key for the graded cards on one decoded batch scan page."""
+    if card_layout == "yedam":
+        grader = get_yedam_grader()
+        settings = (
+            grader.bubble_detector.config, grader.doc_processor.config,
+            grader.gutter_finder.config, grader.layout.spec, grader.num_cards
+        )
+    else:
+        settings = (
+            bubble_detector.config, grid_detector_config, doc_processor.config,
+            name_locator.config, SS03_SETTINGS
+        )
+    image = page.image
+    return ResultCache.make_key(image.data, f"page_cards:{card_layout}:{image.shape}", *settings)
+
+
+def _yedam_card_summaries(page: ScanPage, batch_id: str) -> List[dict]:
+    """Grade a page of stacked Ye-dam cards into card summaries (blocking)."""
+    grader = get_yedam_grader()
+    # Ye-dam cards are cropped inside the grader, so the page image is shown for each
+    page_name = f"page_{batch_id}_{page.index}.jpg"
+    cv2.imwrite(os.path.join(PROCESSED_DIR, page_name), page.image)
+
+    summaries = []
+    for card in grader.process_page(page.image):
+        darkness = card.get("darkness")
+        confidence_scores = {}
+        if darkness is not None:
+            # Bubbles off the card score NaN, which JSON responses cannot carry
+            confidence_scores = {
+                int(q): row.tolist()
+                for q, row in zip(grader.layout.question_numbers, np.nan_to_num(darkness))
+            }
+        summaries.append({
+            "name": card["registration"] or "Unknown",
+            "answers": card["answers"],
+            "confidence_scores": confidence_scores,
+            "image_url": f"/processed/{page_name}",
+        })
+    return summaries
+
+
+def _grade_page_cards(page: ScanPage, batch_id: str, card_layout: str, start_index: int) -> List[dict]:
+    """
+    Grade the cards on one batch scan page, reusing cached results (blocking).
+
+    Cached summaries are only reused while their card images still exist
+    in the processed directory.
+    """
+    cache_key = _page_cards_cache_key(page, card_layout)
+    cached = result_cache.get(cache_key)
+    if cached is not None and all(_processed_file_exists(c["image_url"]) for c in cached):
+        logger.info(f"Page card cache hit for {page.source}")
+        return cached
+
+    if card_layout == "yedam":
+        summaries = _yedam_card_summaries(page, batch_id)
+    else:
+        summaries = [
+            _card_summary(card, _save_card_image(card, batch_id, start_index + idx))
+            for idx, card in enumerate(_iter_image_cards(page.image))
+        ]
+    result_cache.set(cache_key, summaries)
+    return summaries
+
+
+def _grade_scan_pages(
+    scan_path: str,
+    scan_name: str,
+    batch_id: str,
+    card_layout: str
+) -> Tuple[List[dict], int]:
+    """
+    Decode a batch scan page by page and grade the cards on each (blocking).
+
+    Only one page is decoded at a time, so multi-page TIFFs, scanned PDFs
+    and ZIP archives of any size are graded in bounded memory.
+
+    Returns:
+        Tuple of (card summaries in page order, number of pages read).
+    """
+    cards: List[dict] = []
+    num_pages = 0
+    pages = scan_reader.iter_pages(scan_path, name=scan_name)
+    while True:
+        try:
+            page = next(pages, None)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Could not read scan: {e}")
+        if page is None:
+            break
+        page_cards = _grade_page_cards(page, batch_id, card_layout, len(cards))
+        logger.info(f"{page.source}: {len(page_cards)} card(s)")
+        cards.extend(page_cards)
+        num_pages += 1
+    return cards, num_pages
+
+
+def _student_response(student, image_url: Optional[str]) -> dict:
+    """Serialize one graded student for API responses."""
+    return {
+        "index": student.student_index,
+        "name": student.student_name,
+        "score": student.score_display,
+        "percentage": round(student.score, 1),
+        "correct_count": student.correct_count,
+        "total_questions": student.total_questions,
+        "details": student.details,
+        "image_url": image_url
+    }
+
+
+def _build_batch_response(
+    batch_id: str,
+    answer_result: dict,
+    grading_result,
+    processed_images: List[str]
+) -> dict:
+    """Build the batch grading response shared by the sync and job APIs."""
+    answer_key = answer_result["answers"]
+    return {
+        "batch_id": batch_id,
+        "answer_key": answer_key,
+        "total_questions": len(answer_key),
+        "students": [
+            _student_response(
+                student,
+                processed_images[student.student_index] if student.student_index < len(processed_images) else None
+            )
+            for student in grading_result.students
+        ],
+        "statistics": grading_result.statistics,
+        "answer_key_id": answer_result.get("answer_key_id"),
+        "pdf_extraction": {
+            "confidence": answer_result.get("confidence", 0),
+            "raw_text_preview": answer_result.get("raw_text", "")[:500]
+        },
+        "message": f"Batch grading complete. Graded {len(grading_result.students)} students."
+    }
+
+
 @app.post("/api/grade")
 async def grade_omr(file: UploadFile = File(...)):
     """
@@ -151,6 +769,14 @@ async def grade_omr(file: UploadFile = File(...)):
         content = await file.read()
         if len(content) > MAX_FILE_SIZE:
             raise HTTPException(status_code=400, detail="File too large. Maximum size is 10MB.")
+
+        # Identical re-uploads return the stored result
+        cache_key = await run_cpu_bound(_grade_cache_key, content)
+        cached = result_cache.get(cache_key)
+        if cached is not None and _processed_file_exists(cached["warped_url"]):
+            logger.info(f"Grade cache hit for upload {file_id}")
+            return cached
+
         async with aiofiles.open(input_path, "wb") as buffer:
             await buffer.write(content)
     except HTTPException:
@@ -160,81 +786,18 @@ async def grade_omr(file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail="Failed to save uploaded file.")
 
     try:
-        # 1. Processing (Alignment)
-        warped = doc_processor.process_document(input_path)
-        if warped is None:
-            raise HTTPException(status_code=400, detail="Could not detect document corners.")
-            
-        warped_path = os.path.join(PROCESSED_DIR, f"warped_{file_id}.jpg")
-        
-        # 2. Bubble Detection & Grading
-        bubbles = bubble_detector.detect_bubbles(warped)
-        marking_results = bubble_detector.check_marking(warped, bubbles)
-        
-        # Visualize detections on warped image
-        vis_image = warped.copy()
-        for i, res in enumerate(marking_results):
-            x, y, w, h = res["bbox"]
-            color = (0, 255, 0) if res["is_marked"] else (0, 0, 255)
-            cv2.rectangle(vis_image, (x, y), (x + w, y + h), color, 2)
-            
-        cv2.imwrite(warped_path, vis_image)
-        
-        # Multi-column mapping logic for SS-03
-        # 1. Sort by X to find columns
-        columns = bubble_detector.detect_columns(bubbles, col_threshold=SS03_COLUMN_THRESHOLD)
-
-        grading_results = {}
-        # Filter out the first few columns if they are part of Class/ID info
-        # For SS-03, columns starting from X > threshold are questions
-        question_columns = [
-            col for col in columns if col[0][0] > SS03_QUESTION_COLUMN_X_OFFSET
-        ]
-
-        # Process each question column
-        for col_idx, col_bubbles in enumerate(question_columns[:SS03_NUM_QUESTION_COLUMNS]):
-            grid_rows = bubble_detector.sort_into_grid(col_bubbles)
-            for row_idx, row in enumerate(grid_rows):
-                q_num = col_idx * SS03_QUESTIONS_PER_COLUMN + row_idx + 1
-                marking_status = bubble_detector.check_marking(warped, row)
-                marked_indices = [
-                    idx for idx, r in enumerate(marking_status) if r["is_marked"]
-                ]
-                grading_results[q_num] = {
-                    "selected": marked_indices,
-                    "confidence": [r["score"] for r in marking_status]
-                }
-        
-        # 3. Handwriting OCR (optional for name) - lazy loaded
-        ocr_engine = get_ocr_engine()
-        text_results = ocr_engine.extract_text(warped)
-        
-        # Improved name extraction logic
-        student_name = "Unknown"
-        all_texts = [res["text"] for res in text_results]
-        
-        for i, text in enumerate(all_texts):
-            if "이름" in text or "성명" in text:
-                # Often the name is in the same block or the next one
-                # If "이름: 김철수" format
-                if ":" in text and len(text.split(":")[1].strip()) > 0:
-                    student_name = text.split(":")[1].strip()
-                elif i + 1 < len(all_texts):
-                    student_name = all_texts[i+1]
-                break
-        
-        # Clear grayscale cache to free memory
-        bubble_detector.clear_cache()
+        result = await run_cpu_bound(_grade_single_image, input_path, file_id)
 
         # 4. Final aggregation
         response = {
             "id": file_id,
             "warped_url": f"/processed/warped_{file_id}.jpg",
-            "grades": grading_results,
-            "text_found": text_results,
-            "student_name": student_name,
+            "grades": result["grades"],
+            "text_found": result["text_found"],
+            "student_name": result["student_name"],
             "message": "Grading complete."
         }
+        result_cache.set(cache_key, response)
 
         return response
 
@@ -251,178 +814,131 @@ async def grade_omr(file: UploadFile = File(...)):
             except OSError as e:
                 logger.warning(f"Failed to clean up file {input_path}: {e}")
 
+@app.post("/api/answer-keys")
+async def create_answer_key(
+    answer_pdf: UploadFile = File(..., description="PDF file containing answer key")
+):
+    """
+    Extract and register an answer key from a PDF.
+
+    The returned answer_key_id can be passed to the batch grading endpoints
+    instead of re-uploading the PDF. Uploading the same PDF again returns the
+    already registered key.
+    """
+    validate_pdf_file(answer_pdf)
+
+    upload_id = str(uuid.uuid4())
+    pdf_path = os.path.join(UPLOAD_DIR, f"{upload_id}_answers.pdf")
+    try:
+        key = await resolve_answer_key(answer_pdf, None, pdf_path)
+        return key.to_dict()
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception(f"Answer key extraction error for {upload_id}: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="An error occurred during answer key extraction. Please try again."
+        )
+    finally:
+        if os.path.exists(pdf_path):
+            try:
+                os.remove(pdf_path)
+            except OSError as e:
+                logger.warning(f"Failed to clean up file {pdf_path}: {e}")
+
+
+@app.get("/api/answer-keys/{answer_key_id}")
+async def get_registered_answer_key(answer_key_id: str):
+    """
+    Get a registered answer key.
+    """
+    return get_answer_key(answer_key_id).to_dict()
+
+
 @app.post("/api/batch-grade")
 async def batch_grade_omr(
-    answer_pdf: UploadFile = File(..., description="PDF file containing answer key"),
-    omr_image: UploadFile = File(..., description="Image with multiple OMR cards in grid layout")
+    answer_pdf: Optional[UploadFile] = File(None, description="PDF file containing answer key"),
+    omr_image: UploadFile = File(
+        ..., description="OMR scan: an image, multi-page TIFF, scanned PDF or ZIP of scans"
+    ),
+    answer_key_id: Optional[str] = Form(None, description="ID of a registered answer key"),
+    card_layout: str = Form(
+        "ss03", description="Card layout: 'ss03' (grid of SS-03 cards) or 'yedam' (stacked Ye-dam cards)"
+    )
 ):
     """
     Batch grade multiple OMR cards against an answer key from PDF.
 
-    - Upload a PDF containing the exam with answer key
-    - Upload an image containing multiple OMR cards in grid layout
+    - Upload a PDF containing the exam with answer key, or pass the
+      answer_key_id of a registered key
+    - Upload the OMR scan: an image containing multiple OMR cards in grid
+      layout, or a multi-page TIFF, scanned PDF or ZIP archive of such
+      scans (e.g. a whole document-feeder run)
+    - Pages are decoded and graded one at a time and all cards are graded
+      together into one result
     - Returns grading results for all detected students
     """
     # Validate files
-    validate_pdf_file(answer_pdf)
-    validate_file(omr_image)
+    _require_answer_key_source(answer_pdf, answer_key_id)
+    validate_batch_file(omr_image)
+    if card_layout not in CARD_LAYOUTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid card layout. Allowed: {', '.join(CARD_LAYOUTS)}"
+        )
 
     batch_id = str(uuid.uuid4())
     pdf_path = os.path.join(UPLOAD_DIR, f"{batch_id}_answers.pdf")
-    omr_path = os.path.join(UPLOAD_DIR, f"{batch_id}_omr.jpg")
+    # The scan format is detected from the file contents, not its name
+    scan_path = os.path.join(UPLOAD_DIR, f"{batch_id}_scan")
+    scan_name = os.path.basename(omr_image.filename or "scan")
 
     try:
-        # Save PDF file
-        pdf_content = await answer_pdf.read()
-        if len(pdf_content) > MAX_PDF_SIZE:
-            raise HTTPException(status_code=400, detail="PDF file too large. Maximum size is 50MB.")
-        async with aiofiles.open(pdf_path, "wb") as f:
-            await f.write(pdf_content)
-
-        # Save OMR image
-        omr_content = await omr_image.read()
-        if len(omr_content) > MAX_FILE_SIZE:
-            raise HTTPException(status_code=400, detail="Image file too large. Maximum size is 10MB.")
-        async with aiofiles.open(omr_path, "wb") as f:
-            await f.write(omr_content)
+        # Save OMR scan
+        await _save_upload_stream(
+            omr_image, scan_path, MAX_BATCH_FILE_SIZE,
+            f"Scan file too large. Maximum size is {MAX_BATCH_FILE_SIZE // (1024 * 1024)}MB."
+        )
 
     except HTTPException:
+        if os.path.exists(scan_path):
+            os.remove(scan_path)
         raise
     except Exception as e:
         logger.error(f"File upload error: {e}")
+        if os.path.exists(scan_path):
+            os.remove(scan_path)
         raise HTTPException(status_code=500, detail="Failed to save uploaded files.")
 
     try:
-        # 1. Extract answer key from PDF
-        logger.info(f"Extracting answers from PDF: {batch_id}")
-        pdf_extractor = get_pdf_extractor()
-        answer_result = pdf_extractor.extract_from_pdf_path(pdf_path)
-
-        if not answer_result["answers"]:
-            raise HTTPException(
-                status_code=400,
-                detail="Could not extract answer key from PDF. Please check the PDF format."
-            )
+        # 1. Extract answer key from PDF (or use the registered key)
+        logger.info(f"Resolving answer key: {batch_id}")
+        answer_result = (
+            await resolve_answer_key(answer_pdf, answer_key_id, pdf_path)
+        ).to_answer_result()
 
         answer_key = answer_result["answers"]
         total_questions = len(answer_key)
-        logger.info(f"Extracted {total_questions} answers from PDF")
-
-        # 2. Load and process OMR grid image
-        logger.info(f"Processing OMR grid image: {batch_id}")
-        omr_image_data = cv2.imread(omr_path)
-        if omr_image_data is None:
-            raise HTTPException(status_code=400, detail="Could not read OMR image.")
-
-        # 3. Detect and grade individual OMR cards
-        grid_detector = get_grid_detector()
-        card_results = grid_detector.process_grid_image(
-            omr_image_data,
-            col_threshold=SS03_COLUMN_THRESHOLD,
-            question_x_offset=SS03_QUESTION_COLUMN_X_OFFSET,
-            num_question_columns=SS03_NUM_QUESTION_COLUMNS,
-            questions_per_column=SS03_QUESTIONS_PER_COLUMN
+        logger.info(f"Using answer key {answer_result['answer_key_id']} with {total_questions} answers")
+
+        # 2-3. Decode the scan page by page, detect and grade the cards on each
+        logger.info(f"Processing OMR scan {scan_name}: {batch_id}")
+        cards, num_pages = await run_cpu_bound(
+            _grade_scan_pages, scan_path, scan_name, batch_id, card_layout
         )
 
-        # If no cards detected in grid, treat the entire image as a single OMR card
-        if not card_results:
-            logger.info("No grid detected, processing as single OMR card")
-            from engine.omr_grid_detector import OMRCardResult
-
-            # Process as single card using existing single-grade logic
-            warped = doc_processor.process_document(omr_path)
-            if warped is None:
-                warped = omr_image_data
-
-            bubbles = bubble_detector.detect_bubbles(warped)
-            columns = bubble_detector.detect_columns(bubbles, col_threshold=SS03_COLUMN_THRESHOLD)
-            question_columns = [
-                col for col in columns if col and col[0][0] > SS03_QUESTION_COLUMN_X_OFFSET
-            ]
-
-            answers = {}
-            confidence_scores = {}
-            for col_idx, col_bubbles in enumerate(question_columns[:SS03_NUM_QUESTION_COLUMNS]):
-                grid_rows = bubble_detector.sort_into_grid(col_bubbles)
-                for row_idx, row in enumerate(grid_rows):
-                    q_num = col_idx * SS03_QUESTIONS_PER_COLUMN + row_idx + 1
-                    marking_status = bubble_detector.check_marking(warped, row)
-                    marked_indices = [
-                        idx + 1 for idx, r in enumerate(marking_status) if r["is_marked"]
-                    ]
-                    answers[q_num] = marked_indices
-                    confidence_scores[q_num] = [r["score"] for r in marking_status]
-
-            # Extract student name
-            ocr_engine = get_ocr_engine()
-            text_results = ocr_engine.extract_text(warped)
-            student_name = "Unknown"
-            all_texts = [res["text"] for res in text_results]
-            for i, text in enumerate(all_texts):
-                if "이름" in text or "성명" in text:
-                    if ":" in text and len(text.split(":")[1].strip()) > 0:
-                        student_name = text.split(":")[1].strip()
-                    elif i + 1 < len(all_texts):
-                        student_name = all_texts[i + 1]
-                    break
+        logger.info(f"Detected {len(cards)} OMR cards on {num_pages} page(s)")
 
-            bubble_detector.clear_cache()
-
-            card_results = [OMRCardResult(
-                card_index=0,
-                image=warped,
-                bbox=(0, 0, warped.shape[1], warped.shape[0]),
-                student_name=student_name,
-                answers=answers,
-                confidence_scores=confidence_scores
-            )]
-
-        logger.info(f"Detected {len(card_results)} OMR cards")
-
-        # 4. Prepare student data for batch grading
-        student_data = []
-        for card in card_results:
-            student_data.append({
-                "name": card.student_name,
-                "answers": card.answers
-            })
-
-        # 5. Grade all students
-        grading_result = batch_grader.grade_batch(answer_key, student_data)
-
-        # 6. Save processed images for visualization
-        processed_images = []
-        for idx, card in enumerate(card_results):
-            card_path = os.path.join(PROCESSED_DIR, f"card_{batch_id}_{idx}.jpg")
-            cv2.imwrite(card_path, card.image)
-            processed_images.append(f"/processed/card_{batch_id}_{idx}.jpg")
-
-        # 7. Build response
-        students_response = []
-        for student in grading_result.students:
-            students_response.append({
-                "index": student.student_index,
-                "name": student.student_name,
-                "score": student.score_display,
-                "percentage": round(student.score, 1),
-                "correct_count": student.correct_count,
-                "total_questions": student.total_questions,
-                "details": student.details,
-                "image_url": processed_images[student.student_index] if student.student_index < len(processed_images) else None
-            })
+        # 4. Grade all students
+        grading_result = batch_grader.grade_batch(answer_key, cards)
 
-        response = {
-            "batch_id": batch_id,
-            "answer_key": answer_key,
-            "total_questions": total_questions,
-            "students": students_response,
-            "statistics": grading_result.statistics,
-            "pdf_extraction": {
-                "confidence": answer_result.get("confidence", 0),
-                "raw_text_preview": answer_result.get("raw_text", "")[:500]
-            },
-            "message": f"Batch grading complete. Graded {len(card_results)} students."
-        }
+        # 5. Build response
+        processed_images = [card["image_url"] for card in cards]
+        response = _build_batch_response(
+            batch_id, answer_result, grading_result, processed_images
+        )
+        response["pages"] = num_pages
 
         return response
 
@@ -436,6 +952,55 @@ async def batch_grade_omr(
         )
     finally:
         # Clean up uploaded files
+        for path in [pdf_path, scan_path]:
+            if os.path.exists(path):
+                try:
+                    os.remove(path)
+                except OSError as e:
+                    logger.warning(f"Failed to clean up file {path}: {e}")
+
+
+def _next_card_with_image(cards: Iterator[OMRCardResult], batch_id: str, idx: int):
+    """Advance the card iterator and save the card image (blocking)."""
+    card = next(cards, None)
+    if card is None:
+        return None, None
+    return card, _save_card_image(card, batch_id, idx)
+
+
+def _format_stream_frame(frame: dict, sse: bool) -> str:
+    """Encode a stream frame as an SSE event or an NDJSON line."""
+    data = json.dumps(frame, ensure_ascii=False)
+    if sse:
+        return f"event: {frame['type']}\ndata: {data}\n\n"
+    return data + "\n"
+
+
+@app.post("/api/batch-grade/stream")
+async def batch_grade_omr_stream(
+    request: Request,
+    answer_pdf: Optional[UploadFile] = File(None, description="PDF file containing answer key"),
+    omr_image: UploadFile = File(..., description="Image with multiple OMR cards in grid layout"),
+    answer_key_id: Optional[str] = Form(None, description="ID of a registered answer key")
+):
+    """
+    Batch grade OMR cards, streaming each student's result as soon as it is graded.
+
+    Emits NDJSON lines (or Server-Sent Events when the client accepts
+    text/event-stream), one frame per message:
+    - {"type": "answer_key", ...} once the answer key is extracted
+    - {"type": "student", ...} per graded card, same fields as /api/batch-grade students
+    - {"type": "statistics", ...} after the last card
+    - {"type": "error", "detail": ...} if grading fails mid-stream
+    """
+    _require_answer_key_source(answer_pdf, answer_key_id)
+    validate_file(omr_image)
+
+    batch_id = str(uuid.uuid4())
+    pdf_path = os.path.join(UPLOAD_DIR, f"{batch_id}_answers.pdf")
+    omr_path = os.path.join(UPLOAD_DIR, f"{batch_id}_omr.jpg")
+
+    def cleanup() -> None:
         for path in [pdf_path, omr_path]:
             if os.path.exists(path):
                 try:
@@ -443,6 +1008,241 @@ async def batch_grade_omr(
                 except OSError as e:
                     logger.warning(f"Failed to clean up file {path}: {e}")
 
+    try:
+        await _save_upload(
+            omr_image, omr_path, MAX_FILE_SIZE, "Image file too large. Maximum size is 10MB."
+        )
+
+        # The answer key is needed before any card can be graded
+        answer_result = (
+            await resolve_answer_key(answer_pdf, answer_key_id, pdf_path)
+        ).to_answer_result()
+    except HTTPException:
+        cleanup()
+        raise
+    except Exception as e:
+        cleanup()
+        logger.exception(f"Batch grading error for {batch_id}: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="An error occurred during batch grading. Please try again."
+        )
+
+    answer_key = answer_result["answers"]
+    sse = "text/event-stream" in request.headers.get("accept", "")
+
+    async def frames():
+        students = []
+        try:
+            yield _format_stream_frame({
+                "type": "answer_key",
+                "batch_id": batch_id,
+                "answer_key": answer_key,
+                "total_questions": len(answer_key),
+                "answer_key_id": answer_result["answer_key_id"],
+                "pdf_extraction": {
+                    "confidence": answer_result.get("confidence", 0),
+                    "raw_text_preview": answer_result.get("raw_text", "")[:500]
+                }
+            }, sse)
+
+            cards = _iter_omr_cards(omr_path)
+            while True:
+                card, image_url = await run_cpu_bound(
+                    _next_card_with_image, cards, batch_id, len(students)
+                )
+                if card is None:
+                    break
+                student = batch_grader.grade_student(
+                    answer_key,
+                    {"name": card.student_name, "answers": card.answers},
+                    len(students)
+                )
+                students.append(student)
+                frame = {"type": "student", **_student_response(student, image_url)}
+                yield _format_stream_frame(frame, sse)
+
+            yield _format_stream_frame({
+                "type": "statistics",
+                "statistics": batch_grader.calculate_statistics(students, len(answer_key)),
+                "message": f"Batch grading complete. Graded {len(students)} students."
+            }, sse)
+        except HTTPException as e:
+            yield _format_stream_frame({"type": "error", "detail": e.detail}, sse)
+        except Exception as e:
+            logger.exception(f"Batch grading error for {batch_id}: {e}")
+            yield _format_stream_frame({
+                "type": "error",
+                "detail": "An error occurred during batch grading. Please try again."
+            }, sse)
+        finally:
+            cleanup()
+
+    media_type = "text/event-stream" if sse else "application/x-ndjson"
+    return StreamingResponse(frames(), media_type=media_type)
+
+
+# Background grading jobs
+def _job_answer_key(params: dict) -> AnswerKey:
+    """Resolve the answer key for a job, registering it from the PDF if needed (blocking)."""
+    if params.get("answer_key_id"):
+        key = answer_key_registry.get(params["answer_key_id"])
+        if key is None:
+            raise ValueError("Answer key not found.")
+        return key
+
+    with open(params["pdf_path"], "rb") as f:
+        digest = pdf_hash(f.read())
+    key = answer_key_registry.find_by_hash(digest, answer_extractor_fingerprint)
+    if key is not None:
+        return key
+
+    answer_result = get_pdf_extractor().extract_from_pdf_path(params["pdf_path"])
+    if not answer_result["answers"]:
+        raise ValueError("Could not extract answer key from PDF. Please check the PDF format.")
+    return answer_key_registry.register(answer_result, digest, answer_extractor_fingerprint)
+
+
+def _run_grading_job(job: Job, report_progress: ProgressCallback) -> dict:
+    """Run the full batch grading pipeline for a queued job."""
+    params = job.params
+    omr_paths = params["omr_paths"]
+    try:
+        # 1. Extract answer key from PDF (or use the registered key)
+        report_progress("extracting_answers", 0.0)
+        answer_result = _job_answer_key(params).to_answer_result()
+
+        # 2. Detect and grade the OMR cards in every uploaded image
+        cards: List[dict] = []
+        for i, omr_path in enumerate(omr_paths):
+            report_progress("processing_omr", 0.2 + 0.7 * i / len(omr_paths))
+            with open(omr_path, "rb") as f:
+                omr_content = f.read()
+            cards.extend(_grade_card_summaries(omr_path, omr_content, job.job_id, len(cards)))
+
+        # 3. Grade all students
+        report_progress("grading", 0.9)
+        grading_result = batch_grader.grade_batch(answer_result["answers"], cards)
+        processed_images = [card["image_url"] for card in cards]
+
+        return _build_batch_response(
+            job.job_id, answer_result, grading_result, processed_images
+        )
+    except HTTPException as e:
+        raise ValueError(e.detail)
+    except ValueError:
+        raise
+    except Exception as e:
+        logger.exception(f"Batch grading error for job {job.job_id}: {e}")
+        raise RuntimeError("An error occurred during batch grading.")
+    finally:
+        job_dir = os.path.dirname(omr_paths[0])
+        if os.path.isdir(job_dir):
+            shutil.rmtree(job_dir, ignore_errors=True)
+
+
+job_store = JobStore(JOBS_DB_PATH)
+job_runner = JobRunner(
+    job_store, _run_grading_job, num_workers=JOB_WORKERS, retention=JOB_RETENTION_HOURS * 3600
+)
+
+
+def _job_queue_full() -> HTTPException:
+    """Build the 503 response returned when too many jobs are queued."""
+    return HTTPException(
+        status_code=503,
+        detail="Too many grading jobs are queued. Please retry shortly.",
+        headers={"Retry-After": str(GRADING_RETRY_AFTER)}
+    )
+
+
+@app.on_event("startup")
+def start_job_runner() -> None:
+    """Resume interrupted jobs and start background job workers."""
+    job_runner.start()
+
+
+@app.on_event("shutdown")
+def stop_job_runner() -> None:
+    """Let background job workers finish their current job."""
+    job_runner.stop(timeout=5)
+
+
+@app.post("/api/jobs", status_code=202)
+async def create_grading_job(
+    answer_pdf: Optional[UploadFile] = File(None, description="PDF file containing answer key"),
+    omr_images: List[UploadFile] = File(..., description="Images with OMR cards in grid layout"),
+    answer_key_id: Optional[str] = Form(None, description="ID of a registered answer key")
+):
+    """
+    Queue a batch grading job and return its ID immediately.
+
+    - Upload a PDF containing the exam with answer key, or pass the
+      answer_key_id of a registered key
+    - Upload one or more images containing OMR cards
+    - Poll GET /api/jobs/{job_id} for status, progress and results
+    """
+    _require_answer_key_source(answer_pdf, answer_key_id)
+    if not omr_images:
+        raise HTTPException(status_code=400, detail="At least one OMR image is required.")
+    if len(omr_images) > MAX_JOB_IMAGES:
+        raise HTTPException(status_code=400, detail=f"Too many images. Maximum is {MAX_JOB_IMAGES}.")
+    for omr_image in omr_images:
+        validate_file(omr_image)
+    # Reject before saving any uploads; the limit is enforced again atomically on enqueue
+    if job_store.count(JobStatus.QUEUED) >= MAX_QUEUED_JOBS:
+        raise _job_queue_full()
+
+    job_id = str(uuid.uuid4())
+    job_dir = os.path.join(JOBS_DIR, job_id)
+    os.makedirs(job_dir, exist_ok=True)
+    pdf_path = os.path.join(job_dir, "answers.pdf")
+    omr_paths = [os.path.join(job_dir, f"omr_{i}.jpg") for i in range(len(omr_images))]
+
+    try:
+        if not answer_key_id:
+            await _save_upload(
+                answer_pdf, pdf_path, MAX_PDF_SIZE, "PDF file too large. Maximum size is 50MB."
+            )
+        for omr_image, omr_path in zip(omr_images, omr_paths):
+            await _save_upload(
+                omr_image, omr_path, MAX_FILE_SIZE, "Image file too large. Maximum size is 10MB."
+            )
+    except Exception as e:
+        shutil.rmtree(job_dir, ignore_errors=True)
+        if isinstance(e, HTTPException):
+            raise
+        logger.error(f"File upload error: {e}")
+        raise HTTPException(status_code=500, detail="Failed to save uploaded files.")
+
+    params = {"omr_paths": omr_paths}
+    if answer_key_id:
+        params["answer_key_id"] = answer_key_id
+    else:
+        params["pdf_path"] = pdf_path
+    try:
+        job = job_store.create(params, job_id=job_id, max_queued=MAX_QUEUED_JOBS)
+    except JobQueueFullError as e:
+        shutil.rmtree(job_dir, ignore_errors=True)
+        logger.warning(f"Rejecting job: {e}")
+        raise _job_queue_full()
+    job_runner.notify()
+
+    response = job.to_dict()
+    response["status_url"] = f"/api/jobs/{job_id}"
+    return response
+
+
+@app.get("/api/jobs/{job_id}")
+async def get_grading_job(job_id: str):
+    """
+    Get the status, progress and (once completed) results of a grading job.
+    """
+    job = job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return job.to_dict()
+
 
 @app.get("/")
 async def root():
@@ -0,0 +1,29 @@
+import pytest
+from backend.engine.answer_key_registry import AnswerKeyRegistry, pdf_hash
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return AnswerKeyRegistry(str(tmp_path / "answer_keys.db"))
+
+
+def test_register_and_lookup(registry):
+    """Verify keys can be fetched by ID and by PDF hash with matching settings."""
+    digest = pdf_hash(b"%PDF-1.4 exam")
+    result = {
+        "answers": [3, 1, 0, 4],
+        "answer_map": {1: 3, 2: 1, 4: 4},
+        "confidence": 0.9,
+        "raw_text": "정답 1.③ 2.① 4.④",
+    }
+    key = registry.register(result, digest, "cfg-a")
+
+    fetched = registry.get(key.key_id)
+    assert fetched.answers == [3, 1, 0, 4]
+    assert fetched.answer_map == {1: 3, 2: 1, 4: 4}
+    assert fetched.to_answer_result()["answer_key_id"] == key.key_id
+
+    assert registry.find_by_hash(digest, "cfg-a").key_id == key.key_id
+    assert registry.find_by_hash(digest, "cfg-b") is None
+    assert registry.find_by_hash(pdf_hash(b"other"), "cfg-a") is None
+    assert registry.get("missing") is None
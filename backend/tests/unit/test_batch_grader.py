@@ -0,0 +1,56 @@
+import numpy as np
+from backend.engine.batch_grader import BatchGrader, pack_answers
+
+
+def test_pack_answers_builds_selection_matrix():
+    """Verify selections are packed per (student, question, choice)."""
+    selections, counts = pack_answers(
+        [{1: [2], 2: [1, 3]}, {2: [], 3: [5], 9: [1]}], total_questions=3
+    )
+    assert selections.shape == (2, 3, 5)
+    assert selections[0, 0, 1] and selections[0, 1, 0] and selections[0, 1, 2]
+    assert selections[1, 2, 4]
+    assert selections.sum() == 4
+    assert counts.tolist() == [[1, 2, 0], [0, 0, 1]]
+
+
+def test_grade_batch_scores_and_statistics():
+    """Verify only single correct selections score and statistics aggregate them."""
+    grader = BatchGrader()
+    result = grader.grade_batch(
+        [1, 2, 3, 4],
+        [
+            {"name": "A", "answers": {1: [1], 2: [2], 3: [3], 4: [4]}},
+            {"name": "B", "answers": {1: [1, 2], 2: [2], 3: [5]}},
+        ]
+    )
+
+    a, b = result.students
+    assert (a.correct_count, a.score) == (4, 100.0)
+    assert (b.correct_count, b.score) == (1, 25.0)
+    assert [d["status"] for d in b.details] == ["wrong", "correct", "wrong", "unanswered"]
+
+    stats = result.statistics
+    assert stats["student_count"] == 2
+    assert stats["average_score"] == 62.5
+    assert stats["std_deviation"] == 37.5
+    assert stats["perfect_scores"] == 1
+    assert stats["failing_scores"] == 1
+    assert [q["correct_count"] for q in stats["question_accuracy"]] == [1, 2, 1, 1]
+
+
+def test_streamed_grading_matches_batch():
+    """Verify grading students one at a time gives the same statistics."""
+    rng = np.random.default_rng(0)
+    key = rng.integers(1, 6, size=20).tolist()
+    students = [
+        {"name": f"S{i}", "answers": {q + 1: [int(c)] for q, c in enumerate(rng.integers(1, 6, size=20))}}
+        for i in range(8)
+    ]
+    grader = BatchGrader()
+
+    batch = grader.grade_batch(key, students)
+    streamed = [grader.grade_student(key, s, i) for i, s in enumerate(students)]
+
+    assert [s.correct_count for s in streamed] == [s.correct_count for s in batch.students]
+    assert grader.calculate_statistics(streamed, len(key)) == batch.statistics
@@ -0,0 +1,88 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from backend.engine.bubble_detector import BubbleDetector
+
+
+def test_score_bubbles_matches_roi_mean():
+    """Verify integral-image scores equal the mean darkness of each ROI."""
+    rng = np.random.default_rng(0)
+    img = rng.integers(0, 256, size=(120, 160, 3), dtype=np.uint8)
+    bubbles = [(5, 7, 12, 10, None), (100, 60, 20, 20, None), (150, 110, 20, 20, None)]
+
+    detector = BubbleDetector()
+    scores = detector.score_bubbles(img, bubbles)
+    gray = detector.prepare(img).gray
+
+    expected = [(255 - gray[y:y+h, x:x+w].mean()) / 255.0 for x, y, w, h, _ in bubbles]
+    np.testing.assert_allclose(scores, expected)
+
+
+def test_check_marking_and_score_rows_agree():
+    """Verify row scoring returns the same scores and marks as check_marking."""
+    img = np.full((100, 100, 3), 255, dtype=np.uint8)
+    img[10:30, 40:60] = 0  # Filled bubble
+    rows = [
+        [(10, 10, 20, 20, None), (40, 10, 20, 20, None)],
+        [(10, 50, 20, 20, None)],
+    ]
+
+    detector = BubbleDetector()
+    row_scores = detector.score_rows(img, rows)
+    marking = detector.check_marking(img, rows[0])
+
+    assert [r["is_marked"] for r in marking] == [False, True]
+    np.testing.assert_allclose(row_scores[0], [r["score"] for r in marking])
+    assert row_scores[1].tolist() == [0.0]
+
+
+def test_deduplicate_matches_greedy_scan():
+    """Verify spatial-hash dedup keeps the same bubbles as a pairwise scan."""
+    rng = np.random.default_rng(1)
+    rects = np.column_stack([
+        rng.integers(0, 200, size=(400, 2)),
+        np.full((400, 2), 15)
+    ]).astype(np.int64)
+    order = sorted(range(len(rects)), key=lambda i: rects[i, 0])
+
+    detector = BubbleDetector()
+    expected = []
+    for i in order:
+        if all(np.hypot(*(rects[i, :2] - rects[j, :2])) >= detector.config.dedup_distance
+               for j in expected):
+            expected.append(i)
+
+    assert detector._deduplicate(rects, order) == expected
+
+
+def test_prepared_image_is_computed_once_and_released():
+    """Verify one context serves detection and scoring, then frees its buffers."""
+    img = np.full((100, 100, 3), 255, dtype=np.uint8)
+    img[10:30, 40:60] = 0
+    detector = BubbleDetector()
+
+    with detector.prepare(img) as prepared:
+        bubbles = detector.detect_bubbles(prepared)
+        gray = prepared.gray
+        scores = detector.score_bubbles(prepared, bubbles)
+        assert prepared.gray is gray
+        np.testing.assert_allclose(scores, detector.score_bubbles(img, bubbles))
+
+    with pytest.raises(ValueError):
+        prepared.image
+
+
+def test_shared_detector_is_reentrant():
+    """Verify concurrent calls on one detector score each image independently."""
+    rng = np.random.default_rng(2)
+    images = [rng.integers(0, 256, size=(80, 80, 3), dtype=np.uint8) for _ in range(16)]
+    bubbles = [(x, y, 10, 10, None) for x in range(0, 70, 10) for y in range(0, 70, 10)]
+    detector = BubbleDetector()
+    expected = [detector.score_bubbles(img, bubbles) for img in images]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda img: detector.score_bubbles(img, bubbles), images * 4))
+
+    for result, exp in zip(results, expected * 4):
+        np.testing.assert_array_equal(result, exp)
@@ -0,0 +1,71 @@
+import asyncio
+import threading
+
+import pytest
+from backend.engine.executor import GradingExecutor, ExecutorConfig, ExecutorSaturatedError
+
+
+def test_run_in_thread_returns_result():
+    """Verify blocking work runs on the pool and returns its value."""
+    executor = GradingExecutor(ExecutorConfig(thread_workers=2, process_workers=0))
+    try:
+        result = asyncio.run(executor.run_in_thread(sum, [1, 2, 3]))
+        assert result == 6
+    finally:
+        executor.shutdown()
+
+
+def test_saturated_pool_rejects_new_work():
+    """Verify work beyond the pending limit is rejected instead of queued."""
+    executor = GradingExecutor(ExecutorConfig(
+        thread_workers=1, process_workers=0, max_pending_threads=1, retry_after=7
+    ))
+    release = threading.Event()
+
+    async def scenario():
+        blocked = asyncio.ensure_future(executor.run_in_thread(release.wait, 5))
+        await asyncio.sleep(0.05)
+        with pytest.raises(ExecutorSaturatedError) as exc_info:
+            await executor.run_in_thread(sum, [1])
+        release.set()
+        await blocked
+        return exc_info.value
+
+    try:
+        error = asyncio.run(scenario())
+        assert error.retry_after == 7
+        # Slot is released once the blocking task finishes
+        assert executor.stats()["thread"]["pending"] == 0
+    finally:
+        executor.shutdown()
+
+
+def test_cancelled_request_keeps_slot_until_work_finishes():
+    """Verify a cancelled await does not free the slot of work still running."""
+    executor = GradingExecutor(ExecutorConfig(
+        thread_workers=1, process_workers=0, max_pending_threads=1
+    ))
+    started, release = threading.Event(), threading.Event()
+
+    def blocking():
+        started.set()
+        release.wait(5)
+
+    async def scenario():
+        task = asyncio.ensure_future(executor.run_in_thread(blocking))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # The worker is still busy, so the pool stays saturated
+        with pytest.raises(ExecutorSaturatedError):
+            await executor.run_in_thread(sum, [1])
+        release.set()
+        await asyncio.sleep(0.05)
+        return await executor.run_in_thread(sum, [1, 2])
+
+    try:
+        assert asyncio.run(scenario()) == 3
+        assert executor.stats()["thread"]["pending"] == 0
+    finally:
+        executor.shutdown()
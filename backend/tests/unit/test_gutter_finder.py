@@ -0,0 +1,64 @@
+import cv2
+import numpy as np
+import pytest
+from backend.engine.gutter_finder import GutterFinder, box_filter_1d
+from backend.engine.omr_grid_detector import OMRGridDetector
+
+
+def make_stacked_page(num_cards, card_h=300, card_w=800, gap=80):
+    """White page of framed cards with bubble rows, separated by blank gutters."""
+    height = num_cards * card_h + (num_cards - 1) * gap
+    page = np.full((height, card_w, 3), 255, dtype=np.uint8)
+    for i in range(num_cards):
+        top = i * (card_h + gap)
+        cv2.rectangle(page, (5, top + 5), (card_w - 6, top + card_h - 6), (0, 0, 0), 2)
+        for row in range(6):
+            for col in range(12):
+                center = (60 + col * 60, top + 40 + row * 45)
+                cv2.circle(page, center, 10, (0, 0, 0), -1 if (row + col + i) % 5 == 0 else 2)
+    gutters = [i * (card_h + gap) - gap // 2 for i in range(1, num_cards)]
+    return page, gutters
+
+
+def test_box_filter_matches_convolution():
+    """Verify the cumulative-sum box filter equals a moving average with replicated edges."""
+    profile = np.random.default_rng(0).random(200)
+    expected = np.convolve(np.pad(profile, 7, mode="edge"), np.ones(15) / 15, mode="valid")
+    assert np.allclose(box_filter_1d(profile, 15), expected)
+
+
+@pytest.mark.parametrize("num_cards", [1, 2, 3, 5])
+def test_split_points_land_in_gutters(num_cards):
+    """Verify splits fall in the gutters, with the count given or inferred."""
+    page, gutters = make_stacked_page(num_cards)
+    finder = GutterFinder()
+
+    for points in (finder.split_points(page, num_cards=num_cards), finder.split_points(page)):
+        assert points[0] == 0 and points[-1] == page.shape[0]
+        assert len(points) == num_cards + 1
+        for found, expected in zip(points[1:-1], gutters):
+            assert abs(found - expected) <= 20
+
+
+def test_split_points_map_back_to_full_resolution():
+    """Verify splits found on the decimated projection are in full-resolution pixels."""
+    page, gutters = make_stacked_page(3)
+    large = cv2.resize(page, None, fx=3, fy=3, interpolation=cv2.INTER_NEAREST)
+
+    points = GutterFinder().split_points(large)
+
+    assert points[-1] == large.shape[0]
+    for found, expected in zip(points[1:-1], gutters):
+        assert abs(found - 3 * expected) <= 60
+
+
+def test_grid_detector_splits_stacked_cards():
+    """Verify OMRGridDetector exposes gutter splitting as card regions of the page."""
+    page, _ = make_stacked_page(3)
+    page = np.ascontiguousarray(np.rot90(page))
+
+    regions = OMRGridDetector().split_cards(page, axis=1)
+
+    assert len(regions) == 3
+    assert sum(region.bbox[2] for region in regions) == page.shape[1]
+    assert all(np.shares_memory(region.view, page) for region in regions)
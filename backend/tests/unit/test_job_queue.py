@@ -0,0 +1,84 @@
+import os
+
+import pytest
+from backend.engine.job_queue import JobQueueFullError, JobRunner, JobStatus, JobStore
+
+
+@pytest.fixture
+def job_store(tmp_path):
+    return JobStore(str(tmp_path / "jobs.db"))
+
+
+def test_claim_next_runs_jobs_in_order(job_store):
+    """Verify queued jobs are claimed oldest first and only once."""
+    first = job_store.create({"n": 1})
+    second = job_store.create({"n": 2})
+
+    claimed = job_store.claim_next()
+    assert claimed.job_id == first.job_id
+    assert claimed.status == JobStatus.RUNNING
+    assert job_store.claim_next().job_id == second.job_id
+    assert job_store.claim_next() is None
+
+
+def test_runner_stores_result_and_errors(job_store):
+    """Verify the runner records progress, results and failures."""
+    def handler(job, report_progress):
+        report_progress("working", 0.5)
+        if job.params["fail"]:
+            raise ValueError("bad input")
+        return {"value": job.params["value"]}
+
+    runner = JobRunner(job_store, handler)
+    ok = job_store.create({"fail": False, "value": 42})
+    bad = job_store.create({"fail": True})
+    runner.run_job(job_store.claim_next())
+    runner.run_job(job_store.claim_next())
+
+    ok_job = job_store.get(ok.job_id)
+    assert ok_job.status == JobStatus.COMPLETED
+    assert ok_job.progress == 1.0
+    assert ok_job.result == {"value": 42}
+
+    bad_job = job_store.get(bad.job_id)
+    assert bad_job.status == JobStatus.FAILED
+    assert bad_job.error == "bad input"
+
+
+def test_interrupted_jobs_are_requeued(job_store, tmp_path):
+    """Verify running jobs survive a restart by being requeued."""
+    job = job_store.create({})
+    job_store.claim_next()
+
+    # A fresh store on the same database simulates a restarted worker
+    restarted = JobStore(str(tmp_path / "jobs.db"))
+    assert restarted.requeue_interrupted() == [job.job_id]
+    assert restarted.get(job.job_id).status == JobStatus.QUEUED
+
+
+def test_queue_limit_rejects_new_jobs(job_store):
+    """Verify jobs beyond the queued limit are rejected until one is claimed."""
+    job_store.create({}, max_queued=2)
+    job_store.create({}, max_queued=2)
+    with pytest.raises(JobQueueFullError):
+        job_store.create({}, max_queued=2)
+    assert job_store.count(JobStatus.QUEUED) == 2
+
+    job_store.claim_next()
+    job_store.create({}, max_queued=2)
+
+
+def test_finished_jobs_are_pruned_after_retention(job_store):
+    """Verify completed and failed jobs are deleted once older than the retention period."""
+    done = job_store.create({})
+    failed = job_store.create({})
+    queued = job_store.create({})
+    job_store.complete(job_store.claim_next().job_id, {"value": 1})
+    job_store.fail(job_store.claim_next().job_id, "bad input")
+
+    assert job_store.prune_finished(max_age=3600) == 0
+    JobRunner(job_store, lambda job, report: {}, retention=-1).prune()
+
+    assert job_store.get(done.job_id) is None
+    assert job_store.get(failed.job_id) is None
+    assert job_store.get(queued.job_id).status == JobStatus.QUEUED
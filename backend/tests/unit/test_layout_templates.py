@@ -0,0 +1,99 @@
+import cv2
+import numpy as np
+import pytest
+from backend.engine.bubble_detector import BubbleDetector
+from backend.engine.layout_templates import compile_template, load_template
+
+
+def make_ss03_card(answers, student_id, scale=1.0):
+    """SS-03 card drawn at the template's frame geometry, optionally resized."""
+    card = np.full((480, 1300, 3), 255, dtype=np.uint8)
+    for q in range(40):
+        col, row = divmod(q, 10)
+        for choice in range(1, 6):
+            center = (465 + 215 * col + 35 * (choice - 1), 100 + 35 * row)
+            if answers.get(q + 1) == choice:
+                cv2.circle(card, center, 11, (10, 10, 10), -1)
+            else:
+                cv2.circle(card, center, 11, (100, 100, 255), 2)
+    for digit, value in enumerate(student_id):
+        cv2.circle(card, (80 + 35 * digit, 120 + 25 * int(value)), 10, (10, 10, 10), -1)
+    if scale != 1.0:
+        card = cv2.resize(card, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    return card
+
+
+def test_compiled_template_arrays():
+    """Verify the SS-03 template compiles to per-question and per-digit center arrays."""
+    template = load_template("ss03")
+
+    assert template.question_centers.shape == (40, 5, 2)
+    assert template.question_numbers.tolist() == list(range(1, 41))
+    assert template.registration_centers.shape == (5, 10, 2)
+    assert tuple(template.question_centers[10, 0]) == (680.0, 100.0)
+    assert not template.question_centers.flags.writeable
+    assert load_template("ss03") is template
+
+
+def test_sample_reads_answers_and_registration():
+    """Verify one sampling pass grades a card at any scale of the frame."""
+    answers = {q: (q * 7) % 5 + 1 for q in range(1, 41)}
+    detector = BubbleDetector()
+    template = load_template("ss03")
+
+    for scale in (1.0, 0.6):
+        card = make_ss03_card(answers, "10405", scale=scale)
+        assert template.matches(card.shape)
+        sample = template.sample(card, detector)
+
+        assert sample.question_scores.shape == (40, 5)
+        assert sample.answers() == {q: [a] for q, a in answers.items()}
+        assert sample.registration() == "10405"
+
+
+def test_verify_rejects_misaligned_cards():
+    """Verify only cards whose bubbles sit at the template positions pass the check."""
+    detector = BubbleDetector()
+    template = load_template("ss03")
+    card = make_ss03_card({1: 3}, "10405")
+
+    assert template.verify(card, detector)
+    assert template.verify(make_ss03_card({}, "", scale=0.6), detector)
+    # Half a bubble step off: same aspect ratio, wrong bubbles sampled
+    assert not template.verify(np.roll(card, (17, 17), axis=(0, 1)), detector)
+    assert not template.verify(np.full_like(card, 255), detector)
+
+
+def test_grid_units_need_origin_and_scale():
+    """Verify grid-unit templates are placed by a measured origin and step."""
+    template = load_template("yedam")
+    card = np.full((400, 900, 3), 255, dtype=np.uint8)
+    # Question 12, choice 3: block 2 origin 11.0 + 2 * 0.5 grid units right, row 1
+    cv2.circle(card, (int(50 + 12.0 * 30), int(40 + 1 * 30)), 12, (0, 0, 0), -1)
+
+    assert not template.matches(card.shape)
+    with pytest.raises(ValueError):
+        template.sample(card, BubbleDetector())
+
+    sample = template.sample(card, BubbleDetector(), origin=(50, 40), scale=(30, 30))
+    marked = {q: a for q, a in sample.answers().items() if a}
+    assert marked == {12: [3]}
+
+
+def test_invalid_templates_are_rejected():
+    """Verify malformed specifications raise ValueError."""
+    block = {
+        "first_question": 1, "origin": [0, 0], "rows": 2, "choices": 4,
+        "choice_step": [1, 0], "row_step": [0, 1]
+    }
+    valid = {"id": "t", "units": "grid", "roi_half_size": 5, "question_blocks": [block]}
+    assert compile_template(valid).question_centers.shape == (2, 4, 2)
+
+    with pytest.raises(ValueError):
+        compile_template({**valid, "units": "inches"})
+    with pytest.raises(ValueError):
+        compile_template({**valid, "question_blocks": []})
+    with pytest.raises(ValueError):
+        compile_template({**valid, "question_blocks": [block, block]})
+    with pytest.raises(ValueError):
+        compile_template({**valid, "units": "frame"})
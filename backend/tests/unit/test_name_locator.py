@@ -0,0 +1,162 @@
+import threading
+
+import numpy as np
+from backend.engine.name_locator import NameFieldConfig, NameFieldLocator
+from backend.engine.ocr_engine import OCREngine
+
+
+class FakeOCREngine(OCREngine):
+    """Full cards show a label and a name; crops show only the name."""
+
+    def __init__(self, crop_text="김철수"):
+        self.crop_text = crop_text
+        self.shapes = []
+
+    def extract_text(self, image):
+        self.shapes.append(image.shape[:2])
+        if image.shape[:2] == (800, 1000):
+            return [
+                {"text": "수학 OMR", "confidence": 0.9, "bbox": [400, 10, 600, 40]},
+                {"text": "이름", "confidence": 0.9, "bbox": [[100, 50], [160, 50], [160, 80], [100, 80]]},
+                {"text": "김철수", "confidence": 0.9, "bbox": [200, 50, 300, 80]},
+            ]
+        if not self.crop_text:
+            return []
+        return [{"text": self.crop_text, "confidence": 0.9, "bbox": [0, 0, 10, 10]}]
+
+
+def test_anchor_found_once_then_name_box_is_cropped():
+    """Verify full-card OCR runs once per layout, later cards OCR only the name box."""
+    locator = NameFieldLocator()
+    ocr = FakeOCREngine()
+    card = np.zeros((800, 1000, 3), dtype=np.uint8)
+
+    assert locator.extract_name(card, ocr)[0] == "김철수"
+    name, text_results = locator.extract_name(card, ocr)
+
+    assert name == "김철수"
+    assert text_results[0]["text"] == "김철수"
+    assert ocr.shapes[0] == (800, 1000)
+    crop_h, crop_w = ocr.shapes[1]
+    assert crop_h < 200 and crop_w < 600
+    assert locator.name_region(card.shape) == locator.name_region(card.shape, "default")
+    assert locator.name_region(card.shape, "other") is None
+
+
+def test_empty_crop_falls_back_to_full_card():
+    """Verify a name box without a readable name falls back to full-card OCR."""
+    locator = NameFieldLocator(NameFieldConfig(name_region=(0.1, 0.05, 0.3, 0.05)))
+    ocr = FakeOCREngine(crop_text="")
+    card = np.zeros((800, 1000, 3), dtype=np.uint8)
+
+    name, _ = locator.extract_name(card, ocr)
+
+    assert name == "김철수"
+    assert ocr.shapes == [(40, 300), (800, 1000)]
+
+
+def test_stale_name_box_is_relearned_from_full_card():
+    """Verify a cached name box that misses is replaced by the label on the full card."""
+    locator = NameFieldLocator()
+    locator._anchor_regions["default"] = (0.5, 0.9, 0.3, 0.05)
+    ocr = FakeOCREngine()
+    stale_crop = ocr.extract_text
+    ocr.extract_text = lambda image: [] if image.shape[:2] == (40, 300) else stale_crop(image)
+    ocr.extract_text_batch = lambda crops: [ocr.extract_text(c) for c in crops]
+    cards = [np.zeros((800, 1000, 3), dtype=np.uint8) for _ in range(2)]
+
+    names = locator.extract_names(cards, ocr)
+
+    assert [name for name, _ in names] == ["김철수"] * 2
+    assert locator.name_region(cards[0].shape) == (90, 10, 420, 110)
+
+
+def test_name_box_dropped_after_repeated_misses():
+    """Verify a learned box is forgotten when neither it nor the full card shows a name."""
+    locator = NameFieldLocator(NameFieldConfig(max_anchor_misses=2))
+    locator._anchor_regions["default"] = (0.1, 0.05, 0.3, 0.05)
+    ocr = FakeOCREngine(crop_text="")
+    card = np.zeros((700, 1000, 3), dtype=np.uint8)
+
+    locator.extract_name(card, ocr)
+    assert locator.name_region(card.shape) is not None
+    locator.extract_name(card, ocr)
+    assert locator.name_region(card.shape) is None
+
+
+class FakePaddleOCR:
+    """Reports one word per dark horizontal band of the image, like a text detector."""
+
+    def __init__(self):
+        self.calls = 0
+        self.shapes = []
+
+    def ocr(self, image):
+        self.calls += 1
+        self.shapes.append(image.shape[:2])
+        dark_rows = np.flatnonzero(image.min(axis=(1, 2)) < 128)
+        bands = np.split(dark_rows, np.flatnonzero(np.diff(dark_rows) > 1) + 1)
+        return [[
+            [[[0, int(b[0])], [10, int(b[0])], [10, int(b[-1])], [0, int(b[-1])]],
+             (f"word{int(b[0])}", 0.9)]
+            for b in bands if len(b)
+        ]]
+
+
+def test_extract_text_batch_maps_boxes_back_to_each_image():
+    """Verify batched OCR runs once per mosaic and returns boxes in image coordinates."""
+    engine = OCREngine.__new__(OCREngine)
+    engine.ocr = FakePaddleOCR()
+    engine._lock = threading.Lock()
+
+    images = []
+    for top in (5, 12, 20):
+        image = np.full((40, 60 + top, 3), 255, dtype=np.uint8)
+        image[top:top + 8] = 0
+        images.append(image)
+
+    results = engine.extract_text_batch(images)
+
+    assert engine.ocr.calls == 1
+    for top, image_results in zip((5, 12, 20), results):
+        assert len(image_results) == 1
+        assert image_results[0]["bbox"][0] == [0, top]
+
+    results = engine.extract_text_batch(images, max_mosaic_height=112)
+    assert engine.ocr.calls == 3  # Two mosaics: two stacked images, then one alone
+    assert [r[0]["bbox"][0][1] for r in results] == [5, 12, 20]
+
+
+
+def test_extract_text_batch_mosaics_stay_within_detector_limit():
+    """Verify mosaics are never larger than the detector input, so crops are not shrunk."""
+    engine = OCREngine.__new__(OCREngine)
+    engine.ocr = FakePaddleOCR()
+    engine._lock = threading.Lock()
+
+    images = [np.full((150, 400, 3), 255, dtype=np.uint8) for _ in range(8)]
+    images.insert(3, np.full((100, 1200, 3), 255, dtype=np.uint8))  # Wider than the limit
+    for image in images:
+        image[40:60] = 0
+
+    results = engine.extract_text_batch(images)
+
+    # Three crops, the wide crop alone, then five crops (5 * 150 + 4 * 32 = 878 px)
+    assert engine.ocr.shapes == [(514, 400), (100, 1200), (878, 400)]
+    assert all(len(r) == 1 and r[0]["bbox"][0][1] == 40 for r in results)
+
+def test_extract_names_batches_name_boxes():
+    """Verify names of a batch are read with one full-card OCR and one batched crop OCR."""
+    locator = NameFieldLocator()
+    ocr = FakeOCREngine()
+    ocr.batches = []
+    ocr.extract_text_batch = lambda crops: (
+        ocr.batches.append(len(crops)) or [ocr.extract_text(c) for c in crops]
+    )
+    cards = [np.zeros((800, 1000, 3), dtype=np.uint8) for _ in range(4)]
+
+    names = locator.extract_names(cards, ocr)
+
+    assert [name for name, _ in names] == ["김철수"] * 4
+    assert ocr.batches == [3]
+    assert ocr.shapes[0] == (800, 1000)
@@ -0,0 +1,56 @@
+import time
+from concurrent.futures import Future
+
+import numpy as np
+import pytest
+from backend.engine.ocr_pool import OCRPoolConfig, OCRWorkerPool
+
+
+def test_pool_round_trips_images_through_workers():
+    """Verify submitted images are OCRed by worker processes and their shared memory freed."""
+    pool = OCRWorkerPool(OCRPoolConfig(workers=2, startup_timeout=60))
+    try:
+        pool.start()
+        assert all(w.process.is_alive() for w in pool._workers)
+
+        images = [np.full((20 + i, 30, 3), i, dtype=np.uint8) for i in range(6)]
+        futures = [pool.submit(image) for image in images]
+        results = [f.result(timeout=30) for f in futures]
+
+        # Without PaddleOCR installed every worker returns no text
+        expected = pool.available
+        assert all(isinstance(r, list) for r in results)
+        assert expected or all(r == [] for r in results)
+        assert pool._tasks == {}
+        assert all(w.pending == 0 for w in pool._workers)
+    finally:
+        pool.close()
+
+    assert not any(w.process.is_alive() for w in pool._workers)
+    assert pool.extract_text(images[0]) == []
+    with pytest.raises(RuntimeError):
+        pool.submit(images[0])
+
+
+def test_crashed_worker_fails_its_tasks_and_is_restarted():
+    """Verify a killed worker's futures fail promptly and a replacement takes new work."""
+    pool = OCRWorkerPool(OCRPoolConfig(workers=1, startup_timeout=60))
+    try:
+        pool.start()
+        crashed = pool._workers[0]
+        lost = Future()
+        with pool._lock:
+            crashed.pending += 1
+            pool._tasks[-1] = (lost, crashed, None)
+
+        crashed.process.kill()
+
+        assert isinstance(lost.exception(timeout=10), RuntimeError)
+        deadline = time.monotonic() + 10
+        while pool._workers[0] is crashed and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert pool._workers[0] is not crashed
+        assert pool._restarts == 1
+        assert pool.submit(np.zeros((20, 30, 3), dtype=np.uint8)).result(timeout=60) is not None
+    finally:
+        pool.close()
@@ -0,0 +1,79 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+from backend.engine.layout_templates import load_template
+from backend.engine.omr_grid_detector import OMRGridDetector
+from backend.tests.unit.test_layout_templates import make_ss03_card
+
+
+def make_grid_scan(rows=2, cols=2, card_w=300, card_h=340, gap=60):
+    """Gray bed with a grid of white, black-bordered cards."""
+    height = rows * card_h + (rows + 1) * gap
+    width = cols * card_w + (cols + 1) * gap
+    scan = np.full((height, width, 3), 90, dtype=np.uint8)
+    for r in range(rows):
+        for c in range(cols):
+            x, y = gap + c * (card_w + gap), gap + r * (card_h + gap)
+            cv2.rectangle(scan, (x, y), (x + card_w, y + card_h), (255, 255, 255), -1)
+            cv2.rectangle(scan, (x, y), (x + card_w, y + card_h), (0, 0, 0), 4)
+            cv2.circle(scan, (x + 100 + 40 * c, y + 120 + 40 * r), 12, (0, 0, 0), -1)
+    return scan
+
+
+def test_card_regions_are_views_of_the_scan():
+    """Verify located cards reference the scan instead of copying it."""
+    scan = make_grid_scan()
+    detector = OMRGridDetector()
+
+    regions = detector.locate_cards(scan)
+
+    assert len(regions) == 4
+    assert all(np.shares_memory(region.view, scan) for region in regions)
+    assert all(np.shares_memory(card, scan) for card in detector.detect_cards(scan))
+
+
+def test_warp_card_matches_warping_a_cropped_copy():
+    """Verify the combined crop + perspective warp equals warping a cropped copy."""
+    scan = make_grid_scan()
+    detector = OMRGridDetector()
+
+    for region in detector.locate_cards(scan):
+        expected = detector.doc_processor.process_document_image(region.view.copy())
+        warped = detector.warp_card(region)
+        assert warped.shape == expected.shape
+        assert np.mean(np.abs(warped.astype(int) - expected.astype(int))) < 1.0
+
+
+def test_parallel_grading_matches_sequential_in_grid_order():
+    """Verify concurrent card grading returns the sequential results, in order, with timings."""
+    scan = make_grid_scan(rows=3, cols=3)
+    sequential = OMRGridDetector().process_grid_image(scan, question_x_offset=0)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        parallel = OMRGridDetector(executor=executor).process_grid_image(scan, question_x_offset=0)
+
+    assert [r.card_index for r in parallel] == list(range(9))
+    assert [r.answers for r in parallel] == [r.answers for r in sequential]
+    assert [r.confidence_scores for r in parallel] == [r.confidence_scores for r in sequential]
+    for result in parallel:
+        assert {"warp", "detect", "score", "total"} <= set(result.timings)
+        assert result.timings["total"] >= result.timings["warp"]
+
+
+def test_layout_template_grades_matching_cards():
+    """Verify cards matching a layout template are graded by sampling its bubble positions."""
+    answers = {q: (q * 3) % 5 + 1 for q in range(1, 41)}
+    card = make_ss03_card(answers, "10405", scale=0.5)
+    cv2.rectangle(card, (0, 0), (card.shape[1] - 1, card.shape[0] - 1), (0, 0, 0), 4)
+    gap, (h, w) = 60, card.shape[:2]
+    scan = np.full((2 * h + 3 * gap, w + 2 * gap, 3), 90, dtype=np.uint8)
+    for r in range(2):
+        scan[gap + r * (h + gap):gap + r * (h + gap) + h, gap:gap + w] = card
+
+    results = OMRGridDetector().process_grid_image(scan, layout=load_template("ss03"))
+
+    assert len(results) == 2
+    for result in results:
+        assert result.answers == {q: [a] for q, a in answers.items()}
+        assert len(result.confidence_scores[1]) == 5
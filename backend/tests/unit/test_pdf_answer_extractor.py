@@ -0,0 +1,316 @@
+import re
+
+import fitz
+import numpy as np
+from backend.engine.pdf_answer_extractor import AnswerExtractorConfig, PDFAnswerExtractor
+
+
+class FakeOCREngine:
+    """Records OCR calls and returns fixed text for every page."""
+
+    def __init__(self, text=""):
+        self.text = text
+        self.calls = 0
+
+    def extract_text(self, image):
+        self.calls += 1
+        return [{"text": self.text, "confidence": 0.99}] if self.text else []
+
+
+def _make_pdf(pages):
+    doc = fitz.open()
+    for text in pages:
+        page = doc.new_page()
+        if text:
+            page.insert_text((72, 72), text)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def test_text_layer_pages_skip_ocr():
+    """Verify born-digital pages are parsed from the text layer without OCR."""
+    ocr = FakeOCREngine()
+    extractor = PDFAnswerExtractor(ocr_engine=ocr)
+    pdf = _make_pdf(["Question sheet with plenty of text", "Answer 1) 3 2) 4 3) 1 4) 5"])
+
+    result = extractor.extract_from_pdf_bytes(pdf)
+
+    assert result["answers"] == [3, 4, 1, 5]
+    assert result["page_sources"] == ["skipped", "text"]
+    assert ocr.calls == 0
+
+
+def test_scanned_pages_fall_back_to_ocr():
+    """Verify pages without a text layer are rasterized and OCRed."""
+    ocr = FakeOCREngine("정답 1.② 2.③")
+    extractor = PDFAnswerExtractor(AnswerExtractorConfig(adaptive_dpi=False), ocr_engine=ocr)
+    pdf = _make_pdf(["", "Question sheet with plenty of text"])
+
+    result = extractor.extract_from_pdf_bytes(pdf)
+
+    assert result["answers"] == [2, 3]
+    assert result["page_sources"] == ["ocr", "text"]
+    assert ocr.calls == 1
+
+
+class PageOCREngine:
+    """Returns the text of the page whose index is encoded in the image."""
+
+    def __init__(self, page_texts):
+        self.page_texts = page_texts
+        self.calls = 0
+
+    def extract_text(self, image):
+        self.calls += 1
+        text = self.page_texts[int(image[0, 0, 0])]
+        return [{"text": text, "confidence": 0.99}] if text else []
+
+
+def _page_images(count):
+    return [np.full((4, 4, 3), i, dtype=np.uint8) for i in range(count)]
+
+
+class RegionOCREngine:
+    """Finds the answer heading on previews and answers in high-DPI regions."""
+
+    def __init__(self):
+        self.shapes = []
+
+    def extract_text(self, image):
+        self.shapes.append(image.shape[:2])
+        if image.shape[1] < 1000:  # Low-DPI preview
+            return [
+                {"text": "문제", "confidence": 0.9, "bbox": [10, 100, 60, 120]},
+                {"text": "정답", "confidence": 0.9, "bbox": [10, 421, 60, 440]},
+            ]
+        return [{"text": "정답 1.② 2.③ 3.①", "confidence": 0.9, "bbox": [0, 0, 10, 10]}]
+
+
+def test_scanned_answer_region_is_ocred_at_high_dpi():
+    """Verify scanned pages OCR only the answer region found on the preview."""
+    ocr = RegionOCREngine()
+    config = AnswerExtractorConfig(preview_dpi=72, roi_dpi=300, roi_margin=20)
+    extractor = PDFAnswerExtractor(config, ocr_engine=ocr)
+
+    result = extractor.extract_from_pdf_bytes(_make_pdf([""]))
+
+    assert result["answers"] == [2, 3, 1]
+    assert result["page_sources"] == ["roi"]
+    preview_shape, region_shape = ocr.shapes
+    assert preview_shape == (842, 595)
+    # Clip starts 20pt above the heading at 421pt and runs to the page bottom
+    expected = ((842 - 401) * 300 / 72, 595 * 300 / 72)
+    assert all(abs(got - want) <= 2 for got, want in zip(region_shape, expected))
+
+
+class MissedHeadingOCREngine:
+    """Misses the answer heading on previews; reads answers at full resolution."""
+
+    def __init__(self):
+        self.shapes = []
+
+    def extract_text(self, image):
+        self.shapes.append(image.shape[:2])
+        if image.shape[1] < 1000:  # Low-DPI preview: heading text too small to read
+            return [{"text": "1. ② 2. ③", "confidence": 0.4, "bbox": [10, 400, 90, 410]}]
+        return [{"text": "정답 1.② 2.③", "confidence": 0.9, "bbox": [0, 0, 10, 10]}]
+
+
+def test_preview_without_heading_is_ocred_in_full():
+    """Verify a scanned page whose preview misses the heading is still read at full DPI."""
+    ocr = MissedHeadingOCREngine()
+    extractor = PDFAnswerExtractor(AnswerExtractorConfig(pdf_dpi=200), ocr_engine=ocr)
+    # Answers 3-4 come from the text layer, so the key is not empty without page 1
+    pdf = _make_pdf(["", "Answer 3) 1 4) 5"])
+
+    result = extractor.extract_from_pdf_bytes(pdf)
+
+    assert result["answers"] == [2, 3, 1, 5]
+    assert result["page_sources"] == ["ocr", "text"]
+    assert ocr.shapes[-1] == (round(842 * 200 / 72), round(595 * 200 / 72))
+
+
+
+class ShapeOCREngine:
+    """Records image shapes and returns fixed text for every call."""
+
+    def __init__(self, text):
+        self.text = text
+        self.shapes = []
+
+    def extract_text(self, image):
+        self.shapes.append(image.shape[:2])
+        return [{"text": self.text, "confidence": 0.9, "bbox": [0, 0, 10, 10]}]
+
+
+def _make_korean_pdf(pages):
+    doc = fitz.open()
+    for lines in pages:
+        page = doc.new_page()
+        for top, text in lines:
+            page.insert_text((72, top), text, fontname="korea")
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def test_question_text_is_not_an_answer_heading():
+    """Verify "답" in question text neither places a crop nor triggers full-page OCR."""
+    ocr = ShapeOCREngine("3. 다음 중 알맞은 답을 고르시오")
+    extractor = PDFAnswerExtractor(AnswerExtractorConfig(early_exit=False), ocr_engine=ocr)
+    pdf = _make_korean_pdf([
+        [(72, "3. 다음 중 알맞은 답을 고르시오")],
+        [(72, "Answer 1) 3 2) 4 3) 1")],
+    ])
+
+    result = extractor.extract_from_pdf_bytes(pdf)
+
+    assert result["answers"] == [3, 4, 1]
+    assert result["page_sources"] == ["preview", "text"]
+    assert ocr.shapes == [(842, 595)]  # Only the 72 DPI preview
+
+
+def test_answer_region_covering_most_of_the_page_is_read_in_full():
+    """Verify a heading near the page top renders the full page at pdf_dpi, not a 300 DPI crop."""
+    ocr = ShapeOCREngine("정답 1.② 2.③")
+    extractor = PDFAnswerExtractor(AnswerExtractorConfig(pdf_dpi=200), ocr_engine=ocr)
+    # The answer table itself is an image, so the text layer has only the heading
+    pdf = _make_korean_pdf([[(100, "정답")]])
+
+    result = extractor.extract_from_pdf_bytes(pdf)
+
+    assert result["answers"] == [2, 3]
+    assert result["page_sources"] == ["ocr"]
+    assert ocr.shapes == [(round(842 * 200 / 72), round(595 * 200 / 72))]
+
+def test_stops_after_complete_answer_page():
+    """Verify scanning starts at the last page and stops once the key is complete."""
+    texts = ["문제 내용"] * 19 + ["정답 1.② 2.③ 3.①"]
+    ocr = PageOCREngine(texts)
+    extractor = PDFAnswerExtractor(ocr_engine=ocr)
+
+    result = extractor._extract_from_images(_page_images(20))
+
+    assert result["answers"] == [2, 3, 1]
+    assert result["page_sources"] == ["skipped"] * 19 + ["ocr"]
+    assert ocr.calls == 1
+
+
+def test_keeps_reading_until_sequence_is_contiguous():
+    """Verify an answer table split across pages is merged in page order."""
+    texts = ["문제 내용"] * 18 + ["정답 1.② 2.③", "정답 3.① 4.⑤"]
+    ocr = PageOCREngine(texts)
+    extractor = PDFAnswerExtractor(ocr_engine=ocr)
+
+    result = extractor._extract_from_images(_page_images(20))
+
+    assert result["answers"] == [2, 3, 1, 5]
+    assert ocr.calls == 2
+
+    full_scan = PDFAnswerExtractor(
+        AnswerExtractorConfig(early_exit=False), ocr_engine=PageOCREngine(texts)
+    )._extract_from_images(_page_images(20))
+    assert full_scan["answers"] == result["answers"]
+    assert "skipped" not in full_scan["page_sources"]
+
+
+def test_parallel_full_scan_merges_pages_in_order():
+    """Verify worker processes read disjoint page ranges merged in page order."""
+    pages = [f"Question sheet {i} with plenty of text" for i in range(6)]
+    pages[2] = "Answer 1) 3 2) 4"
+    pages[4] = "Answer 3) 1 4) 5"
+    config = AnswerExtractorConfig(parallel_workers=2, early_exit=False)
+    extractor = PDFAnswerExtractor(config, ocr_engine=FakeOCREngine())
+    try:
+        result = extractor.extract_from_pdf_bytes(_make_pdf(pages))
+    finally:
+        extractor.close()
+
+    assert result["answers"] == [3, 4, 1, 5]
+    assert result["page_sources"] == ["text"] * 6
+
+
+def test_iter_pdf_images_yields_pages_lazily():
+    """Verify pages are rendered one at a time and match single-page rendering."""
+    extractor = PDFAnswerExtractor(AnswerExtractorConfig(pdf_dpi=72))
+    pdf = _make_pdf(["page one", "page two", "page three"])
+
+    pages = extractor.iter_pdf_images(pdf)
+    first = next(pages)
+    assert first.shape == (842, 595, 3)
+    assert len(list(pages)) == 2
+
+    with fitz.open(stream=pdf, filetype="pdf") as doc:
+        assert np.array_equal(first, extractor._render_page(doc[0]))
+
+
+def test_iter_pdf_images_yields_owned_pages():
+    """Verify yielded pages stay valid after later pages are rendered."""
+    extractor = PDFAnswerExtractor(AnswerExtractorConfig(pdf_dpi=72))
+    pdf = _make_pdf(["page one", "page two", "page three"])
+
+    pages = list(extractor.iter_pdf_images(pdf))
+
+    with fitz.open(stream=pdf, filetype="pdf") as doc:
+        for page, expected in zip(pages, doc):
+            assert page.flags.owndata and page.flags.c_contiguous
+            assert np.array_equal(page, extractor._render_page(expected))
+
+
+def test_pdf2image_fallback_renders_single_pages(monkeypatch):
+    """Verify the pdf2image fallback converts one page per call."""
+    from PIL import Image
+    from backend.engine import pdf_answer_extractor as module
+
+    requested = []
+
+    def fake_convert(source, dpi, first_page, last_page):
+        requested.append((first_page, last_page))
+        return [Image.new("RGB", (8, 8))]
+
+    monkeypatch.setattr(module, "fitz", None)
+    monkeypatch.setattr(module, "convert_from_bytes", fake_convert)
+    monkeypatch.setattr(module, "pdfinfo_from_bytes", lambda source: {"Pages": 3})
+
+    images = list(PDFAnswerExtractor().iter_pdf_images(b"%PDF"))
+
+    assert len(images) == 3
+    assert requested == [(1, 1), (2, 2), (3, 3)]
+
+
+def test_parser_keeps_pattern_priority():
+    """Verify earlier patterns win over later ones, regardless of position."""
+    extractor = PDFAnswerExtractor()
+    text = "정답 1 ② 1.③ 2④ 2)5 (3)① 3.2 12③"
+
+    matches = extractor.find_answer_matches(text)
+
+    assert [m.pattern_index for m in matches] == sorted(m.pattern_index for m in matches)
+    # "1.③" (pattern 0) beats the earlier "1 ②" (pattern 3)
+    assert extractor._parse_answers(text) == {1: 3, 2: 5, 3: 1, 12: 3}
+    first = matches[0]
+    assert (first.question, first.answer, first.pattern_index) == (1, "③", 0)
+    assert text[first.start:first.end] == "1.③"
+
+
+def test_patterns_with_backreferences_or_named_groups_match_as_written():
+    """Verify configured patterns with backreferences or named groups match as written."""
+    patterns = [
+        r'(\d+)번\s*(\d)',
+        r'(?P<q>\d+)\s*:\s*(?P<a>[①②③④⑤])',
+        r'(?P<q>\d+)\s*=\s*(?P<a>\d)',
+        r'(\d+)\s*-\s*(\d)-\2',  # Answer written twice, e.g. 4-3-3
+    ]
+    extractor = PDFAnswerExtractor(AnswerExtractorConfig(answer_patterns=patterns))
+    text = "1번 2 2: ③ 3 = 4 4-3-3 5-1-2 6번5"
+
+    found = {(m.pattern_index, m.question, m.answer) for m in extractor.find_answer_matches(text)}
+
+    expected = {
+        (idx, int(m.group(1)), m.group(2))
+        for idx, pattern in enumerate(patterns)
+        for m in re.finditer(pattern, text)
+    }
+    assert found == expected
+    assert (3, 4, "3") in found and not any(q == 5 for _, q, _ in found)
@@ -0,0 +1,38 @@
+from backend.engine.bubble_detector import BubbleDetectorConfig
+from backend.engine.result_cache import ResultCache
+
+
+def test_key_depends_on_content_and_config():
+    """Verify cache keys change with the upload bytes and the processing config."""
+    base = ResultCache.make_key(b"scan", "grade", BubbleDetectorConfig())
+    assert base == ResultCache.make_key(b"scan", "grade", BubbleDetectorConfig())
+    assert base != ResultCache.make_key(b"scan2", "grade", BubbleDetectorConfig())
+    assert base != ResultCache.make_key(b"scan", "answer_key", BubbleDetectorConfig())
+    assert base != ResultCache.make_key(
+        b"scan", "grade", BubbleDetectorConfig(binary_threshold=180)
+    )
+
+
+def test_memory_tier_evicts_least_recently_used():
+    """Verify the memory tier stays under its byte limit, evicting LRU entries."""
+    cache = ResultCache(max_memory_bytes=300)
+    cache.set("a", b"x" * 100)
+    cache.set("b", b"y" * 100)
+    assert cache.get("a") == b"x" * 100  # "a" is now most recently used
+    cache.set("c", b"z" * 100)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    """Verify entries written to disk are served by a fresh cache instance."""
+    cache = ResultCache(cache_dir=str(tmp_path))
+    cache.set("k1", {"answers": [1, 2, 3]})
+
+    result = ResultCache(cache_dir=str(tmp_path)).get("k1")
+    assert result == {"answers": [1, 2, 3]}
+
+    result["answers"].append(4)  # Callers get independent copies
+    assert cache.get("k1") == {"answers": [1, 2, 3]}
@@ -0,0 +1,83 @@
+import zipfile
+
+import cv2
+import fitz
+import numpy as np
+import pytest
+from backend.engine.scan_reader import ScanReader, ScanReaderConfig, detect_scan_format
+
+
+def make_pages(count):
+    """Distinct gray pages whose level encodes their position."""
+    return [np.full((120, 200, 3), 40 * (i + 1), dtype=np.uint8) for i in range(count)]
+
+
+def write_pdf(path, pages):
+    """PDF with one page per image, rendered back at 72 DPI to the image size."""
+    doc = fitz.open()
+    for page_image in pages:
+        _, png = cv2.imencode(".png", page_image)
+        page = doc.new_page(width=page_image.shape[1], height=page_image.shape[0])
+        page.insert_image(page.rect, stream=png.tobytes())
+    doc.save(str(path))
+
+
+def test_detects_format_from_contents():
+    """Verify the format comes from magic bytes, not the file name."""
+    assert detect_scan_format(b"II*\x00\x08\x00") == "tiff"
+    assert detect_scan_format(b"MM\x00*\x00\x00") == "tiff"
+    assert detect_scan_format(b"%PDF-1.7") == "pdf"
+    assert detect_scan_format(b"PK\x03\x04") == "zip"
+    assert detect_scan_format(b"\xff\xd8\xff\xe0") == "image"
+
+
+def test_multipage_tiff_and_pdf_stream_in_order(tmp_path):
+    """Verify TIFF and PDF pages are yielded one by one as owned BGR images."""
+    pages = make_pages(3)
+    cv2.imwritemulti(str(tmp_path / "scan.tif"), pages)
+    write_pdf(tmp_path / "scan.pdf", pages)
+    reader = ScanReader(ScanReaderConfig(pdf_dpi=72))
+
+    for name in ("scan.tif", "scan.pdf"):
+        read = list(reader.iter_pages(str(tmp_path / name)))
+        assert [p.index for p in read] == [0, 1, 2]
+        assert read[2].source == f"{name} page 3"
+        for page, expected in zip(read, pages):
+            assert page.image.shape == (120, 200, 3)
+            assert page.image.flags.owndata
+            assert abs(int(page.image[60, 100, 0]) - int(expected[60, 100, 0])) <= 2
+
+
+def test_zip_members_read_in_name_order(tmp_path):
+    """Verify ZIP members are expanded page by page, skipping archive metadata."""
+    pages = make_pages(4)
+    cv2.imwritemulti(str(tmp_path / "b.tif"), pages[1:3])
+    with zipfile.ZipFile(tmp_path / "batch.zip", "w") as archive:
+        archive.writestr("a.png", cv2.imencode(".png", pages[0])[1].tobytes())
+        archive.write(tmp_path / "b.tif", "b.tif")
+        archive.writestr("c/d.png", cv2.imencode(".png", pages[3])[1].tobytes())
+        archive.writestr("__MACOSX/._a.png", b"metadata")
+        archive.writestr(".DS_Store", b"metadata")
+
+    read = list(ScanReader().iter_pages(str(tmp_path / "batch.zip")))
+
+    assert [p.source for p in read] == [
+        "batch.zip/a.png", "batch.zip/b.tif page 1", "batch.zip/b.tif page 2", "batch.zip/c/d.png"
+    ]
+    assert [int(p.image[0, 0, 0]) for p in read] == [40, 80, 120, 160]
+
+
+def test_limits_and_unreadable_files_raise(tmp_path):
+    """Verify page limits, oversized members and undecodable files raise ValueError."""
+    cv2.imwritemulti(str(tmp_path / "scan.tif"), make_pages(3))
+    with pytest.raises(ValueError):
+        list(ScanReader(ScanReaderConfig(max_pages=2)).iter_pages(str(tmp_path / "scan.tif")))
+
+    with zipfile.ZipFile(tmp_path / "big.zip", "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("a.png", bytes(4096))
+    with pytest.raises(ValueError):
+        list(ScanReader(ScanReaderConfig(max_member_bytes=1024)).iter_pages(str(tmp_path / "big.zip")))
+
+    (tmp_path / "junk.jpg").write_bytes(b"not an image")
+    with pytest.raises(ValueError):
+        list(ScanReader().iter_pages(str(tmp_path / "junk.jpg")))
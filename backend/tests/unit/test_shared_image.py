@@ -0,0 +1,37 @@
+import pickle
+
+import numpy as np
+import pytest
+from backend.engine.bubble_detector import BubbleDetector
+from backend.engine.shared_image import SharedImage
+
+
+def test_attached_image_shares_pixels_without_copy():
+    """Verify a handle maps the same pixels and survives pickling."""
+    source = np.arange(2 * 3 * 3, dtype=np.uint8).reshape(2, 3, 3)
+    with SharedImage.from_array(source) as image:
+        handle = pickle.loads(pickle.dumps(image.handle))
+        with SharedImage.attach(handle) as attached:
+            assert np.array_equal(attached.array, source)
+            attached.array[0, 0, 0] = 255
+            assert image.array[0, 0, 0] == 255
+            with pytest.raises(ValueError):
+                attached.unlink()  # Only the owner frees the segment
+
+        assert attached.closed
+        with pytest.raises(ValueError):
+            attached.array
+
+    with pytest.raises(FileNotFoundError):
+        SharedImage.attach(handle)
+
+
+def test_engine_accepts_shared_images():
+    """Verify bubble scoring gives the same result for numpy and shared images."""
+    card = np.full((60, 60, 3), 255, dtype=np.uint8)
+    card[10:20, 10:20] = 0
+    bubbles = [(10, 10, 10, 10, None), (30, 30, 10, 10, None)]
+
+    with SharedImage.from_array(card) as shared:
+        shared_scores = BubbleDetector().score_bubbles(shared, bubbles)
+    assert np.allclose(shared_scores, BubbleDetector().score_bubbles(card, bubbles))
@@ -37,8 +37,8 @@ def main():
     # Save detailed results to JSON
     output_json = "grading_results_sample.json"
     with open(output_json, 'w', encoding='utf-8') as f:
-        # Convert dictionary to be JSON serializable (handle list of indices)
-        json.dump(results, f, indent=4)
+        # Convert dictionary to be JSON serializable (handle list of indices, darkness matrix)
+        json.dump(results, f, indent=4, default=lambda o: o.tolist())
     print(f"\nFull results saved to {output_json}")
 
 if __name__ == "__main__":